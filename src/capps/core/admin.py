@@ -0,0 +1,48 @@
+from django.contrib import admin
+from django.http import HttpRequest
+from unfold.admin import ModelAdmin
+from unfold.contrib.filters import admin as unfold_filters
+
+from .models import SlowQuery
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(ModelAdmin):
+    M = SlowQuery
+    list_display = [
+        M.created_at.field.name,
+        M.view.field.name,
+        M.duration_ms.field.name,
+        "short_sql",
+        M.explained_at.field.name,
+    ]
+    list_filter = [
+        (M.view.field.name, unfold_filters.FieldTextFilter),
+    ]
+    list_filter_submit = True
+    search_fields = [M.sql.field.name, M.fingerprint.field.name]
+    search_help_text = "Search for statement or fingerprint"
+    ordering = ["-" + M.duration_ms.field.name]
+    readonly_fields = [
+        M.created_at.field.name,
+        M.fingerprint.field.name,
+        M.view.field.name,
+        M.path.field.name,
+        M.query_params.field.name,
+        M.duration_ms.field.name,
+        M.sql.field.name,
+        M.plan.field.name,
+        M.explained_at.field.name,
+    ]
+
+    @admin.display(description="Statement")
+    def short_sql(self, obj: SlowQuery) -> str:
+        return obj.sql[:120]
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(
+        self, request: HttpRequest, obj: SlowQuery | None = None
+    ) -> bool:
+        return False
@@ -1,7 +1,35 @@
+from typing import Any, Self
+
 from django.apps import AppConfig
+from django.contrib.admin.apps import SimpleAdminConfig
+from django.core import checks
 from django.utils.translation import gettext_lazy as _
 
 
 class CoreConfig(AppConfig):
     name = "capps.core"
     verbose_name = _("Core")
+
+
+def check_discovered_admin(
+    app_configs: Any, **kwargs: Any
+) -> list[checks.CheckMessage]:
+    from django.contrib import admin  # noqa: PLC0415
+    from django.contrib.admin.checks import check_admin_app  # noqa: PLC0415
+
+    admin.autodiscover()
+    return check_admin_app(app_configs, **kwargs)
+
+
+class LazyAdminConfig(SimpleAdminConfig):
+    """
+    The admin without the discovery of the admin modules at startup:
+    they are imported with the admin URLs (see config.admin_urls), on the
+    first admin URL resolved or reversed, or by the checks.
+    """
+
+    def ready(self: Self) -> None:
+        from django.contrib.admin.checks import check_dependencies  # noqa: PLC0415
+
+        checks.register(check_dependencies, checks.Tags.admin)
+        checks.register(check_discovered_admin, checks.Tags.admin)
@@ -0,0 +1,49 @@
+"""Django management command ``build_api_schema``"""
+
+from pathlib import Path
+from typing import Any, Self
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from shared.schema import generate_schema
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the OpenAPI schema served by the API, once per release "
+        "(see shared.schema)."
+    )
+
+    def add_arguments(self: Self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--file",
+            type=Path,
+            default=None,
+            help="Where to write the schema, settings.API_SCHEMA_FILE by default.",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only fail if the written schema is not the current one.",
+        )
+
+    def handle(
+        self: Self, *args: Any, file: Path | None, check: bool, **options: Any
+    ) -> None:
+        path = file or Path(settings.API_SCHEMA_FILE)
+        schema = generate_schema()
+
+        if check:
+            if not path.exists() or path.read_bytes() != schema.content:
+                msg = f"{path} is outdated, the current schema is {schema.version}"
+                raise CommandError(msg)
+            self.stdout.write(self.style.SUCCESS(f"{path} is {schema.version}"))
+            return
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # replaced at once, the web workers may be reading it
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_bytes(schema.content)
+        tmp.replace(path)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {path} ({schema.version})"))
@@ -0,0 +1,161 @@
+"""Django management command ``check_import_time``"""
+
+import json
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Self
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+# What each kind of process imports before it can do any work
+TARGETS = {
+    # a django.tasks worker
+    "setup": "import django\ndjango.setup()\n",
+    # a web worker serving its first request
+    "web": (
+        "from django.core.wsgi import get_wsgi_application\n"
+        "from django.urls import get_resolver, reverse\n"
+        "get_wsgi_application()\n"
+        "get_resolver().resolve('/')\n"
+        "reverse('home')\n"
+    ),
+}
+
+
+@dataclass(frozen=True)
+class ImportTime:
+    module: str
+    level: int
+    self_us: int
+    cumulative_us: int
+
+
+def parse_import_times(output: str) -> list[ImportTime]:
+    """
+    Parse the ``python -X importtime`` report, e.g.
+    ``import time:       123 |        456 |   django.conf``
+    """
+    times = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        if not self_us.strip().isdigit():
+            continue  # the header
+        # "| " then two spaces per nesting level
+        indent = len(name) - len(name.lstrip())
+        times.append(
+            ImportTime(
+                module=name.strip(),
+                level=(indent - 1) // 2,
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+            )
+        )
+    return times
+
+
+def measure(target: str) -> list[ImportTime]:
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE,
+        "PYTHONPATH": os.pathsep.join(
+            filter(None, [str(settings.SRC_DIR), os.environ.get("PYTHONPATH")])
+        ),
+    }
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", TARGETS[target]],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=False,
+    )
+    if result.returncode:
+        msg = f"{target} failed:\n{result.stderr[-2000:]}"
+        raise CommandError(msg)
+    return parse_import_times(result.stderr)
+
+
+def total_ms(times: list[ImportTime]) -> float:
+    return sum(t.cumulative_us for t in times if t.level == 0) / 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the imports of a task worker (setup) and of a web worker "
+        "serving its first request (web) with python -X importtime, and fail "
+        "if they exceed the budget file or import a deferred module."
+    )
+
+    def add_arguments(self: Self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--budget",
+            type=Path,
+            default=settings.SRC_DIR / "config" / "import_budget.json",
+            help=(
+                'JSON file with {"<target>": {"total_ms": ..., "deferred": '
+                "[modules not to import at startup]}}."
+            ),
+        )
+        parser.add_argument(
+            "--target",
+            choices=sorted(TARGETS),
+            action="append",
+            help="Only measure these targets, all the ones of the budget by default.",
+        )
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=3,
+            help="Keep the median of several runs, the first ones warm the disk cache.",
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=15,
+            help="Print the slowest modules by cumulative time.",
+        )
+
+    def handle(
+        self: Self,
+        *args: Any,
+        budget: Path,
+        target: list[str] | None,
+        runs: int,
+        top: int,
+        **options: Any,
+    ) -> None:
+        budgets = json.loads(budget.read_text())
+        errors = []
+        for name in target or sorted(budgets):
+            limits = budgets.get(name, {})
+            measures = sorted((measure(name) for _ in range(runs)), key=total_ms)
+            times = measures[len(measures) // 2]
+            total = total_ms(times)
+
+            limit = limits.get("total_ms")
+            line = f"{name}: {total:.0f} ms"
+            if limit is not None:
+                line = f"{line} (budget {limit} ms)"
+            if limit is not None and total > limit:
+                errors.append(f"{name} takes {total:.0f} ms, over {limit} ms")
+                self.stdout.write(self.style.ERROR(line))
+            else:
+                self.stdout.write(self.style.SUCCESS(line))
+
+            for t in sorted(times, key=lambda t: t.cumulative_us, reverse=True)[:top]:
+                self.stdout.write(f"  {t.cumulative_us / 1000:8.1f} ms  {t.module}")
+
+            imported = {t.module for t in times}
+            for module in limits.get("deferred", []):
+                if module in imported:
+                    errors.append(f"{name} imports {module}")
+                    self.stdout.write(self.style.ERROR(f"  imports {module}"))
+
+        if errors:
+            msg = "\n".join(errors)
+            raise CommandError(msg)
@@ -0,0 +1,118 @@
+import hashlib
+import re
+import time
+from collections.abc import Callable
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpRequest, HttpResponse
+
+from .tasks import record_slow_query
+
+# Lists of placeholders (e.g. id__in=[...]) differ only by their length
+PLACEHOLDER_LIST_RE = re.compile(r"\(\s*%s(?:\s*,\s*%s)+\s*\)")
+WHITESPACE_RE = re.compile(r"\s+")
+# Parameter lists are truncated before being handed to the task queue
+MAX_PARAMS = 1000
+
+
+def fingerprint_sql(sql: str) -> str:
+    normalized = PLACEHOLDER_LIST_RE.sub("(%s, ...)", WHITESPACE_RE.sub(" ", sql))
+    return hashlib.sha1(normalized.strip().encode(), usedforsecurity=False).hexdigest()
+
+
+def to_json_params(params: Any) -> list[Any]:
+    if not isinstance(params, list | tuple):
+        return []
+    return [
+        value if isinstance(value, bool | int | float | str | None) else str(value)
+        for value in params[:MAX_PARAMS]
+    ]
+
+
+class SlowQueryRecorder:
+    """Collect the statements of a request running above the threshold."""
+
+    def __init__(self, threshold_ms: float, max_queries: int) -> None:
+        self.threshold_ms = threshold_ms
+        self.max_queries = max_queries
+        self.queries: list[dict[str, Any]] = []
+
+    def __call__(
+        self,
+        execute: Callable,
+        sql: str,
+        params: Any,
+        many: bool,
+        context: dict[str, Any],
+    ) -> Any:
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = (time.perf_counter() - start) * 1000
+            if (
+                duration >= self.threshold_ms
+                and not many
+                and len(self.queries) < self.max_queries
+            ):
+                self.queries.append(
+                    {
+                        "sql": sql,
+                        "params": to_json_params(params),
+                        "duration_ms": round(duration, 2),
+                    }
+                )
+
+
+class SlowQueryMiddleware:
+    """
+    Record the statements slower than ``SLOW_QUERY_THRESHOLD_MS``
+    with the view and the query string of the request.
+
+    The statements are stored and explained by a background task
+    once the response is ready, so that neither the row nor the
+    EXPLAIN add to the request or to its transaction.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if not settings.SLOW_QUERY_RECORDER_ENABLED:
+            return self.get_response(request)
+
+        recorder = SlowQueryRecorder(
+            settings.SLOW_QUERY_THRESHOLD_MS, settings.SLOW_QUERY_MAX_PER_REQUEST
+        )
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+
+        for query in recorder.queries:
+            self.enqueue(request, **query)
+        return response
+
+    def enqueue(
+        self, request: HttpRequest, sql: str, params: list[Any], duration_ms: float
+    ) -> None:
+        fingerprint = fingerprint_sql(sql)
+        # the same statement is recorded at most once per throttle window
+        if not cache.add(
+            f"slow-query:{fingerprint}", 1, settings.SLOW_QUERY_THROTTLE_SECONDS
+        ):
+            return
+
+        match = request.resolver_match
+        record_slow_query.enqueue(
+            {
+                "fingerprint": fingerprint,
+                "sql": sql,
+                "params": params,
+                "duration_ms": duration_ms,
+                "view": (match.view_name or match._func_path) if match else "",
+                "path": request.path,
+                "query_params": dict(request.GET.lists()),
+            }
+        )
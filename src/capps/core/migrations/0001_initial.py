@@ -0,0 +1,40 @@
+# Generated by Django 6.1 on 2026-10-19 10:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="SlowQuery",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("fingerprint", models.CharField(db_index=True, max_length=40)),
+                ("sql", models.TextField()),
+                ("params", models.JSONField(blank=True, default=list)),
+                ("duration_ms", models.FloatField()),
+                ("view", models.CharField(blank=True, max_length=255)),
+                ("path", models.TextField(blank=True)),
+                ("query_params", models.JSONField(blank=True, default=dict)),
+                ("plan", models.TextField(blank=True)),
+                ("explained_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name_plural": "slow queries",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+from django.db import DatabaseError, connection, models, transaction
+from django.utils import timezone
+
+from shared.db import statement_timeout
+
+EXPLAINABLE_STATEMENTS = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+
+
+class SlowQuery(models.Model):
+    """A statement above ``SLOW_QUERY_THRESHOLD_MS``, with its query plan."""
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    fingerprint = models.CharField(max_length=40, db_index=True)
+    sql = models.TextField()
+    params = models.JSONField(default=list, blank=True)
+    duration_ms = models.FloatField()
+    view = models.CharField(max_length=255, blank=True)
+    path = models.TextField(blank=True)
+    query_params = models.JSONField(default=dict, blank=True)
+    plan = models.TextField(blank=True)
+    explained_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name_plural = "slow queries"
+
+    def __str__(self) -> str:
+        return f"{self.view or self.path} ({self.duration_ms:.0f} ms)"
+
+    @property
+    def is_explainable(self) -> bool:
+        return self.sql.lstrip().upper().startswith(EXPLAINABLE_STATEMENTS)
+
+    def explain(self, timeout_ms: int = 5000) -> None:
+        """
+        Store the estimated plan of the statement,
+        the statement itself is not executed (ANALYZE off).
+
+        The bind parameters (e.g. emails, names, tokens) are only kept
+        until then, so a statement can be explained once.
+        """
+        if not self.is_explainable:
+            self.plan = "Statement cannot be explained"
+        else:
+            try:
+                with (
+                    transaction.atomic(),
+                    statement_timeout(timeout_ms),
+                    connection.cursor() as cursor,
+                ):
+                    cursor.execute(
+                        f"EXPLAIN (ANALYZE off, VERBOSE) {self.sql}", self.params
+                    )
+                    self.plan = "\n".join(row[0] for row in cursor.fetchall())
+            except DatabaseError as e:
+                self.plan = f"EXPLAIN failed: {e}"
+        self.params = []
+        self.explained_at = timezone.now()
+        self.save(update_fields=["plan", "params", "explained_at"])
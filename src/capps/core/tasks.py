@@ -0,0 +1,13 @@
+from typing import Any
+
+from django.tasks import task
+
+from .models import SlowQuery
+
+
+@task
+def record_slow_query(query: dict[str, Any]) -> int:
+    """Store a statement captured by SlowQueryMiddleware and explain it."""
+    slow_query = SlowQuery.objects.create(**query)
+    slow_query.explain()
+    return slow_query.pk
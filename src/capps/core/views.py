@@ -0,0 +1,60 @@
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth.mixins import UserPassesTestMixin
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpRequest, JsonResponse
+from django.urls import reverse
+from django.views import View
+
+from shared.db import pool_stats
+from shared.profiling import list_profiles
+
+
+class DatabasePoolStatsView(UserPassesTestMixin, View):
+    """Expose the connection pool statistics of the serving process."""
+
+    def test_func(self) -> bool:
+        return self.request.user.is_superuser
+
+    def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> JsonResponse:
+        return JsonResponse({"pools": pool_stats()})
+
+
+class SuperuserRequiredMixin(UserPassesTestMixin):
+    def test_func(self) -> bool:
+        return self.request.user.is_superuser
+
+
+class RequestProfileListView(SuperuserRequiredMixin, View):
+    """List the stored request profiles, most recent first."""
+
+    def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> JsonResponse:
+        profiles = [
+            {
+                "name": name,
+                "url": reverse(
+                    "request-profile-download",
+                    kwargs={"filename": name.rsplit("/", 1)[-1]},
+                ),
+            }
+            for name in list_profiles()
+        ]
+        return JsonResponse({"profiles": profiles})
+
+
+class RequestProfileDownloadView(SuperuserRequiredMixin, View):
+    """Download a stored request profile, to be opened with speedscope."""
+
+    def get(
+        self, request: HttpRequest, filename: str, *args: Any, **kwargs: Any
+    ) -> FileResponse:
+        name = f"{settings.REQUEST_PROFILER_LOCATION}/{filename}"
+        if name not in list_profiles():
+            raise Http404
+        return FileResponse(
+            default_storage.open(name),
+            as_attachment=True,
+            filename=filename,
+            content_type="application/json",
+        )
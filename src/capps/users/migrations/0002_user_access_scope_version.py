@@ -0,0 +1,17 @@
+# Generated by Django 6.1 on 2026-10-19 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="access_scope_version",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
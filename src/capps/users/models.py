@@ -1,11 +1,12 @@
-from typing import Self
+from typing import Any, Self
 
 from django.contrib.auth.models import AbstractUser
-from django.db.models import CharField, EmailField
+from django.db.models import CharField, EmailField, PositiveIntegerField
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
 from capps.users.managers import UserManager
+from capps.users.scope import AccessScope, get_access_scope
 from shared.mixins import AdminUrlsMixin
 
 
@@ -16,6 +17,8 @@ class User(AdminUrlsMixin, AbstractUser):
     username = None  # type: ignore
     first_name = CharField(max_length=200)
     last_name = CharField(max_length=200)
+    # Bumped when the projects or groups change, see capps.users.scope
+    access_scope_version = PositiveIntegerField(default=0, editable=False)
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
@@ -37,5 +40,19 @@ class User(AdminUrlsMixin, AbstractUser):
         """
         return reverse("users:detail", kwargs={"pk": self.id})
 
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            # never write back a stale access_scope_version, it is only
+            # changed by capps.users.scope.invalidate_access_scope
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "access_scope_version"
+            ]
+        super().save(*args, **kwargs)
+
+    def get_access_scope(self) -> AccessScope:
+        return get_access_scope(self)
+
     def is_genlab_staff(self) -> bool:
-        return self.groups.filter(name="genlab").exists()
+        return self.get_access_scope().is_genlab_staff
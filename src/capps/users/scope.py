@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import AnonymousUser
+
+    from .models import User
+
+GENLAB_STAFF_GROUP = "genlab"
+
+
+@dataclass(frozen=True)
+class AccessScope:
+    """What a user can see: the numbers of their projects, and staff access."""
+
+    project_ids: frozenset[str]
+    is_genlab_staff: bool
+
+
+EMPTY_SCOPE = AccessScope(project_ids=frozenset(), is_genlab_staff=False)
+
+
+def get_cache_key(user: User) -> str:
+    # the version is bumped in the database on every change, so a stale
+    # entry is never read even with a per-process cache
+    return f"access-scope:{user.pk}:{user.access_scope_version}"
+
+
+def compute_access_scope(user: User) -> AccessScope:
+    return AccessScope(
+        project_ids=frozenset(user.memberships.values_list("project_id", flat=True)),
+        is_genlab_staff=user.groups.filter(name=GENLAB_STAFF_GROUP).exists(),
+    )
+
+
+def get_access_scope(user: User | AnonymousUser) -> AccessScope:
+    """
+    Access scope of ``user``, kept on the instance for the rest of the request
+    and in the cache until the memberships or groups of the user change.
+    """
+    if not user.is_authenticated:
+        return EMPTY_SCOPE
+
+    scope = user.__dict__.get("_access_scope")
+    if scope is None:
+        key = get_cache_key(user)
+        scope = cache.get(key)
+        if scope is None:
+            scope = compute_access_scope(user)
+            cache.set(key, scope, settings.ACCESS_SCOPE_CACHE_TIMEOUT)
+        user.__dict__["_access_scope"] = scope
+    return scope
+
+
+def invalidate_access_scope(*user_ids: int) -> None:
+    from .models import User  # noqa: PLC0415
+
+    User.objects.filter(pk__in=user_ids).update(
+        access_scope_version=F("access_scope_version") + 1
+    )
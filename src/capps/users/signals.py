@@ -0,0 +1,37 @@
+from typing import Any
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from nina.models import Project, ProjectMembership
+
+from .models import User
+from .scope import invalidate_access_scope
+
+
+@receiver(post_save, sender=ProjectMembership)
+@receiver(post_delete, sender=ProjectMembership)
+def membership_changed(sender: Any, instance: ProjectMembership, **kwargs: Any) -> None:
+    invalidate_access_scope(instance.user_id)
+
+
+@receiver(m2m_changed, sender=Project.memberships.through)
+@receiver(m2m_changed, sender=User.groups.through)
+def user_relations_changed(
+    sender: Any,
+    instance: Any,
+    action: str,
+    pk_set: set[int] | None,
+    **kwargs: Any,
+) -> None:
+    if isinstance(instance, User):
+        if action.startswith("post_"):
+            invalidate_access_scope(instance.pk)
+    elif action == "pre_clear":
+        # a project or a group is cleared: its users are only known before
+        users = (
+            instance.memberships if isinstance(instance, Project) else instance.user_set
+        )
+        invalidate_access_scope(*users.values_list("pk", flat=True))
+    elif action in ("post_add", "post_remove") and pk_set:
+        invalidate_access_scope(*pk_set)
@@ -0,0 +1,9 @@
+"""
+URLs of the admin site, imported on first use (see config.urls).
+"""
+
+from django.contrib import admin
+
+admin.autodiscover()
+
+urlpatterns = admin.site.get_urls()
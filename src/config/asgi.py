@@ -0,0 +1,22 @@
+"""ASGI config for the project.
+
+Serves the same views as ``config.wsgi`` and also the long-lived event
+streams (``staff:events``), which only work under an ASGI server, e.g.::
+
+    gunicorn config.asgi -k uvicorn_worker.UvicornWorker
+
+"""
+
+import os
+import sys
+from pathlib import Path
+
+from django.core.asgi import get_asgi_application
+
+# This allows easy placement of apps within the interior
+# app directory.
+BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
+sys.path.append(str(BASE_DIR / "capps"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
+
+application = get_asgi_application()
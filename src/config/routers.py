@@ -1,9 +1,4 @@
 from django.urls import path
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularRedocView,
-    SpectacularSwaggerView,
-)
 from rest_framework.routers import DefaultRouter
 
 from genlab_bestilling.api.views import (
@@ -15,11 +10,14 @@ from genlab_bestilling.api.views import (
     IsolationMethodViewset,
     LocationViewset,
     MarkerViewset,
+    ReferenceBundleView,
     SampleMarkerAnalysisViewset,
     SampleTypeViewset,
     SampleViewset,
     SpeciesViewset,
 )
+from shared.schema import ApiSchemaView
+from shared.views import lazy_view
 from staff.api import PlatePositionViewSet
 
 router = DefaultRouter()
@@ -47,7 +45,21 @@ router.register("equipment-order", EquipmentOrderViewset, basename="equipment-or
 
 
 urlpatterns = [
-    path("schema/", SpectacularAPIView.as_view(), name="schema"),
-    path("docs/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
-    path("docs/redoc/", SpectacularRedocView.as_view(url_name="schema"), name="redoc"),
+    path("schema/", ApiSchemaView.as_view(), name="schema"),
+    # drf-spectacular is imported by the first request to these
+    path(
+        "docs/",
+        lazy_view("drf_spectacular.views.SpectacularSwaggerView", url_name="schema"),
+        name="swagger-ui",
+    ),
+    path(
+        "docs/redoc/",
+        lazy_view("drf_spectacular.views.SpectacularRedocView", url_name="schema"),
+        name="redoc",
+    ),
+    path(
+        "reference-bundle/",
+        ReferenceBundleView.as_view(),
+        name="reference-bundle",
+    ),
 ] + router.urls
@@ -54,8 +54,33 @@ LOCALE_PATHS = [str(SRC_DIR / "locale")]
 DATABASES = {"default": env.db("DATABASE_URL")}
 
 DATABASES["default"]["ATOMIC_REQUESTS"] = True
+# Views using shared.views.ReadOnlyRequestMixin opt out of ATOMIC_REQUESTS for
+# safe methods; in strict mode any write they issue raises an error.
+READ_ONLY_REQUESTS_STRICT = env.bool("READ_ONLY_REQUESTS_STRICT", default=False)
 # https://docs.djangoproject.com/en/stable/ref/settings/#std:setting-DEFAULT_AUTO_FIELD
 DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=None)
+# https://docs.djangoproject.com/en/dev/ref/settings/#conn-health-checks
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+# https://docs.djangoproject.com/en/dev/ref/databases/#connection-pool
+# Each process (gunicorn worker, db_worker) owns its own pool, so the
+# effective upper bound on Postgres is WEB_CONCURRENCY * DB_POOL_MAX_SIZE
+# plus the queue workers.
+DB_POOL = env.bool("DJANGO_DB_POOL", default=False)
+if DB_POOL:
+    from psycopg_pool import ConnectionPool
+
+    # persistent connections and pooling are mutually exclusive
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+        "min_size": env.int("DJANGO_DB_POOL_MIN_SIZE", default=1),
+        "max_size": env.int("DJANGO_DB_POOL_MAX_SIZE", default=4),
+        # seconds a request waits for a free connection before failing
+        "timeout": env.float("DJANGO_DB_POOL_TIMEOUT", default=10.0),
+        "max_lifetime": env.float("DJANGO_DB_POOL_MAX_LIFETIME", default=1800.0),
+        "max_idle": env.float("DJANGO_DB_POOL_MAX_IDLE", default=300.0),
+        # verify a connection is alive before handing it out
+        "check": ConnectionPool.check_connection,
+    }
 
 
 ###########################################
@@ -78,6 +103,8 @@ TASKS = {
 ROOT_URLCONF = "config.urls"
 # https://docs.djangoproject.com/en/dev/ref/settings/#wsgi-application
 WSGI_APPLICATION = "config.wsgi.application"
+# https://docs.djangoproject.com/en/dev/howto/deployment/asgi/
+ASGI_APPLICATION = "config.asgi.application"
 
 
 ###########################################
@@ -90,6 +117,7 @@ DJANGO_APPS = [
     "django.contrib.sites",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # "django.contrib.humanize", # Handy template tags
     "django.forms",
 ]
@@ -98,7 +126,8 @@ ADMIN_APPS = [
     "unfold",
     "unfold.contrib.filters",
     "unfold.contrib.forms",
-    "django.contrib.admin",
+    # the admin modules are imported on first use, see config.admin_urls
+    "capps.core.apps.LazyAdminConfig",
 ]
 
 THIRD_PARTY_APPS = [
@@ -212,6 +241,7 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "allauth.account.middleware.AccountMiddleware",
     "django_htmx.middleware.HtmxMiddleware",
+    "capps.core.middleware.SlowQueryMiddleware",
 ]
 
 
@@ -237,12 +267,16 @@ STATICFILES_FINDERS = [
 MEDIA_BASE_LOCATION = env("DJANGO_MEDIA_BASE_LOCATION", default="media")
 
 STORAGES = {
-    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "default": {"BACKEND": "shared.storages.LocalDirectTransferStorage"},
+    # background exports, private and pruned by `manage.py prune_exports`
+    "exports": {"BACKEND": "shared.storages.LocalDirectTransferStorage"},
     "staticfiles": {
         "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
     },
 }
 MEDIA_URL = f"/{MEDIA_BASE_LOCATION}/"
+# Lifetime in seconds of presigned upload/download urls and upload tokens
+DIRECT_TRANSFER_EXPIRY = env.int("DIRECT_TRANSFER_EXPIRY", default=15 * 60)
 
 
 # django-storages
@@ -275,6 +309,7 @@ if AWS_ACCESS_KEY_ID := env("DJANGO_AWS_ACCESS_KEY_ID", default=None):
     )
     print(MEDIA_URL)
     STORAGES["default"]["BACKEND"] = "config.storages.MediaRootS3Boto3Storage"
+    STORAGES["exports"]["BACKEND"] = "config.storages.PrivateMediaS3Boto3Storage"
 
 
 ###########################################
@@ -501,6 +536,81 @@ SPECTACULAR_SETTINGS = {
     "VERSION": "1.0.0",
     "SERVE_INCLUDE_SCHEMA": False,
 }
+# The schema built by `manage.py build_api_schema` and served by the API,
+# generated on demand with DEBUG instead (see shared.schema)
+API_SCHEMA_FILE = env("API_SCHEMA_FILE", default=str(SRC_DIR / "openapi.json"))
+
+
+###########################################
+#             ACCESS SCOPE
+###########################################
+# Seconds the projects and staff access of a user are cached (see
+# capps.users.scope); entries are versioned, so changes apply immediately
+ACCESS_SCOPE_CACHE_TIMEOUT = env.int("ACCESS_SCOPE_CACHE_TIMEOUT", default=24 * 60 * 60)
+
+
+###########################################
+#             PROFILING
+###########################################
+# Superusers can profile a request with ?_profile=1 (see shared.profiling)
+REQUEST_PROFILER_ENABLED = env.bool("REQUEST_PROFILER_ENABLED", default=False)
+REQUEST_PROFILER_INTERVAL_MS = env.int("REQUEST_PROFILER_INTERVAL_MS", default=5)
+REQUEST_PROFILER_MAX_SAMPLES = env.int("REQUEST_PROFILER_MAX_SAMPLES", default=12000)
+REQUEST_PROFILER_LOCATION = "profiles"
+REQUEST_PROFILER_MAX_PROFILES = env.int("REQUEST_PROFILER_MAX_PROFILES", default=100)
+REQUEST_PROFILER_RETENTION_DAYS = env.int("REQUEST_PROFILER_RETENTION_DAYS", default=7)
+
+# Statements slower than the threshold are stored with their plan
+# (see capps.core.middleware), the same statement at most once per window.
+# Off by default: the bind parameters are stored until the plan is made
+SLOW_QUERY_RECORDER_ENABLED = env.bool("SLOW_QUERY_RECORDER_ENABLED", default=False)
+SLOW_QUERY_THRESHOLD_MS = env.int("SLOW_QUERY_THRESHOLD_MS", default=500)
+SLOW_QUERY_MAX_PER_REQUEST = 10
+SLOW_QUERY_THROTTLE_SECONDS = env.int("SLOW_QUERY_THROTTLE_SECONDS", default=60 * 60)
+
+
+###########################################
+#             TRACING
+###########################################
+# Share of the calls of each traced operation that is recorded (see shared.tracing),
+# overridden with e.g. TRACING_SAMPLE_RATES=plate.populate=0.5,default=0.1
+TRACING_SAMPLE_RATES = {
+    "default": 1.0,
+    "gid_sequence.next_value": 0.05,
+    **env.dict("TRACING_SAMPLE_RATES", cast={"value": float}, default={}),
+}
+
+
+###########################################
+#                 EVENTS
+###########################################
+# Broker of the change events streamed to the browsers (see shared.events):
+# shared.events.LocalBroker within a single process, shared.events.PostgresBroker
+# (LISTEN/NOTIFY) when several workers serve the streams
+EVENTS_BROKER = env("EVENTS_BROKER", default="shared.events.LocalBroker")
+
+
+###########################################
+#             INCREMENTAL SYNC
+###########################################
+# Days the tombstones of deleted rows are kept (see staff.sync); older
+# sync tokens get a reset answer and the client reloads the full list
+SYNC_RETENTION_DAYS = env.int("SYNC_RETENTION_DAYS", default=7)
+# Above this number of changed rows a sync answers with a reset as well
+SYNC_MAX_CHANGES = env.int("SYNC_MAX_CHANGES", default=2000)
+
+
+###########################################
+#             REFERENCE DATA
+###########################################
+# Seconds a reference bundle is cached (see genlab_bestilling.reference);
+# entries are versioned, so changes apply immediately
+REFERENCE_BUNDLE_CACHE_TIMEOUT = env.int(
+    "REFERENCE_BUNDLE_CACHE_TIMEOUT", default=24 * 60 * 60
+)
+# Areas with more locations leave them out of the bundle, the clients
+# search them with the locations API instead
+REFERENCE_BUNDLE_MAX_LOCATIONS = env.int("REFERENCE_BUNDLE_MAX_LOCATIONS", default=5000)
 
 
 ###########################################
@@ -17,7 +17,16 @@ ALLOWED_HOSTS = env.list("DJANGO_ALLOWED_HOSTS", default=[""])
 #               DATABASES
 ###########################################
 
-DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)  # noqa: F405
+if not DB_POOL:  # noqa: F405
+    DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)  # noqa: F405
+
+
+###########################################
+#                 EVENTS
+###########################################
+
+# the streams are served by several workers, which only share the database
+EVENTS_BROKER = env("EVENTS_BROKER", default="shared.events.PostgresBroker")
 
 
 ###########################################
@@ -145,6 +154,9 @@ if SENTRY_DSN:
     sentry_sdk.init(
         dsn=SENTRY_DSN,
         integrations=integrations,
+        # the auto-enabled integrations import every library they support
+        # that is installed (boto3, redis, ...) at startup
+        auto_enabling_integrations=False,
         environment=env("SENTRY_ENVIRONMENT", default="production"),
         traces_sample_rate=env.float("SENTRY_TRACES_SAMPLE_RATE", default=0.1),
     )
@@ -16,6 +16,13 @@ SECRET_KEY = env(
 TEST_RUNNER = "django.test.runner.DiscoverRunner"
 
 
+###########################################
+#              DATABASES
+###########################################
+# Fail loudly when a view marked read-only writes to the database
+READ_ONLY_REQUESTS_STRICT = True
+
+
 ###########################################
 #              PASSWORDS
 ###########################################
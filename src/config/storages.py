@@ -1,8 +1,45 @@
+from typing import Any
+
 from django.conf import settings
 from storages.backends.s3boto3 import S3Boto3Storage
+from storages.utils import clean_name
 
 
 class MediaRootS3Boto3Storage(S3Boto3Storage):
     location = settings.MEDIA_BASE_LOCATION
     file_overwrite = True
     querystring_auth = True
+
+    def presigned_upload(
+        self, name: str, *, max_size: int, expires_in: int
+    ) -> dict[str, Any]:
+        """
+        Return a presigned POST letting the browser upload ``name`` directly
+        to the bucket; the size limit is enforced by S3.
+        """
+        post = self.connection.meta.client.generate_presigned_post(
+            Bucket=self.bucket_name,
+            Key=self._normalize_name(clean_name(name)),
+            Conditions=[["content-length-range", 1, max_size]],
+            ExpiresIn=expires_in,
+        )
+        return {"method": "POST", "url": post["url"], "fields": post["fields"]}
+
+    def presigned_download(
+        self, name: str, *, expires_in: int, filename: str | None = None
+    ) -> str:
+        parameters = None
+        if filename:
+            parameters = {
+                "ResponseContentDisposition": f'attachment; filename="{filename}"'
+            }
+        return self.url(name, parameters=parameters, expire=expires_in)
+
+
+class PrivateMediaS3Boto3Storage(MediaRootS3Boto3Storage):
+    """
+    Objects only readable through presigned urls, whatever AWS_DEFAULT_ACL,
+    e.g. the sample exports.
+    """
+
+    default_acl = "private"
@@ -1,15 +1,22 @@
 from typing import Any
 
 from django.conf import settings
-from django.contrib import admin
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.urls import include, path, reverse_lazy
+from django.urls import URLResolver, include, path, reverse_lazy
+from django.urls.resolvers import RoutePattern
 from django.views import defaults as default_views
 from django.views import generic
 from django.views.i18n import JavaScriptCatalog
 from health_check.views import HealthCheckView
 from oauth2_provider import urls as oauth2_urls
 
+from capps.core.views import (
+    DatabasePoolStatsView,
+    RequestProfileDownloadView,
+    RequestProfileListView,
+)
+from shared.views import LocalDirectUploadView
+
 
 class HomeView(LoginRequiredMixin, generic.RedirectView):
     def get_redirect_url(self, *args: Any, **kwargs: Any) -> str | None:
@@ -18,7 +25,14 @@ class HomeView(LoginRequiredMixin, generic.RedirectView):
 
 urlpatterns = [
     path("", HomeView.as_view(), name="home"),
-    path(settings.ADMIN_URL, admin.site.urls),
+    # a resolver of the module path, unlike include(): the admin modules are
+    # imported by the first admin URL resolved or reversed, not at startup
+    URLResolver(
+        RoutePattern(settings.ADMIN_URL),
+        "config.admin_urls",
+        app_name="admin",
+        namespace="admin",
+    ),
     path(
         "ht/",
         HealthCheckView.as_view(
@@ -29,6 +43,13 @@ urlpatterns = [
             ]
         ),
     ),
+    path("ht/db-pool/", DatabasePoolStatsView.as_view(), name="db-pool-stats"),
+    path("ht/profiles/", RequestProfileListView.as_view(), name="request-profiles"),
+    path(
+        "ht/profiles/<str:filename>",
+        RequestProfileDownloadView.as_view(),
+        name="request-profile-download",
+    ),
     path("o/", include(oauth2_urls)),
     path("api/", include("config.routers")),
     path("autocomplete/", include("config.autocomplete", namespace="autocomplete")),
@@ -44,6 +65,20 @@ urlpatterns = [
 ]
 
 
+if any(
+    storage["BACKEND"] == "shared.storages.LocalDirectTransferStorage"
+    for storage in settings.STORAGES.values()
+):
+    # the uploads presigned by the local stand-in of the S3 storages
+    urlpatterns += [
+        path(
+            "uploads/<str:token>/",
+            LocalDirectUploadView.as_view(),
+            name="direct-upload",
+        ),
+    ]
+
+
 if settings.DEBUG:
     # This allows the error pages to be debugged during development, just visit
     # these url in browser to see how these error pages look like.
@@ -1,13 +1,7 @@
 import { useState, useCallback, useEffect } from 'react';
 import PropTypes from 'prop-types';
 import AsyncSelect from 'react-select/async';
-import {
-  searchAnalysisOrders,
-  useMarkerFilterOptions,
-  useSpeciesFilterOptions,
-  useSampleTypeFilterOptions,
-} from '../hooks/useFilterOptions';
-import { EXTRACTION_STATUS_OPTIONS } from '../config';
+import { searchAnalysisOrders, useSampleMarkerFacets } from '../hooks/useFilterOptions';
 import useOrderStore from '../store';
 
 /**
@@ -31,9 +25,12 @@ export default function FilterBar({ filters, onFiltersChange, onReset }) {
     }
   }, [orderId, orderLabel]);
 
-  const { data: markers = [], isLoading: markersLoading } = useMarkerFilterOptions();
-  const { data: species = [], isLoading: speciesLoading } = useSpeciesFilterOptions();
-  const { data: sampleTypes = [], isLoading: typesLoading } = useSampleTypeFilterOptions();
+  const { data: facets, isLoading: facetsLoading } = useSampleMarkerFacets(filters);
+  const markers = facets?.facets.marker ?? [];
+  const species = facets?.facets.species ?? [];
+  // samples without a type cannot be filtered on
+  const sampleTypes = (facets?.facets.sample_type ?? []).filter((t) => t.value != null);
+  const extractionStatuses = facets?.facets.extraction_status ?? [];
 
   const updateFilter = (key, value) => {
     onFiltersChange({ ...filters, [key]: value || '' });
@@ -145,13 +142,13 @@ export default function FilterBar({ filters, onFiltersChange, onReset }) {
           <select
             value={filters.marker || ''}
             onChange={(e) => updateFilter('marker', e.target.value)}
-            disabled={markersLoading}
+            disabled={facetsLoading}
             className="w-full border border-gray-300 rounded px-2 py-1.5 text-sm focus:ring-2 focus:ring-blue-500 focus:border-blue-500"
           >
             <option value="">All markers</option>
-            {markers.map((m, idx) => (
-              <option key={m.name ?? `marker-${idx}`} value={m.name}>
-                {m.name}
+            {markers.map((m) => (
+              <option key={m.value} value={m.value}>
+                {m.label} ({m.count})
               </option>
             ))}
           </select>
@@ -163,13 +160,13 @@ export default function FilterBar({ filters, onFiltersChange, onReset }) {
           <select
             value={filters.species || ''}
             onChange={(e) => updateFilter('species', e.target.value)}
-            disabled={speciesLoading}
+            disabled={facetsLoading}
             className="w-full border border-gray-300 rounded px-2 py-1.5 text-sm focus:ring-2 focus:ring-blue-500 focus:border-blue-500"
           >
             <option value="">All species</option>
-            {species.map((s, idx) => (
-              <option key={s.id ?? `species-${idx}`} value={s.id}>
-                {s.name}
+            {species.map((s) => (
+              <option key={s.value} value={s.value}>
+                {s.label} ({s.count})
               </option>
             ))}
           </select>
@@ -181,13 +178,13 @@ export default function FilterBar({ filters, onFiltersChange, onReset }) {
           <select
             value={filters.sample_type || ''}
             onChange={(e) => updateFilter('sample_type', e.target.value)}
-            disabled={typesLoading}
+            disabled={facetsLoading}
             className="w-full border border-gray-300 rounded px-2 py-1.5 text-sm focus:ring-2 focus:ring-blue-500 focus:border-blue-500"
           >
             <option value="">All types</option>
-            {sampleTypes.map((t, idx) => (
-              <option key={t.id ?? `type-${idx}`} value={t.id}>
-                {t.name}
+            {sampleTypes.map((t) => (
+              <option key={t.value} value={t.value}>
+                {t.label} ({t.count})
               </option>
             ))}
           </select>
@@ -202,9 +199,9 @@ export default function FilterBar({ filters, onFiltersChange, onReset }) {
             className="w-full border border-gray-300 rounded px-2 py-1.5 text-sm focus:ring-2 focus:ring-blue-500 focus:border-blue-500"
           >
             <option value="">All statuses</option>
-            {EXTRACTION_STATUS_OPTIONS.map((opt) => (
+            {extractionStatuses.map((opt) => (
               <option key={opt.value} value={opt.value}>
-                {opt.label}
+                {opt.label} ({opt.count})
               </option>
             ))}
           </select>
@@ -0,0 +1,42 @@
+import { client } from '../config';
+
+// sync token of the last response, by query key
+const syncTokens = new Map();
+
+/**
+ * Fetch a list endpoint that supports `?since=<token>`.
+ *
+ * The first call loads the whole list; later calls for the same query key
+ * only fetch the rows changed or deleted since the previous response and
+ * merge them into `previous`. The whole list is loaded again when the
+ * server asks for a reset.
+ */
+export async function fetchSyncedList(queryKey, url, params, previous) {
+  const key = JSON.stringify(queryKey);
+  const since = syncTokens.get(key);
+
+  if (previous && since) {
+    const { data } = await client.get(url, { params: { ...params, since } });
+    if (!data.reset) {
+      syncTokens.set(key, data.token);
+      return mergeRows(previous, data.results, data.deleted);
+    }
+  }
+
+  const response = await client.get(url, { params });
+  syncTokens.set(key, response.headers['x-sync-token']);
+  return response.data.results ?? response.data;
+}
+
+function mergeRows(rows, changed, deleted) {
+  const changedById = new Map(changed.map((row) => [row.id, row]));
+  const deletedIds = new Set(deleted);
+  const merged = rows
+    .filter((row) => !deletedIds.has(row.id))
+    .map((row) => {
+      const update = changedById.get(row.id);
+      changedById.delete(row.id);
+      return update ?? row;
+    });
+  return merged.concat([...changedById.values()]);
+}
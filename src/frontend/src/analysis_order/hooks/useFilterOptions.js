@@ -1,6 +1,14 @@
-import { useQuery } from '@tanstack/react-query';
-import { client } from '../config';
+import { useQuery, useQueryClient } from '@tanstack/react-query';
+import { client, config } from '../config';
+import { fetchReferenceData } from '../../helpers/referenceData';
 import useOrderStore from '../store';
+import { buildFilterParams } from './useOrderSampleMarkers';
+import { fetchSyncedList } from './syncList';
+
+const referenceData = () => fetchReferenceData(config.reference_bundle_url);
+
+// the shape of the markers API
+const asMarker = (marker) => ({ id: marker.id, name: marker.id });
 
 /**
  * Fetch analysis orders for filter dropdown with optional search.
@@ -37,21 +45,24 @@ export async function searchAnalysisOrders(searchTerm = '') {
 }
 
 /**
- * Fetch markers allowed for this analysis order (or all if no order selected).
+ * Fetch the values and counts of the marker, species, sample type and
+ * extraction status filters for the current filters (and order).
+ * Each facet is counted without its own filter, so every option shows
+ * how many sample markers selecting it would give.
  */
-export function useMarkerFilterOptions() {
+export function useSampleMarkerFacets(filters = {}) {
   const orderId = useOrderStore((s) => s.orderId);
+  const params = buildFilterParams({ ...filters, order: orderId });
   return useQuery({
-    queryKey: ['filter-markers', orderId],
+    queryKey: ['sample-marker-facets', params],
     queryFn: async () => {
-      const params = {};
-      if (orderId) {
-        params.analysis_order = orderId;
-      }
-      const { data } = await client.get('/api/markers/', { params });
-      return data.results ?? data;
+      const { data } = await client.get('/staff/api/sample-markers/facets/', {
+        params,
+      });
+      return data;
     },
-    staleTime: 60_000,
+    staleTime: 30_000,
+    placeholderData: (prev) => prev,
   });
 }
 
@@ -62,43 +73,10 @@ export function useAllMarkers() {
   return useQuery({
     queryKey: ['all-markers'],
     queryFn: async () => {
-      const { data } = await client.get('/api/markers/');
-      return data.results ?? data;
+      const { markers } = await referenceData();
+      return markers.map(asMarker);
     },
-    staleTime: 60_000,
-  });
-}
-
-/**
- * Fetch species available in this analysis order (or all if no order selected).
- */
-export function useSpeciesFilterOptions() {
-  const orderId = useOrderStore((s) => s.orderId);
-  return useQuery({
-    queryKey: ['filter-species', orderId],
-    queryFn: async () => {
-      const params = {};
-      if (orderId) {
-        params.analysis_order = orderId;
-      }
-      const { data } = await client.get('/api/species/', { params });
-      return data.results ?? data;
-    },
-    staleTime: 60_000,
-  });
-}
-
-/**
- * Fetch all sample types for filter dropdown.
- */
-export function useSampleTypeFilterOptions() {
-  return useQuery({
-    queryKey: ['filter-sample-types'],
-    queryFn: async () => {
-      const { data } = await client.get('/api/sample-types/');
-      return data.results ?? data;
-    },
-    staleTime: 60_000,
+    staleTime: Infinity,
   });
 }
 
@@ -109,10 +87,10 @@ export function useIsolationMethodFilterOptions() {
   return useQuery({
     queryKey: ['filter-isolation-methods'],
     queryFn: async () => {
-      const { data } = await client.get('/api/isolation-methods/');
-      return data.results ?? data;
+      const { isolation_methods } = await referenceData();
+      return isolation_methods;
     },
-    staleTime: 60_000,
+    staleTime: Infinity,
   });
 }
 
@@ -166,17 +144,22 @@ export function useAnalysisPlateSearch(searchTerm, filters = {}) {
 }
 
 /**
- * Fetch positions for a specific plate.
+ * Fetch positions for a specific plate, kept in sync with the server
+ * by fetching only the changes.
  */
 export function usePlatePositions(plateId) {
+  const queryClient = useQueryClient();
+  const queryKey = ['analysisPlatePositions', plateId];
   return useQuery({
-    queryKey: ['analysisPlatePositions', plateId],
-    queryFn: async () => {
-      const { data } = await client.get('/api/plate-positions/', {
-        params: { plate: plateId },
-      });
-      return data.results ?? data;
-    },
+    queryKey,
+    // after a mutation only the positions that changed are fetched again
+    queryFn: () =>
+      fetchSyncedList(
+        queryKey,
+        '/api/plate-positions/',
+        { plate: plateId },
+        queryClient.getQueryData(queryKey),
+      ),
     enabled: !!plateId,
     staleTime: 30_000,
   });
@@ -203,10 +186,10 @@ export function useAnalysisTypes() {
   return useQuery({
     queryKey: ['analysis-types'],
     queryFn: async () => {
-      const { data } = await client.get('/api/analysis-types/');
-      return data.results ?? data;
+      const { analysis_types } = await referenceData();
+      return analysis_types;
     },
-    staleTime: 60_000,
+    staleTime: Infinity,
   });
 }
 
@@ -218,14 +201,10 @@ export function useMarkersForAnalysisType(analysisTypeId) {
   return useQuery({
     queryKey: ['markers-for-analysis-type', analysisTypeId],
     queryFn: async () => {
-      const params = {};
-      if (analysisTypeId) {
-        params.analysis_type = analysisTypeId;
-      }
-      const { data } = await client.get('/api/markers/', { params });
-      return data.results ?? data;
+      const { markers } = await referenceData();
+      return markers.filter((m) => m.analysis_type === Number(analysisTypeId)).map(asMarker);
     },
-    staleTime: 60_000,
+    staleTime: Infinity,
     enabled: !!analysisTypeId,
   });
 }
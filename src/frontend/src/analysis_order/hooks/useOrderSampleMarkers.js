@@ -6,7 +6,7 @@ import useOrderStore from '../store';
 /**
  * Build query params object from filters, excluding empty values.
  */
-function buildFilterParams(filters) {
+export function buildFilterParams(filters) {
   const params = {};
   for (const [key, value] of Object.entries(filters || {})) {
     if (value !== '' && value != null) {
@@ -23,7 +23,7 @@ const locationOptions = async (input) => {
   if (input) {
     base += `?search=${input}`;
   }
-  return (await client.get(base)).data;
+  return (await client.get(base)).data.results;
 };
 
 function prevent(e) {
@@ -0,0 +1,37 @@
+import axios from 'axios';
+
+// bundles by URL: the URL embedded in the page carries the version, so the
+// browser answers from its cache and each page fetches a bundle at most once
+const bundles = new Map();
+
+function toObjects(table) {
+  if (!table) {
+    return null;
+  }
+  return table.rows.map((row) => Object.fromEntries(table.fields.map((f, i) => [f, row[i]])));
+}
+
+/**
+ * Reference data of the page (species, markers, sample types, analysis types,
+ * isolation methods, location types and locations), as lists of objects.
+ * `locations` is null when the area has too many, search them with the API then.
+ * @param {string} url - The `reference_bundle_url` of the initial data
+ */
+export function fetchReferenceData(url) {
+  if (!bundles.has(url)) {
+    const request = axios.get(url).then(({ data }) =>
+      Object.fromEntries(Object.entries(data).map(([name, table]) => [name, toObjects(table)])),
+    );
+    request.catch(() => bundles.delete(url));
+    bundles.set(url, request);
+  }
+  return bundles.get(url);
+}
+
+/**
+ * Filter by `name` with the input of a select, like `name__icontains`.
+ */
+export function matchName(items, input) {
+  const term = (input || '').toLowerCase();
+  return items.filter((item) => !term || (item.name || '').toLowerCase().includes(term));
+}
@@ -3,6 +3,7 @@ import classnames from 'classnames';
 import Well from './Well';
 import usePlateStore from '../store';
 import { usePlatePositions } from '../hooks/usePlatePositions';
+import { usePlateEvents } from '../hooks/usePlateEvents';
 
 const ROWS = 'ABCDEFGH'.split('');
 const COLS = Array.from({ length: 12 }, (_, i) => i + 1);
@@ -59,6 +60,7 @@ export default function PlateGrid({
 }) {
   const positions = usePlateStore((s) => s.positions);
   const { isLoading, isError, error } = usePlatePositions();
+  usePlateEvents();
   const [copyStatus, setCopyStatus] = useState(null); // 'success' | 'error' | null
 
   const handleCopyToClipboard = useCallback(async () => {
@@ -0,0 +1,41 @@
+import { useEffect } from 'react';
+import { useQueryClient } from '@tanstack/react-query';
+import usePlateStore from '../store';
+
+const POLL_INTERVAL = 15000;
+
+/**
+ * Refetch the positions of the current plate when another user changes
+ * one of them, using the server-sent events of the plate.
+ *
+ * Under a WSGI server (e.g. runserver) the stream is answered with a 204,
+ * which closes the EventSource: poll the positions instead.
+ */
+export function usePlateEvents() {
+  const plateId = usePlateStore((s) => s.plateId);
+  const queryClient = useQueryClient();
+
+  useEffect(() => {
+    if (!plateId) return undefined;
+
+    const source = new EventSource(`/staff/events/?topic=plate:${plateId}`);
+    const refetch = () => queryClient.invalidateQueries({ queryKey: ['plate-positions', plateId] });
+    source.addEventListener('position', refetch);
+    // events sent while reconnecting are lost
+    let connected = false;
+    source.addEventListener('open', () => {
+      if (connected) refetch();
+      connected = true;
+    });
+    let poll = null;
+    source.addEventListener('error', () => {
+      if (source.readyState === EventSource.CLOSED && !poll) {
+        poll = setInterval(refetch, POLL_INTERVAL);
+      }
+    });
+    return () => {
+      source.close();
+      clearInterval(poll);
+    };
+  }, [plateId, queryClient]);
+}
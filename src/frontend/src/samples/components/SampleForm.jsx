@@ -9,19 +9,12 @@ import { useStore } from '@tanstack/react-store';
 import toast from 'react-hot-toast';
 import PastableArrayInput from '../../helpers/PastableArrayInput';
 import { SELECT_STYLES } from '../../helpers/libs';
-
-const speciesOptions = async (input) => {
-  let base = `/api/species/?ext_order=${config.order}`;
-  if (input) {
-    base += `&name__icontains=${input}`;
-  }
-  return (await client.get(base)).data;
-};
-
-const sampleTypesOptions = async (input) => {
-  return (await client.get(`/api/sample-types/?ext_order=${config.order}&name__icontains=${input}`))
-    .data;
-};
+import {
+  createLocation as postLocation,
+  locationOptions,
+  sampleTypesOptions,
+  speciesOptions,
+} from '../reference';
 
 const DEFAULT = {
   quantity: 1,
@@ -102,25 +95,12 @@ export default function SampleForm() {
   });
 
   const createLocation = useMutation({
-    mutationFn: ({ name, species }) => {
-      return client.post('/api/locations/', {
-        name,
-        species,
-      });
-    },
+    mutationFn: ({ name, species }) => postLocation(name, species),
     onSuccess: (data) => {
       setFieldValue('location', data.data);
     },
   });
 
-  const locationOptions = async (input, species) => {
-    let base = `/api/locations/?ext_order=${config.order}&species=${species?.id}`;
-    if (input) {
-      base += `&search=${input}`;
-    }
-    return (await client.get(base)).data;
-  };
-
   const formErrorMap = useStore(store, (state) => state.errorMap);
 
   return (
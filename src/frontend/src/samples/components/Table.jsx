@@ -21,6 +21,12 @@ import SelectCreateCell from './Cell/SelectCreateCell';
 import toast from 'react-hot-toast';
 import { AxiosError } from 'axios';
 import NumberCellInput from './Cell/NumberCellInput';
+import {
+  createLocation,
+  locationOptions,
+  sampleTypesOptions,
+  speciesOptions,
+} from '../reference';
 // import MultiSelectCell from "./Cell/MultiSelectCell";
 
 function askConfirm(fn) {
@@ -35,34 +41,11 @@ async function getSamples({ pageParam }) {
 
 const columnHelper = createColumnHelper();
 
-const speciesOptions = async (input) => {
-  return (await client.get(`/api/species/?ext_order=${config.order}&name__icontains=${input}`))
-    .data;
-};
-
-const sampleTypesOptions = async (input) => {
-  return (await client.get(`/api/sample-types/?ext_order=${config.order}&name__icontains=${input}`))
-    .data;
-};
-
 // const markersOptions = async (input) => {
 //   return (await client.get(`/api/markers/?order=${config.order}&name__icontains=${input}`)).data;
 // };
 
-const locationOptions = (species) => async (input) => {
-  let base = `/api/locations/?ext_order=${config.order}&species=${species?.id}`;
-  if (input) {
-    base += `&search=${input}`;
-  }
-  return (await client.get(base)).data;
-};
-
-const locationCreate = (species) => async (value) => {
-  return client.post('/api/locations/', {
-    name: value,
-    species: species?.id,
-  });
-};
+const locationCreate = (species) => (value) => createLocation(value, species?.id);
 
 const COLUMNS = [
   !config.analysis_data.needs_guid
@@ -97,7 +80,7 @@ const COLUMNS = [
     header: 'Location',
     cell: (props) => {
       const species = props.row.getValue('species');
-      const opts = locationOptions(species);
+      const opts = (input) => locationOptions(input, species);
       return (
         <SelectCreateCell
           {...props}
@@ -203,17 +186,44 @@ export default function Table() {
     fetchMoreOnBottomReached(tableContainerRef.current);
   }, [fetchMoreOnBottomReached]);
 
-  const updateCell = useMutation({
-    mutationFn: ({ id, ...data }) => {
-      return client.patch(`/api/samples/${id}/`, data);
+  const updateCells = useMutation({
+    mutationFn: (updates) => {
+      return client.patch('/api/samples/bulk/', updates);
     },
-    onSuccess: () => {
-      toast.success('Updated');
+    onSuccess: ({ data }) => {
+      data.errors.forEach(({ errors }) => {
+        Object.values(errors)
+          .flat()
+          .forEach((message) => toast.error(message));
+      });
+      if (data.results.length) {
+        toast.success('Updated');
+      }
       queryClient.invalidateQueries({ queryKey: ['samples'] });
     },
     onError: handleError,
   });
 
+  // the cells edited together (e.g. a pasted column) are saved in a single request
+  const pendingUpdates = useRef(null);
+  const updateCell = useCallback(
+    (update) => {
+      if (!pendingUpdates.current) {
+        const updates = [];
+        pendingUpdates.current = {
+          updates,
+          promise: Promise.resolve().then(() => {
+            pendingUpdates.current = null;
+            return updateCells.mutateAsync(updates);
+          }),
+        };
+      }
+      pendingUpdates.current.updates.push(update);
+      return pendingUpdates.current.promise;
+    },
+    [updateCells.mutateAsync],
+  );
+
   const deleteRow = useMutation({
     mutationFn: ({ id }) => {
       return client.delete(`/api/samples/${id}/`);
@@ -256,7 +266,7 @@ export default function Table() {
     mutateDeleteAllRows.isPending ||
     mutateConfirm.isPending ||
     deleteRow.isPending ||
-    updateCell.isPending;
+    updateCells.isPending;
 
   const table = useReactTable({
     data: flatData,
@@ -268,7 +278,7 @@ export default function Table() {
       maxSize: 450,
     },
     meta: {
-      updateData: updateCell.mutateAsync,
+      updateData: updateCell,
       deleteRow: deleteRow.mutateAsync,
     },
   });
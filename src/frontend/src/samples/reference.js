@@ -0,0 +1,77 @@
+import { config, client } from './config';
+import { fetchReferenceData, matchName } from '../helpers/referenceData';
+
+const referenceData = () => fetchReferenceData(config.reference_bundle_url);
+
+const asOption = ({ id, name }) => ({ id, name });
+
+// same label as Location.__str__
+const locationLabel = (location) =>
+  location.river_id ? `${location.river_id} ${location.name}` : location.name;
+
+/**
+ * The species of the order, filtered by name.
+ */
+export async function speciesOptions(input) {
+  const ids = new Set(config.analysis_data.species.map((s) => s.id));
+  const { species } = await referenceData();
+  return matchName(species, input)
+    .filter((s) => ids.has(s.id))
+    .map(asOption);
+}
+
+/**
+ * The sample types of the order, filtered by name.
+ */
+export async function sampleTypesOptions(input) {
+  const ids = new Set(config.analysis_data.sample_types.map((s) => s.id));
+  const { sample_types } = await referenceData();
+  return matchName(sample_types, input)
+    .filter((s) => ids.has(s.id))
+    .map(asOption);
+}
+
+/**
+ * The locations compatible with a species, searched by the start of
+ * their name or river id.
+ */
+export async function locationOptions(input, species) {
+  const data = await referenceData();
+  if (data.locations === null) {
+    // too many for the bundle, search the first page of the compatible ones
+    let base = `/api/locations/?ext_order=${config.order}&species=${species?.id}`;
+    if (input) {
+      base += `&search=${input}`;
+    }
+    return (await client.get(base)).data.results;
+  }
+
+  const locationType = data.species.find((s) => s.id === species?.id)?.location_type;
+  const term = (input || '').toLowerCase();
+  return data.locations
+    .filter(
+      (l) =>
+        l.types.includes(locationType) &&
+        (!term ||
+          l.name.toLowerCase().startsWith(term) ||
+          (l.river_id || '').toLowerCase().startsWith(term)),
+    )
+    .map((l) => ({ id: l.id, name: locationLabel(l) }));
+}
+
+/**
+ * Create a location for a species, and add it to the loaded bundle
+ * until the page is reloaded with the new one.
+ */
+export async function createLocation(name, speciesId) {
+  const response = await client.post('/api/locations/', { name, species: speciesId });
+  const data = await referenceData();
+  const locationType = data.species.find((s) => s.id === speciesId)?.location_type;
+  data.locations?.push({
+    id: response.data.id,
+    name: response.data.name,
+    river_id: null,
+    types: locationType ? [locationType] : [],
+  });
+  return response;
+}
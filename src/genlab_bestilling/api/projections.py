@@ -0,0 +1,72 @@
+from collections import defaultdict
+from typing import Any
+
+from shared.projections import Projection
+
+from ..models import Location, Sample
+from .serializers import SampleSerializer
+
+
+class SampleProjection(Projection):
+    """Output of SampleSerializer, for the sample list."""
+
+    output = SampleSerializer.Meta.fields
+    lookups = {
+        "id": "id",
+        "order": "order_id",
+        "guid": "guid",
+        "name": "name",
+        "year": "year",
+        "notes": "notes",
+        "pop_id": "pop_id",
+        "volume": "volume",
+        "genlab_id": "genlab_id",
+    }
+    columns = (
+        "species_id",
+        "species__name",
+        "species__location_type_id",
+        "location_id",
+        "location__name",
+        "location__river_id",
+        "type_id",
+        "type__name",
+        "order__genrequest__area__location_mandatory",
+    )
+
+    def prepare(self, rows: list[dict[str, Any]]) -> None:
+        self.location_types: dict[int, list[int]] = defaultdict(list)
+        for location_id, location_type_id in Location.types.through.objects.filter(
+            location_id__in={row["location_id"] for row in rows} - {None}
+        ).values_list("location_id", "locationtype_id"):
+            self.location_types[location_id].append(location_type_id)
+
+    def get_species(self, row: dict[str, Any]) -> dict:
+        return {"id": row["species_id"], "name": row["species__name"]}
+
+    def get_location(self, row: dict[str, Any]) -> dict | None:
+        if row["location_id"] is None:
+            return None
+        # as Location.__str__
+        name = row["location__name"]
+        if river_id := row["location__river_id"]:
+            name = f"{river_id} {name}"
+        return {"id": row["location_id"], "name": name}
+
+    def get_type(self, row: dict[str, Any]) -> dict | None:
+        if row["type_id"] is None:
+            return None
+        return {"id": row["type_id"], "name": row["type__name"]}
+
+    def get_has_error(self, row: dict[str, Any]) -> bool | str:
+        msg = Sample.get_sheet_error(
+            {
+                **row,
+                "location_mandatory": row[
+                    "order__genrequest__area__location_mandatory"
+                ],
+                "species_location_type_id": row["species__location_type_id"],
+            },
+            lambda: self.location_types.get(row["location_id"], []),
+        )
+        return msg or False
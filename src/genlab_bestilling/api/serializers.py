@@ -241,6 +241,42 @@ class SampleUpdateSerializer(serializers.ModelSerializer):
         )
 
 
+class SampleBulkUpdateSerializer(serializers.ModelSerializer):
+    """
+    A row of a bulk update, the references are plain ids
+    that the view resolves with one query per model.
+    """
+
+    id = serializers.IntegerField()
+    species = serializers.IntegerField()
+    location = serializers.IntegerField(allow_null=True)
+    type = serializers.IntegerField(allow_null=True)
+
+    class Meta:
+        model = Sample
+        fields = (
+            "id",
+            "guid",
+            "species",
+            "year",
+            "name",
+            "notes",
+            "pop_id",
+            "location",
+            "type",
+        )
+
+
+class SampleBulkUpdateErrorSerializer(serializers.Serializer):
+    index = serializers.IntegerField()
+    errors = serializers.DictField()
+
+
+class SampleBulkUpdateResultSerializer(serializers.Serializer):
+    results = SampleUpdateSerializer(many=True)
+    errors = SampleBulkUpdateErrorSerializer(many=True)
+
+
 class SampleBulkSerializer(serializers.ModelSerializer):
     quantity = serializers.IntegerField()
     name = serializers.ListField(
@@ -1,19 +1,31 @@
 import contextlib
 import re
+import tempfile
 import uuid
+from collections import defaultdict
+from datetime import timedelta
+from pathlib import Path
 from typing import Any
 
+from django.conf import settings
+from django.core.files.storage import storages
 from django.db import transaction
-from django.db.models import OuterRef, Prefetch, QuerySet, Subquery
-from django.http import HttpResponse
+from django.db.models import QuerySet
+from django.http import FileResponse, HttpResponse
+from django.tasks import TaskResultStatus
+from django.tasks.exceptions import TaskResultDoesNotExist
+from django.utils import timezone
 from django.views import View
 from drf_spectacular.utils import extend_schema
+from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.pagination import CursorPagination
 from rest_framework.permissions import SAFE_METHODS, BasePermission, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.serializers import BaseSerializer
+from rest_framework.views import APIView
 from rest_framework.viewsets import (  # type: ignore[attr-defined]
     GenericViewSet,
     ModelViewSet,
@@ -26,6 +38,10 @@ from genlab_bestilling.api.constants import (
     SAMPLE_CSV_FIELD_LABELS,
     SAMPLE_CSV_FIELDS_BY_AREA,
 )
+from shared.projections import ProjectedListMixin
+from shared.tracing import span
+from shared.transfers import DirectFileTransfer
+from shared.views import ReadOnlyRequestMixin
 
 from ..filters import (
     LocationFilter,
@@ -40,7 +56,6 @@ from ..models import (
     AnalysisType,
     EquipmentOrder,
     ExtractionOrder,
-    ExtractionPlate,
     Genrequest,
     IsolationMethod,
     Location,
@@ -50,6 +65,9 @@ from ..models import (
     SampleType,
     Species,
 )
+from ..reference import get_bundle
+from ..tasks import export_samples_xlsx
+from .projections import SampleProjection
 from .serializers import (
     AnalysisOrderSerializer,
     EnumSerializer,
@@ -64,6 +82,8 @@ from .serializers import (
     MarkerSerializer,
     OperationStatusSerializer,
     SampleBulkSerializer,
+    SampleBulkUpdateResultSerializer,
+    SampleBulkUpdateSerializer,
     SampleCSVSerializer,
     SampleMarkerAnalysisBulkDeleteSerializer,
     SampleMarkerAnalysisBulkSerializer,
@@ -71,6 +91,7 @@ from .serializers import (
     SampleSerializer,
     SampleUpdateSerializer,
 )
+from .xlsx import XLSX_CONTENT_TYPE, SampleXLSXExporter
 
 
 class IDCursorPagination(CursorPagination):
@@ -78,6 +99,11 @@ class IDCursorPagination(CursorPagination):
     page_size = 50
 
 
+class LocationCursorPagination(CursorPagination):
+    ordering = ("name", "id")
+    page_size = 50
+
+
 class AllowSampleDraft(BasePermission):
     """
     Prevent any UNSAFE method (POST, PUT, DELETE) on orders that are not draft
@@ -162,16 +188,22 @@ class SampleCSVExportMixin:
         fields_by_area: dict[str, tuple[str, ...]],
         filename: str = "export.csv",
     ) -> HttpResponse:
-        area_name = self.get_area_name(queryset)
-        serializer = serializer_class(queryset, many=True)
-        fields, headers = self.get_csv_fields_and_labels(
-            area_name, queryset, fields_by_area
-        )
-        data = self.build_csv_data(serializer.data, fields, area_name)
+        with span(
+            "sample.export_csv",
+            serializer=serializer_class.__name__,
+            filename=filename,
+        ) as export:
+            area_name = self.get_area_name(queryset)
+            serializer = serializer_class(queryset, many=True)
+            fields, headers = self.get_csv_fields_and_labels(
+                area_name, queryset, fields_by_area
+            )
+            data = self.build_csv_data(serializer.data, fields, area_name)
 
-        csv_data = CSVRenderer().render(
-            data, media_type="text/csv", renderer_context={"header": headers}
-        )
+            csv_data = CSVRenderer().render(
+                data, media_type="text/csv", renderer_context={"header": headers}
+            )
+            export.set(area=area_name, row_count=len(data))
 
         return HttpResponse(
             csv_data,
@@ -180,42 +212,22 @@ class SampleCSVExportMixin:
         )
 
 
-class SampleViewset(ModelViewSet, SampleCSVExportMixin):
+class SampleViewset(
+    ReadOnlyRequestMixin, ProjectedListMixin, ModelViewSet, SampleCSVExportMixin
+):
+    # Larger exports must go through the background xlsx-export action
+    XLSX_SYNC_MAX_ROWS = 20000
+    BULK_UPDATE_MAX_ROWS = 1000
+
     queryset = Sample.objects.all()
     serializer_class = SampleSerializer
+    projection_class = SampleProjection
     filterset_class = SampleFilter
     pagination_class = IDCursorPagination
     permission_classes = [AllowSampleDraft, IsAuthenticated]
 
     def get_queryset(self) -> QuerySet:
-        return (
-            super()
-            .get_queryset()
-            .select_related(
-                "type",
-                "species",
-                "order",
-                "order__genrequest",
-                "order__genrequest__area",
-                "location",
-                "position__plate",
-            )
-            .prefetch_related(
-                Prefetch(
-                    "order__analysis_orders",
-                    queryset=AnalysisOrder.objects.only("id"),
-                ),
-                "isolation_method",
-            )
-            .annotate(
-                plate_qiagen_id=Subquery(
-                    ExtractionPlate.objects.filter(
-                        pk=OuterRef("position__plate_id")
-                    ).values("qiagen_id")[:1]
-                ),
-            )
-            .order_by("genlab_id", "type")
-        )
+        return super().get_queryset().with_sheet_data().order_by("genlab_id", "type")
 
     def get_serializer_class(self) -> type[BaseSerializer]:
         if self.action == "csv":
@@ -269,6 +281,84 @@ class SampleViewset(ModelViewSet, SampleCSVExportMixin):
             filename=filename,
         )
 
+    @action(methods=["GET"], url_path="xlsx", detail=False)
+    def xlsx(self, request: Request) -> HttpResponse:
+        """
+        Download the sample sheet as XLSX, with one sheet per area
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+
+        if queryset.count() > self.XLSX_SYNC_MAX_ROWS:
+            return Response(
+                {
+                    "error": "Too many samples for a direct download, "
+                    "request a background export instead."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        exporter = SampleXLSXExporter(SampleCSVSerializer, SAMPLE_CSV_FIELDS_BY_AREA)
+        file = tempfile.TemporaryFile()  # noqa: SIM115 # closed by FileResponse
+        exporter.write(queryset, file)
+        file.seek(0)
+
+        return FileResponse(
+            file,
+            as_attachment=True,
+            filename=f"Complete_sheet_EXT_{self.get_order_id(queryset)}.xlsx",
+            content_type=XLSX_CONTENT_TYPE,
+        )
+
+    @action(methods=["POST"], url_path="xlsx-export", detail=False)
+    def xlsx_export(self, request: Request) -> Response:
+        """
+        Queue an XLSX export of the samples matching the query parameters
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        result = export_samples_xlsx.enqueue(
+            user_id=request.user.pk,
+            params=dict(request.query_params.lists()),
+            filename=f"Complete_sheet_EXT_{self.get_order_id(queryset)}.xlsx",
+        )
+        return Response({"task_id": result.id}, status=status.HTTP_202_ACCEPTED)
+
+    @action(
+        methods=["GET"],
+        url_path=r"xlsx-export/(?P<task_id>[^/.]+)",
+        detail=False,
+    )
+    def xlsx_export_status(self, request: Request, task_id: str) -> Response:
+        """
+        Report the status of a queued XLSX export and its download url once done
+        """
+        try:
+            result = export_samples_xlsx.get_result(task_id)
+        except TaskResultDoesNotExist:
+            result = None
+
+        if result is None or result.kwargs.get("user_id") != request.user.pk:
+            return Response(
+                {"error": "Export not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+
+        data = {"status": result.status}
+        if result.status == TaskResultStatus.SUCCESSFUL:
+            # the file is pruned once its url would expire, see prune_exports
+            expires_at = result.finished_at + timedelta(
+                seconds=settings.DIRECT_TRANSFER_EXPIRY
+            )
+            expires_in = int((expires_at - timezone.now()).total_seconds())
+            if expires_in <= 0:
+                return Response(
+                    {"error": "Export expired"}, status=status.HTTP_410_GONE
+                )
+            data["url"] = storages["exports"].presigned_download(
+                result.return_value,
+                expires_in=expires_in,
+                filename=Path(result.return_value).name,
+            )
+        return Response(data)
+
     @extend_schema(
         request=SampleBulkSerializer, responses={200: OperationStatusSerializer}
     )
@@ -313,6 +403,131 @@ class SampleViewset(ModelViewSet, SampleCSVExportMixin):
 
         return Response(data=OperationStatusSerializer({"success": True}).data)
 
+    @extend_schema(
+        request=SampleBulkUpdateSerializer(many=True),
+        responses={200: SampleBulkUpdateResultSerializer},
+    )
+    @bulk_create.mapping.patch
+    def bulk_update(self, request: Request) -> Response:
+        """
+        Update multiple samples at once, each row has the id of a sample
+        and the fields to change. The rows that cannot be applied are
+        reported by index in the errors, the others are saved.
+        """
+        rows = request.data
+        if not isinstance(rows, list) or len(rows) > self.BULK_UPDATE_MAX_ROWS:
+            return Response(
+                {
+                    "error": "Expected a list of at most "
+                    f"{self.BULK_UPDATE_MAX_ROWS} samples."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        errors: dict[int, dict[str, Any]] = {}
+        changes: dict[int, dict[str, Any]] = {}
+        for index, row in enumerate(rows):
+            serializer = SampleBulkUpdateSerializer(data=row, partial=True)
+            if not serializer.is_valid():
+                errors[index] = serializer.errors
+            elif "id" not in serializer.validated_data:
+                errors[index] = {"id": ["This field is required."]}
+            else:
+                changes[index] = dict(serializer.validated_data)
+
+        # a single query for the samples (ownership included) and each reference
+        samples = (
+            Sample.objects.filter_allowed(request.user)  # type: ignore[attr-defined]
+            .filter(pk__in=[change["id"] for change in changes.values()])
+            .select_related("order__genrequest__area", "species", "type", "location")
+            .prefetch_related("location__types")
+            .in_bulk()
+        )
+        references = {
+            field: queryset.in_bulk(
+                {
+                    change[field]
+                    for change in changes.values()
+                    if change.get(field) is not None
+                }
+            )
+            for field, queryset in self.get_bulk_update_references().items()
+        }
+
+        updated = []
+        samples_by_fields = defaultdict(list)
+        for index, change in changes.items():
+            sample = samples.get(change.pop("id"))
+            try:
+                fields = self.apply_bulk_update(sample, change, references)
+            except ValidationError as e:
+                errors[index] = e.detail  # type: ignore[assignment]
+                continue
+            if fields:
+                samples_by_fields[frozenset(fields)].append(sample)
+            updated.append(sample)
+
+        for fields, group in samples_by_fields.items():
+            Sample.objects.bulk_update(group, sorted(fields))
+
+        result = SampleBulkUpdateResultSerializer(
+            {
+                "results": updated,
+                "errors": [
+                    {"index": index, "errors": errors[index]}
+                    for index in sorted(errors)
+                ],
+            }
+        )
+        return Response(result.data)
+
+    def get_bulk_update_references(self) -> dict[str, QuerySet]:
+        return {
+            "species": Species.objects.all(),
+            "location": Location.objects.prefetch_related("types"),
+            "type": SampleType.objects.all(),
+        }
+
+    def apply_bulk_update(
+        self,
+        sample: Sample | None,
+        change: dict[str, Any],
+        references: dict[str, dict[int, Any]],
+    ) -> set[str]:
+        """
+        Set the changed values on the sample and return the fields that changed
+        """
+        if sample is None:
+            raise ValidationError({"id": ["Sample not found."]})
+        # same rule as AllowSampleDraft
+        if sample.order is None or sample.order.status != (
+            ExtractionOrder.OrderStatus.DRAFT
+        ):
+            raise ValidationError({"id": ["The order of the sample is not a draft."]})
+
+        values = dict(change)
+        missing = {}
+        for field, objects in references.items():
+            if values.get(field) is not None:
+                values[field] = objects.get(values[field])
+                if values[field] is None:
+                    missing[field] = [
+                        f'Invalid pk "{change[field]}" - object does not exist.'
+                    ]
+        if missing:
+            raise ValidationError(missing)
+
+        fields = set()
+        for field, value in values.items():
+            if getattr(sample, field) != value:
+                setattr(sample, field, value)
+                fields.add(field)
+        if fields & {"name", "year", "location"}:
+            # as in Sample.save
+            sample.fish_id = sample.get_fish_id()
+            fields.add("fish_id")
+        return fields
+
 
 class AllowOrderDraft(BasePermission):
     def has_object_permission(
@@ -326,7 +541,7 @@ class AllowOrderDraft(BasePermission):
         return True
 
 
-class ExtractionOrderViewset(ModelViewSet):
+class ExtractionOrderViewset(ReadOnlyRequestMixin, ModelViewSet):
     queryset = ExtractionOrder.objects.all()
     permission_classes = [IsAuthenticated, AllowOrderDraft]
 
@@ -368,38 +583,49 @@ class ExtractionOrderViewset(ModelViewSet):
         return Response(data=OperationStatusSerializer({"success": True}).data)
 
 
-class SampleTypeViewset(mixins.ListModelMixin, GenericViewSet):
+class SampleTypeViewset(ReadOnlyRequestMixin, mixins.ListModelMixin, GenericViewSet):
     queryset = SampleType.objects.all().order_by("name")
     serializer_class = KoncivSerializer
     filterset_class = SampleTypeFilter
 
 
-class AnalysisTypeViewset(mixins.ListModelMixin, GenericViewSet):
+class AnalysisTypeViewset(ReadOnlyRequestMixin, mixins.ListModelMixin, GenericViewSet):
     queryset = AnalysisType.objects.all().order_by("name")
     serializer_class = KoncivSerializer
 
 
-class IsolationMethodViewset(mixins.ListModelMixin, GenericViewSet):
+class IsolationMethodViewset(
+    ReadOnlyRequestMixin, mixins.ListModelMixin, GenericViewSet
+):
     queryset = IsolationMethod.objects.all().order_by("name")
     serializer_class = EnumSerializer
 
 
-class SpeciesViewset(mixins.ListModelMixin, GenericViewSet):
+class SpeciesViewset(ReadOnlyRequestMixin, mixins.ListModelMixin, GenericViewSet):
     queryset = Species.objects.all().order_by("name")
     serializer_class = EnumSerializer
     filterset_class = SpeciesFilter
 
 
-class MarkerViewset(mixins.ListModelMixin, GenericViewSet):
+class MarkerViewset(ReadOnlyRequestMixin, mixins.ListModelMixin, GenericViewSet):
     queryset = Marker.objects.all().order_by("name")
     serializer_class = MarkerSerializer
     filterset_class = MarkerFilter
 
 
-class LocationViewset(mixins.ListModelMixin, mixins.CreateModelMixin, GenericViewSet):
+class LocationViewset(
+    ReadOnlyRequestMixin, mixins.ListModelMixin, mixins.CreateModelMixin, GenericViewSet
+):
+    """
+    Locations by prefix of river id, code or name (``?search=``), for a
+    species (``?species=``, the ones its samples can be taken at) or an
+    area (``?area=``), a page at a time.
+    """
+
     queryset = Location.objects.all().order_by("name")
     serializer_class = LocationSerializer
     filterset_class = LocationFilter
+    pagination_class = LocationCursorPagination
 
     def get_serializer_class(self) -> type[BaseSerializer]:
         if self.action == "create":
@@ -407,7 +633,39 @@ class LocationViewset(mixins.ListModelMixin, mixins.CreateModelMixin, GenericVie
         return super().get_serializer_class()
 
 
-class SampleMarkerAnalysisViewset(mixins.ListModelMixin, GenericViewSet):
+class ReferenceBundleView(ReadOnlyRequestMixin, APIView):
+    """
+    Reference data of an area (``?area=``), see ``genlab_bestilling.reference``.
+
+    Requested with the current version (``?v=``) the bundle is cached by the
+    browser for good, as a new version gets a new URL.
+    """
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> HttpResponse:
+        area = request.query_params.get("area")
+        try:
+            area_id = int(area) if area else None
+        except ValueError as e:
+            raise ValidationError({"area": "A valid integer is required."}) from e
+
+        bundle = get_bundle(area_id)
+        etag = f'"{bundle.version}"'
+        if etag in request.headers.get("If-None-Match", ""):
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = HttpResponse(bundle.content, content_type="application/json")
+        response["ETag"] = etag
+        response["Cache-Control"] = (
+            "private, max-age=31536000, immutable"
+            if request.query_params.get("v") == bundle.version
+            else "private, no-cache"
+        )
+        return response
+
+
+class SampleMarkerAnalysisViewset(
+    ReadOnlyRequestMixin, mixins.ListModelMixin, GenericViewSet
+):
     queryset = SampleMarkerAnalysis.objects.all()
     serializer_class = SampleMarkerAnalysisSerializer
     filterset_class = SampleMarkerOrderFilter
@@ -477,7 +735,7 @@ class SampleMarkerAnalysisViewset(mixins.ListModelMixin, GenericViewSet):
         return Response(data=OperationStatusSerializer({"success": True}).data)
 
 
-class GenrequestViewset(ModelViewSet):
+class GenrequestViewset(ReadOnlyRequestMixin, ModelViewSet):
     queryset = Genrequest.objects.all()
     serializer_class = GenrequestSerializer
     permission_classes = [IsAuthenticated]
@@ -509,7 +767,10 @@ class AllowOrderEdit(BasePermission):
         return True
 
 
-class AnalysisOrderViewset(ModelViewSet):
+class AnalysisOrderViewset(ReadOnlyRequestMixin, ModelViewSet):
+    # Same limit as the upload widget of the order form
+    METADATA_FILE_MAX_SIZE = 2 * 1024 * 1024
+
     queryset = AnalysisOrder.objects.all()
     serializer_class = AnalysisOrderSerializer
     permission_classes = [IsAuthenticated, AllowOrderEdit]
@@ -531,8 +792,55 @@ class AnalysisOrderViewset(ModelViewSet):
         obj.confirm_order()
         return Response(self.get_serializer(obj).data)
 
+    def get_metadata_file_transfer(self, obj: AnalysisOrder) -> DirectFileTransfer:
+        return DirectFileTransfer(
+            obj, "metadata_file", max_size=self.METADATA_FILE_MAX_SIZE
+        )
+
+    @action(methods=["POST"], url_path="metadata-file/upload-url", detail=True)
+    def metadata_file_upload_url(self, request: Request, pk: int | str) -> Response:
+        """
+        Presign a direct upload of the metadata file to the storage
+        """
+        filename = request.data.get("filename")
+        if not filename:
+            return Response(
+                {"error": "No filename provided"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        transfer = self.get_metadata_file_transfer(self.get_object())
+        try:
+            data = transfer.start_upload(filename)
+        except DirectFileTransfer.TransferError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(data)
+
+    @action(methods=["POST"], url_path="metadata-file/finalize", detail=True)
+    def metadata_file_finalize(self, request: Request, pk: int | str) -> Response:
+        """
+        Register a metadata file uploaded directly to the storage
+        """
+        obj = self.get_object()
+        try:
+            self.get_metadata_file_transfer(obj).finalize(request.data.get("token", ""))
+        except DirectFileTransfer.TransferError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(self.get_serializer(obj).data)
+
+    @action(methods=["GET"], url_path="metadata-file/download-url", detail=True)
+    def metadata_file_download_url(self, request: Request, pk: int | str) -> Response:
+        """
+        Presign a direct download of the metadata file from the storage
+        """
+        transfer = self.get_metadata_file_transfer(self.get_object())
+        try:
+            url = transfer.download_url()
+        except DirectFileTransfer.TransferError as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        return Response({"url": url})
+
 
-class EquipmentOrderViewset(ModelViewSet):
+class EquipmentOrderViewset(ReadOnlyRequestMixin, ModelViewSet):
     queryset = EquipmentOrder.objects.all()
     serializer_class = EquipmentOrderSerializer
     permission_classes = [IsAuthenticated, AllowOrderEdit]
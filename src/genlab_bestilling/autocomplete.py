@@ -2,6 +2,8 @@ from dal import autocomplete
 from django.db import models
 from django.http import HttpRequest, JsonResponse
 
+from shared.autocomplete import IndexedAutocompleteMixin
+
 from .models import (
     AnalysisOrder,
     AnalysisPlate,
@@ -58,18 +60,19 @@ class GenrequestAutocomplete(autocomplete.Select2QuerySetView):
     model = Genrequest
 
 
-class LocationAutocomplete(autocomplete.Select2QuerySetView):
+class LocationAutocomplete(IndexedAutocompleteMixin, autocomplete.Select2QuerySetView):
     model = Location
+    prefix_fields = ("river_id", "code", "name")
+    trigram_fields = ("name",)
 
     def get_queryset(self) -> models.QuerySet:
-        qs = Location.objects.all()
-        if self.q:
-            qs = qs.filter(
-                models.Q(name__icontains=self.q)
-                | models.Q(river_id__icontains=self.q)
-                | models.Q(code__icontains=self.q)
-            )
-        return qs
+        queryset = Location.objects.all()
+        # forwarded by the sample filter forms
+        if species := self.forwarded.get("species"):
+            queryset = queryset.filter_compatible(species)
+        if area := self.forwarded.get("area"):
+            queryset = queryset.filter_area(area)
+        return self.search(queryset).order_by("name")[: self.max_results]
 
 
 class OrderAutocomplete(autocomplete.Select2QuerySetView):
@@ -109,8 +112,12 @@ class AnalysisPlateAutocomplete(autocomplete.Select2QuerySetView):
     ]
 
 
-class AvailableSampleAutocomplete(autocomplete.Select2QuerySetView):
+class AvailableSampleAutocomplete(
+    IndexedAutocompleteMixin, autocomplete.Select2QuerySetView
+):
     model = Sample
+    prefix_fields = ("genlab_id", "guid", "name")
+    trigram_fields = ("genlab_id", "name")
 
     def get_queryset(self) -> models.QuerySet:
         # Only show samples that are isolated, not invalid, and not already positioned
@@ -121,14 +128,7 @@ class AvailableSampleAutocomplete(autocomplete.Select2QuerySetView):
             position__isnull=True,  # Not already positioned
         ).select_related("species", "type", "order")
 
-        if self.q:
-            qs = qs.filter(
-                models.Q(genlab_id__icontains=self.q)
-                | models.Q(name__icontains=self.q)
-                | models.Q(guid__icontains=self.q)
-            )
-
-        return qs.order_by("genlab_id")[:50]  # Limit results
+        return self.search(qs).order_by("genlab_id")[: self.max_results]
 
     def get_result_label(self, item: Sample) -> str:
         """Customize how samples appear in the dropdown."""
@@ -136,7 +136,11 @@ class AvailableSampleAutocomplete(autocomplete.Select2QuerySetView):
         return f"{item.genlab_id} - {item.name} ({species_name})"
 
 
-class GenlabIdAutocomplete(autocomplete.Select2ListView):
+class GenlabIdAutocomplete(IndexedAutocompleteMixin, autocomplete.Select2ListView):
+    prefix_fields = ("genlab_id",)
+    trigram_fields = ("genlab_id",)
+    max_results = 30
+
     def get_list(self) -> list[str]:
         order_id = self.forwarded.get("order_id")
         if order_id is None:
@@ -144,16 +148,27 @@ class GenlabIdAutocomplete(autocomplete.Select2ListView):
 
         qs = Sample.objects.filter(order_id=order_id, genlab_id__isnull=False)
 
-        if self.q:
-            qs = qs.filter(genlab_id__icontains=self.q)
-
+        # genlab_id is unique, no need for a DISTINCT
         return list(
-            qs.order_by("genlab_id").values_list("genlab_id", flat=True).distinct()[:30]
+            self.search(qs)
+            .order_by("genlab_id")
+            .values_list("genlab_id", flat=True)[: self.max_results]
         )
 
 
-class AvailableSampleMarkerAutocomplete(autocomplete.Select2QuerySetView):
+class AvailableSampleMarkerAutocomplete(
+    IndexedAutocompleteMixin, autocomplete.Select2QuerySetView
+):
     model = SampleMarkerAnalysis
+    prefix_fields = ("sample__genlab_id", "sample__guid", "marker_id")
+    trigram_fields = ("sample__genlab_id",)
+
+    def get_search_filter(self, term: str) -> models.Q:
+        condition = super().get_search_filter(term)
+        # Match the primary key exactly instead of casting it to text
+        if term.isdigit():
+            condition |= models.Q(id=int(term))
+        return condition
 
     def get_queryset(self) -> models.QuerySet:
         # Only show sample markers where the sample has a position
@@ -162,15 +177,9 @@ class AvailableSampleMarkerAutocomplete(autocomplete.Select2QuerySetView):
             is_invalid=False,
         ).select_related("sample", "marker", "order", "marker__analysis_type")
 
-        if self.q:
-            qs = qs.filter(
-                models.Q(sample__genlab_id__icontains=self.q)
-                | models.Q(sample__guid__icontains=self.q)
-                | models.Q(marker__name__icontains=self.q)
-                | models.Q(id__icontains=self.q)
-            )
-
-        return qs.order_by("sample__genlab_id", "marker__name")[:50]  # Limit results
+        return self.search(qs).order_by("sample__genlab_id", "marker_id")[
+            : self.max_results
+        ]
 
     def get_result_label(self, item: SampleMarkerAnalysis) -> str:
         """Customize how sample markers appear in the dropdown."""
@@ -13,7 +13,7 @@ from .models import (
     Genrequest,
     Location,
     Marker,
-    Order,
+    OrderListing,
     Sample,
     SampleMarkerAnalysis,
     SampleType,
@@ -165,6 +165,7 @@ class MySampleFilter(filters.FilterSet):
         )
         self.filters["location"].extra["widget"] = autocomplete.ModelSelect2(
             url="autocomplete:location",
+            forward=["species"],
             attrs={"data-placeholder": "Filter by location"},
         )
 
@@ -271,13 +272,12 @@ class MarkerFilter(BaseOrderFilter):
 class LocationFilter(filters.FilterSet):
     ext_order = filters.NumberFilter(field_name="ext_order", method="filter_ext_order")
     species = filters.NumberFilter(field_name="species", method="filter_species")
+    area = filters.NumberFilter(field_name="area", method="filter_area")
     search = filters.CharFilter(method="filter_search")
 
     def filter_search(self, queryset: QuerySet, name: str, value: Any) -> QuerySet:
         if value:
-            return queryset.filter(
-                Q(name__istartswith=value) | Q(river_id__istartswith=value)
-            )
+            return queryset.filter_prefix(value)  # type: ignore[attr-defined]
         return queryset
 
     def filter_ext_order(self, queryset: QuerySet, name: str, value: Any) -> QuerySet:
@@ -289,9 +289,14 @@ class LocationFilter(filters.FilterSet):
 
     def filter_species(self, queryset: QuerySet, name: str, value: Any) -> QuerySet:
         if value:
-            return queryset.filter(Q(types__species=value))
+            return queryset.filter_compatible(value)  # type: ignore[attr-defined]
         return queryset.filter(types=True)
 
+    def filter_area(self, queryset: QuerySet, name: str, value: Any) -> QuerySet:
+        if value:
+            return queryset.filter_area(value)  # type: ignore[attr-defined]
+        return queryset
+
     class Meta:
         model = Location
         fields = {"name": ["icontains"]}
@@ -339,7 +344,7 @@ class OrderFilter(filters.FilterSet):
         )
 
     class Meta:
-        model = Order
+        model = OrderListing
         fields = {
             "status": ["exact"],
             "name": ["istartswith"],
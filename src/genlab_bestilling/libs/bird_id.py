@@ -1,11 +1,14 @@
 import re
 
+# Also used by the generated Sample.bird_id column, keep it POSIX compatible
+BIRD_ID_PATTERN = r"^G\d{2}([A-Z]{1,3})0*(\d+)(-\d+)?"
+
 
 def bird_id(genlab_id: str | None) -> str | None:
     if not genlab_id:
         return None
 
-    exp = re.compile(r"^G\d{2}([A-Z]{1,3})0*(\d+)(-\d+)?")
+    exp = re.compile(BIRD_ID_PATTERN)
 
     match = exp.match(genlab_id)
     if match:
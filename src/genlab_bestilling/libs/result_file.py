@@ -0,0 +1,132 @@
+import csv
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import IO
+
+COORDINATE_COLUMNS = ("well", "well position", "position", "coordinate", "pos")
+PLATE_COLUMNS = ("plate", "plate id", "plate name", "plate barcode")
+# Only an explicit marker column: the assay/SNP ids of the instruments
+# are not the names of the markers
+MARKER_COLUMNS = ("marker",)
+CALL_COLUMNS = ("call", "final", "result", "status")
+
+# Calls meaning the well did not produce a usable result
+FAILED_CALLS = {"invalid", "no call", "nocall", "fail", "failed", "no amp", "noamp"}
+
+COORDINATE_RE = re.compile(r"^([A-Ha-h])0*(\d{1,2})$")
+
+SNIFF_SIZE = 8192
+
+
+class ResultFileError(ValueError):
+    """Raised when a result file cannot be parsed."""
+
+
+@dataclass
+class WellResult:
+    coordinate: str
+    plate: str | None
+    marker: str | None
+    call: str | None
+    values: dict[str, str]
+
+    @property
+    def failed(self) -> bool:
+        return (self.call or "").strip().lower() in FAILED_CALLS
+
+    @property
+    def has_output(self) -> bool:
+        return bool(self.call) and not self.failed
+
+
+def normalize_coordinate(value: str) -> str | None:
+    """Normalize a well label (e.g. a01, A01, A1) to the A1 format."""
+    match = COORDINATE_RE.match(value.strip())
+    if not match:
+        return None
+    return f"{match.group(1).upper()}{int(match.group(2))}"
+
+
+def find_column(header: list[str], candidates: tuple[str, ...]) -> int | None:
+    normalized = [h.strip().lower() for h in header]
+    for candidate in candidates:
+        if candidate in normalized:
+            return normalized.index(candidate)
+    return None
+
+
+def stored_well(coordinate: str, values: dict[str, str]) -> WellResult:
+    """Rebuild a well from the values of a row stored by the ingestion."""
+    header = list(values)
+
+    def value(candidates: tuple[str, ...]) -> str | None:
+        idx = find_column(header, candidates)
+        return None if idx is None else values[header[idx]]
+
+    return WellResult(
+        coordinate=coordinate,
+        plate=value(PLATE_COLUMNS),
+        marker=value(MARKER_COLUMNS),
+        call=value(CALL_COLUMNS),
+        values=values,
+    )
+
+
+def parse_result_file(file: IO[str]) -> Iterator[WellResult]:
+    """
+    Stream the well rows of a Fluidigm/STR style CSV export.
+
+    Exports may start with a few lines of run information: everything before
+    the first row having a well/position column is skipped.
+    The delimiter (comma, semicolon or tab) is detected from the beginning of
+    the file, which must therefore be seekable.
+    Rows are yielded one at a time, so memory usage does not depend on the
+    size of the file.
+    """
+    sample = file.read(SNIFF_SIZE)
+    file.seek(0)
+    try:
+        dialect: type[csv.Dialect] | csv.Dialect = csv.Sniffer().sniff(
+            sample, delimiters=",;\t"
+        )
+    except csv.Error:
+        dialect = csv.excel
+
+    reader = csv.reader(file, dialect)
+
+    header = None
+    for row in reader:
+        if find_column(row, COORDINATE_COLUMNS) is not None:
+            header = [h.strip() for h in row]
+            break
+    if header is None:
+        msg = "No header with a well or position column found"
+        raise ResultFileError(msg)
+
+    coordinate_idx = find_column(header, COORDINATE_COLUMNS)
+    plate_idx = find_column(header, PLATE_COLUMNS)
+    marker_idx = find_column(header, MARKER_COLUMNS)
+    call_idx = find_column(header, CALL_COLUMNS)
+
+    def cell(row: list[str], idx: int | None) -> str | None:
+        if idx is None or idx >= len(row):
+            return None
+        return row[idx].strip() or None
+
+    for row in reader:
+        coordinate = normalize_coordinate(cell(row, coordinate_idx) or "")
+        if coordinate is None:
+            # blank lines, footers and sub-headers
+            continue
+        yield WellResult(
+            coordinate=coordinate,
+            plate=cell(row, plate_idx),
+            marker=cell(row, marker_idx),
+            call=cell(row, call_idx),
+            values={
+                name: value.strip()
+                for name, value in zip(header, row, strict=False)
+                if name and value.strip()
+            },
+        )
@@ -0,0 +1,116 @@
+import json
+import uuid
+from collections.abc import Callable, Iterator
+from typing import Any, Self
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection, transaction
+from django.db.models import QuerySet
+
+from genlab_bestilling.models import (
+    Order,
+    PlatePosition,
+    Sample,
+    SampleMarkerAnalysis,
+)
+
+# The query shapes of the hot paths, with the table that must not be
+# read with a sequential scan. The values are placeholders: only the
+# plan is looked at, the queries are never executed.
+HOT_QUERIES: dict[str, tuple[Callable[[], QuerySet], str]] = {
+    "lab view samples": (
+        lambda: Sample.objects.filter(order_id=0).order_by("genlab_id"),
+        Sample._meta.db_table,
+    ),
+    "extraction order status": (
+        lambda: (
+            Sample.objects.filter(order_id=0)
+            .exclude(is_invalid=True)
+            .filter(is_isolated=False)
+        ),
+        Sample._meta.db_table,
+    ),
+    "samples by species and year": (
+        lambda: Sample.objects.filter(species_id=0, year=2025),
+        Sample._meta.db_table,
+    ),
+    "dashboard orders": (
+        lambda: Order.objects.non_polymorphic().filter(
+            status=Order.OrderStatus.DELIVERED, is_urgent=True, is_seen=False
+        ),
+        Order._meta.db_table,
+    ),
+    "analysis order marker": (
+        lambda: SampleMarkerAnalysis.objects.filter(order_id=0, marker_id=""),
+        SampleMarkerAnalysis._meta.db_table,
+    ),
+    "free plate positions": (
+        lambda: PlatePosition.objects.filter(
+            plate_id=uuid.UUID(int=0), is_full=False
+        ).order_by("position"),
+        PlatePosition._meta.db_table,
+    ),
+}
+
+
+def iter_plan_nodes(node: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from iter_plan_nodes(child)
+
+
+class Command(BaseCommand):
+    help = (
+        "Explain the hot queries and fail if any of them reads its table "
+        "with a sequential scan."
+    )
+
+    def add_arguments(self: Self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--actual",
+            action="store_true",
+            help=(
+                "Plan with the statistics of the current data instead of "
+                "disabling sequential scans; use it on a production sized "
+                "copy to compare the plans before and after a migration."
+            ),
+        )
+        parser.add_argument(
+            "--plans", action="store_true", help="Print the full plans."
+        )
+
+    def handle(
+        self: Self, *args: Any, actual: bool, plans: bool, **options: Any
+    ) -> None:
+        regressions = []
+        with transaction.atomic():
+            if not actual:
+                # on a small dataset a sequential scan is always the cheapest,
+                # so only check that an index exists for the query
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+
+            for name, (get_queryset, table) in HOT_QUERIES.items():
+                plan = json.loads(get_queryset().explain(format="json"))[0]["Plan"]
+                nodes = [
+                    node
+                    for node in iter_plan_nodes(plan)
+                    if node.get("Relation Name") == table
+                ]
+                scans = ", ".join(
+                    f"{node['Node Type']} {node.get('Index Name', '')}".strip()
+                    for node in nodes
+                )
+                if any(node["Node Type"] == "Seq Scan" for node in nodes):
+                    regressions.append(name)
+                    self.stdout.write(self.style.ERROR(f"{name}: {scans}"))
+                else:
+                    self.stdout.write(self.style.SUCCESS(f"{name}: {scans}"))
+                if plans:
+                    self.stdout.write(json.dumps(plan, indent=2))
+
+            transaction.set_rollback(True)
+
+        if regressions:
+            msg = f"Sequential scan in: {', '.join(regressions)}"
+            raise CommandError(msg)
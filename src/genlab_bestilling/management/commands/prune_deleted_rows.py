@@ -0,0 +1,16 @@
+from typing import Any, Self
+
+from django.core.management.base import BaseCommand
+
+from staff.sync import prune_deleted_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Drop the tombstones of deleted rows that are older than "
+        "SYNC_RETENTION_DAYS, the clients syncing from before then are reset."
+    )
+
+    def handle(self: Self, *args: Any, **options: Any) -> None:
+        deleted = prune_deleted_rows()
+        self.stdout.write(self.style.SUCCESS(f"{deleted} deleted rows pruned"))
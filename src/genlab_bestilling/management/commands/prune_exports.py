@@ -0,0 +1,16 @@
+from typing import Any, Self
+
+from django.core.management.base import BaseCommand
+
+from genlab_bestilling.tasks import prune_exports
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete the background exports older than DIRECT_TRANSFER_EXPIRY, "
+        "once their download urls have expired."
+    )
+
+    def handle(self: Self, *args: Any, **options: Any) -> None:
+        deleted = prune_exports()
+        self.stdout.write(self.style.SUCCESS(f"{deleted} exports pruned"))
@@ -0,0 +1,23 @@
+from typing import Any, Self
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from genlab_bestilling.models import SearchEntry
+from genlab_bestilling.search import refresh_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the entries of the staff search index."
+
+    def add_arguments(self: Self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "kinds",
+            nargs="*",
+            choices=SearchEntry.Kind.values,
+            help="Only rebuild the entries of these kinds (all by default).",
+        )
+
+    def handle(self: Self, *args: Any, kinds: list[str], **options: Any) -> None:
+        for kind in kinds or SearchEntry.Kind.values:
+            count = refresh_search_index(kind)
+            self.stdout.write(self.style.SUCCESS(f"{kind}: {count} entries"))
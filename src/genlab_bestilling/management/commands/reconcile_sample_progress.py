@@ -0,0 +1,44 @@
+from typing import Any, Self
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from genlab_bestilling.models import OrderSampleProgress
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the samples of the extraction orders and fix the "
+        "progress counters that drifted from them."
+    )
+
+    def add_arguments(self: Self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the orders whose counters drifted.",
+        )
+
+    def handle(self: Self, *args: Any, dry_run: bool, **options: Any) -> None:
+        expected = OrderSampleProgress.objects.compute()
+        stored = {
+            progress.order_id: progress
+            for progress in OrderSampleProgress.objects.filter(
+                order_id__in=list(expected)
+            )
+        }
+
+        drifted = []
+        for order_id, counts in expected.items():
+            progress = stored.get(order_id)
+            actual = {field: getattr(progress, field, None) for field in counts}
+            if actual != counts:
+                drifted.append(order_id)
+                self.stdout.write(f"order {order_id}: {actual} != {counts}")
+
+        if drifted and not dry_run:
+            OrderSampleProgress.objects.refresh(drifted)
+
+        verb = "drifted" if dry_run else "fixed"
+        self.stdout.write(
+            self.style.SUCCESS(f"{len(drifted)} of {len(expected)} orders {verb}")
+        )
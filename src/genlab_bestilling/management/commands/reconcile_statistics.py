@@ -0,0 +1,60 @@
+from typing import Any, Self
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import models
+
+from genlab_bestilling.managers import STATISTICS_FIELDS
+from genlab_bestilling.models import GenrequestStatistics, ProjectStatistics
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the orders and samples of the genetic projects and projects "
+        "and fix the statistics that drifted from them. Meant to run nightly."
+    )
+
+    def add_arguments(self: Self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the statistics that drifted.",
+        )
+
+    def find_drifted(
+        self: Self, model: type[models.Model], key: str, expected: dict[Any, dict]
+    ) -> list:
+        stored = {
+            getattr(stats, f"{key}_id"): stats
+            for stats in model.objects.filter(**{f"{key}_id__in": list(expected)})
+        }
+        drifted = []
+        for pk, row in expected.items():
+            stats = stored.get(pk)
+            actual = {field: getattr(stats, field, None) for field in STATISTICS_FIELDS}
+            counts = {field: row[field] for field in STATISTICS_FIELDS}
+            if actual != counts:
+                drifted.append(pk)
+                self.stdout.write(f"{key} {pk}: {actual} != {counts}")
+        return drifted
+
+    def handle(self: Self, *args: Any, dry_run: bool, **options: Any) -> None:
+        expected = GenrequestStatistics.objects.compute()
+        drifted = self.find_drifted(GenrequestStatistics, "genrequest", expected)
+        if drifted and not dry_run:
+            GenrequestStatistics.objects.refresh(drifted)
+
+        # summed from the genrequest statistics, fixed above
+        expected_projects = ProjectStatistics.objects.compute()
+        drifted_projects = self.find_drifted(
+            ProjectStatistics, "project", expected_projects
+        )
+        if drifted_projects and not dry_run:
+            ProjectStatistics.objects.refresh(drifted_projects)
+
+        verb = "drifted" if dry_run else "fixed"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(drifted)} of {len(expected)} genetic projects and "
+                f"{len(drifted_projects)} of {len(expected_projects)} projects {verb}"
+            )
+        )
@@ -1,23 +1,35 @@
 from __future__ import annotations
 
+import threading
 from enum import StrEnum
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
+from django.contrib.postgres.search import TrigramWordSimilarity
 from django.db import models, transaction
-from django.db.models import BigIntegerField, Case, Q, QuerySet, Value, When
-from django.db.models.functions import Cast
+from django.db.models import (
+    Count,
+    Exists,
+    Max,
+    OuterRef,
+    Prefetch,
+    Q,
+    QuerySet,
+    Subquery,
+)
 from polymorphic.managers import PolymorphicManager, PolymorphicQuerySet
 
+from capps.users.scope import get_access_scope
 from shared.db import assert_is_in_atomic_block
+from shared.tracing import current_span, traced
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Iterable, Sequence
 
     from django.db.models import QuerySet
 
     from capps.users.models import User
 
-    from .models import GIDSequence, Sample, Species
+    from .models import GIDSequence, Sample, SampleMarkerAnalysis, Species
 
 
 class VisibleManager(models.Manager):
@@ -32,7 +44,20 @@ class GenrequestQuerySet(models.QuerySet):
         """
         Get only requests of projects that the user is part of
         """
-        return self.filter(project__memberships=user)
+        return self.filter(project_id__in=get_access_scope(user).project_ids)
+
+    def update(self, **kwargs: Any) -> int:
+        if "project" not in kwargs and "project_id" not in kwargs:
+            return super().update(**kwargs)
+
+        # the genrequests leave their projects
+        genrequests = list(self.order_by().values_list("pk", "project_id"))
+        rows = super().update(**kwargs)
+        schedule_statistics_refresh(
+            genrequest_ids=[pk for pk, _ in genrequests],
+            project_ids={project_id for _, project_id in genrequests},
+        )
+        return rows
 
 
 class OrderQuerySet(PolymorphicQuerySet):
@@ -40,7 +65,9 @@ class OrderQuerySet(PolymorphicQuerySet):
         """
         Get only orders of projects that the user is part of
         """
-        return self.filter(genrequest__project__memberships=user)
+        return self.filter(
+            genrequest__project_id__in=get_access_scope(user).project_ids
+        )
 
     def filter_in_draft(self) -> QuerySet:
         """
@@ -68,12 +95,65 @@ class OrderQuerySet(PolymorphicQuerySet):
 OrderManager = PolymorphicManager.from_queryset(OrderQuerySet)
 
 
+class OrderListingQuerySet(models.QuerySet):
+    def filter_allowed(self, user: User) -> QuerySet:
+        """
+        Get only orders of projects that the user is part of
+        """
+        return self.filter(
+            genrequest__project_id__in=get_access_scope(user).project_ids
+        )
+
+    def filter_in_draft(self) -> QuerySet:
+        """
+        Get only orders in draft
+        """
+        return self.filter(status=self.model.OrderStatus.DRAFT)
+
+    def filter_by_sample_id(self, value: str) -> QuerySet:
+        """
+        Filter orders by sample genlab_id, name, or guid.
+
+        Extraction orders are matched through their samples,
+        analysis orders through the samples of their markers.
+        """
+        if not value:
+            return self
+
+        from .models import Sample, SampleMarkerAnalysis  # noqa: PLC0415
+
+        match = (
+            Q(genlab_id__icontains=value)
+            | Q(name__icontains=value)
+            | Q(guid__icontains=value)
+        )
+        return self.filter(
+            Q(id__in=Sample.objects.filter(match).values("order_id"))
+            | Q(
+                id__in=SampleMarkerAnalysis.objects.filter(
+                    sample__in=Sample.objects.filter(match)
+                ).values("order_id")
+            )
+        )
+
+    def filter_by_responsible_staff(self, users: Iterable[User]) -> QuerySet:
+        """
+        Get only orders assigned to one of the given staff members
+        """
+        from .models import Order  # noqa: PLC0415
+
+        assigned = Order.responsible_staff.through.objects.filter(user__in=users)
+        return self.filter(id__in=assigned.values("order_id"))
+
+
 class EquipmentOrderQuantityQuerySet(models.QuerySet):
     def filter_allowed(self, user: User) -> QuerySet:
         """
         Get only orders of projects that the user is part of
         """
-        return self.filter(order__genrequest__project__memberships=user)
+        return self.filter(
+            order__genrequest__project_id__in=get_access_scope(user).project_ids
+        )
 
     def filter_in_draft(self) -> QuerySet:
         """
@@ -84,12 +164,437 @@ class EquipmentOrderQuantityQuerySet(models.QuerySet):
         )
 
 
+# Sample fields counted by OrderSampleProgress
+SAMPLE_PROGRESS_FIELDS = frozenset(
+    {
+        "order",
+        "order_id",
+        "genlab_id",
+        "is_marked",
+        "is_plucked",
+        "is_isolated",
+        "is_invalid",
+    }
+)
+
+_sample_progress = threading.local()
+
+
+def schedule_sample_progress_refresh(order_ids: Iterable[int | None]) -> None:
+    """
+    Refresh the sample progress of the given orders
+    once the current transaction is committed.
+    """
+    pending = getattr(_sample_progress, "pending", None)
+    if pending is None:
+        pending = _sample_progress.pending = set()
+    order_ids = {order_id for order_id in order_ids if order_id is not None}
+    pending.update(order_ids)
+    if pending:
+        # a rolled back transaction drops its callback but not its ids,
+        # they are refreshed with the ones of the next transaction
+        transaction.on_commit(_refresh_pending_sample_progress)
+    # the statistics count the same sample fields
+    schedule_statistics_refresh(order_ids=order_ids)
+
+
+def _refresh_pending_sample_progress() -> None:
+    pending = getattr(_sample_progress, "pending", None)
+    if not pending:
+        return
+    _sample_progress.pending = set()
+
+    from .models import OrderSampleProgress  # noqa: PLC0415
+
+    OrderSampleProgress.objects.refresh(pending)
+
+
+def sample_progress_counts() -> dict[str, Count]:
+    """Aggregates of the samples stored in OrderSampleProgress"""
+    return {
+        "total": Count("id"),
+        "with_genlab_id": Count("id", filter=Q(genlab_id__isnull=False)),
+        "marked": Count("id", filter=Q(is_marked=True)),
+        "plucked": Count("id", filter=Q(is_plucked=True)),
+        "isolated": Count("id", filter=Q(is_isolated=True)),
+        "invalid": Count("id", filter=Q(is_invalid=True)),
+    }
+
+
+class OrderSampleProgressQuerySet(models.QuerySet):
+    def compute(self, order_ids: Iterable[int] | None = None) -> dict[int, dict]:
+        """
+        Count the samples of the extraction orders (all if order_ids is None)
+        """
+        from .models import ExtractionOrder, Sample  # noqa: PLC0415
+
+        orders = ExtractionOrder.objects.non_polymorphic()
+        if order_ids is not None:
+            orders = orders.filter(pk__in=list(order_ids))
+        zeros = dict.fromkeys(sample_progress_counts(), 0)
+        counts = {order_id: zeros for order_id in orders.values_list("pk", flat=True)}
+
+        rows = (
+            Sample.objects.filter(order_id__in=list(counts))
+            .order_by()
+            .values("order_id")
+            .annotate(**sample_progress_counts())
+        )
+        for row in rows:
+            counts[row.pop("order_id")] = row
+        return counts
+
+    def refresh(self, order_ids: Iterable[int] | None = None) -> int:
+        """
+        Recompute the counters of the extraction orders (all if order_ids is None)
+        Return the number of orders refreshed.
+        """
+        counts = self.compute(order_ids)
+        self.bulk_create(
+            [self.model(order_id=order_id, **row) for order_id, row in counts.items()],
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["order"],
+            update_fields=[*sample_progress_counts(), "refreshed_at"],
+        )
+        return len(counts)
+
+
+# SampleMarkerAnalysis fields counted in the statistics
+SAMPLE_MARKER_STATISTICS_FIELDS = frozenset({"order", "order_id", "is_analysed"})
+
+STATISTICS_FIELDS = (
+    "orders",
+    "orders_total",
+    "samples",
+    "isolated_samples",
+    "analysed_markers",
+    "last_activity_at",
+)
+
+_statistics = threading.local()
+
+
+def schedule_statistics_refresh(
+    *,
+    genrequest_ids: Iterable[int | None] = (),
+    order_ids: Iterable[int | None] = (),
+    project_ids: Iterable[str | None] = (),
+) -> None:
+    """
+    Refresh the statistics of the given genrequests, of the genrequests of
+    the given orders, and of their projects once the current transaction
+    is committed.
+    """
+    pending = getattr(_statistics, "pending", None)
+    if pending is None:
+        pending = _statistics.pending = {
+            "genrequest": set(),
+            "order": set(),
+            "project": set(),
+        }
+    for kind, object_ids in (
+        ("genrequest", genrequest_ids),
+        ("order", order_ids),
+        ("project", project_ids),
+    ):
+        pending[kind].update(
+            object_id for object_id in object_ids if object_id is not None
+        )
+    if any(pending.values()):
+        # same as the sample progress, the ids of a rolled back transaction
+        # are refreshed with the ones of the next transaction
+        transaction.on_commit(_refresh_pending_statistics)
+
+
+def _refresh_pending_statistics() -> None:
+    pending = getattr(_statistics, "pending", None)
+    if not pending or not any(pending.values()):
+        return
+    _statistics.pending = None
+
+    from .models import GenrequestStatistics, Order  # noqa: PLC0415
+
+    genrequest_ids = pending["genrequest"] | set(
+        Order.objects.non_polymorphic()
+        .filter(pk__in=pending["order"])
+        .values_list("genrequest_id", flat=True)
+    )
+    GenrequestStatistics.objects.refresh(genrequest_ids, project_ids=pending["project"])
+
+
+def empty_statistics() -> dict[str, Any]:
+    return {
+        "orders": {},
+        "orders_total": 0,
+        "samples": 0,
+        "isolated_samples": 0,
+        "analysed_markers": 0,
+        "last_activity_at": None,
+    }
+
+
+def add_statistics(total: dict[str, Any], stats: dict[str, Any]) -> None:
+    """Add stats (a GenrequestStatistics row) to total"""
+    for order_type, statuses in stats["orders"].items():
+        counts = total["orders"].setdefault(order_type, {})
+        for status, count in statuses.items():
+            counts[status] = counts.get(status, 0) + count
+    for field in ("orders_total", "samples", "isolated_samples", "analysed_markers"):
+        total[field] += stats[field]
+    if stats["last_activity_at"] is not None and (
+        total["last_activity_at"] is None
+        or stats["last_activity_at"] > total["last_activity_at"]
+    ):
+        total["last_activity_at"] = stats["last_activity_at"]
+
+
+class GenrequestStatisticsQuerySet(models.QuerySet):
+    def compute(self, genrequest_ids: Iterable[int] | None = None) -> dict[int, dict]:
+        """
+        Count the orders and samples of the genrequests (all if genrequest_ids
+        is None), the project of each genrequest is returned in project_id
+        """
+        from .models import (  # noqa: PLC0415
+            Genrequest,
+            OrderListing,
+            Sample,
+            SampleMarkerAnalysis,
+        )
+
+        genrequests = Genrequest.objects.all()
+        if genrequest_ids is not None:
+            genrequests = genrequests.filter(pk__in=list(genrequest_ids))
+        stats = {
+            pk: {**empty_statistics(), "project_id": project_id}
+            for pk, project_id in genrequests.values_list("pk", "project_id")
+        }
+        ids = list(stats)
+
+        for row in (
+            OrderListing.objects.filter(genrequest_id__in=ids)
+            .order_by()
+            .values("genrequest_id", "order_type", "status")
+            .annotate(count=Count("id"), last_modified_at=Max("last_modified_at"))
+        ):
+            add_statistics(
+                stats[row["genrequest_id"]],
+                {
+                    **empty_statistics(),
+                    "orders": {
+                        row["order_type"] or "other": {row["status"]: row["count"]}
+                    },
+                    "orders_total": row["count"],
+                    "last_activity_at": row["last_modified_at"],
+                },
+            )
+
+        for row in (
+            Sample.objects.filter(order__genrequest_id__in=ids)
+            .order_by()
+            .values("order__genrequest_id")
+            .annotate(
+                samples=Count("id"),
+                isolated_samples=Count("id", filter=Q(is_isolated=True)),
+            )
+        ):
+            stats[row.pop("order__genrequest_id")].update(row)
+
+        for row in (
+            SampleMarkerAnalysis.objects.filter(
+                order__genrequest_id__in=ids, is_analysed=True
+            )
+            .order_by()
+            .values("order__genrequest_id")
+            .annotate(analysed_markers=Count("id"))
+        ):
+            stats[row.pop("order__genrequest_id")].update(row)
+
+        return stats
+
+    def refresh(
+        self,
+        genrequest_ids: Iterable[int] | None = None,
+        project_ids: Iterable[str] = (),
+    ) -> int:
+        """
+        Recompute the statistics of the genrequests (all if genrequest_ids is
+        None), and of their projects and the given ones.
+        Return the number of genrequests refreshed.
+        """
+        from .models import ProjectStatistics  # noqa: PLC0415
+
+        stats = self.compute(genrequest_ids)
+        self.bulk_create(
+            [
+                self.model(genrequest_id=pk, **{f: row[f] for f in STATISTICS_FIELDS})
+                for pk, row in stats.items()
+            ],
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["genrequest"],
+            update_fields=[*STATISTICS_FIELDS, "refreshed_at"],
+        )
+        ProjectStatistics.objects.refresh(
+            None
+            if genrequest_ids is None
+            else {row["project_id"] for row in stats.values()} | set(project_ids)
+        )
+        return len(stats)
+
+
+class ProjectStatisticsQuerySet(models.QuerySet):
+    def compute(self, project_ids: Iterable[str] | None = None) -> dict[str, dict]:
+        """
+        Sum the statistics of the genrequests of the projects
+        (all if project_ids is None)
+        """
+        from nina.models import Project  # noqa: PLC0415
+
+        from .models import GenrequestStatistics  # noqa: PLC0415
+
+        projects = Project.objects.all()
+        if project_ids is not None:
+            projects = projects.filter(pk__in=list(project_ids))
+        stats = {pk: empty_statistics() for pk in projects.values_list("pk", flat=True)}
+
+        for row in GenrequestStatistics.objects.filter(
+            genrequest__project_id__in=list(stats)
+        ).values("genrequest__project_id", *STATISTICS_FIELDS):
+            add_statistics(stats[row.pop("genrequest__project_id")], row)
+        return stats
+
+    def refresh(self, project_ids: Iterable[str] | None = None) -> int:
+        """
+        Recompute the statistics of the projects (all if project_ids is None)
+        Return the number of projects refreshed.
+        """
+        stats = self.compute(project_ids)
+        self.bulk_create(
+            [self.model(project_id=pk, **row) for pk, row in stats.items()],
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["project"],
+            update_fields=[*STATISTICS_FIELDS, "refreshed_at"],
+        )
+        return len(stats)
+
+
+# Sample fields stored in the search index
+SAMPLE_SEARCH_FIELDS = frozenset(
+    {
+        "order",
+        "order_id",
+        "genlab_id",
+        "guid",
+        "name",
+        "species",
+        "species_id",
+        "location",
+        "location_id",
+        "fish_id",
+    }
+)
+
+# Sample fields the stored fish_id is computed from (see Sample.get_fish_id)
+SAMPLE_FISH_ID_FIELDS = frozenset({"name", "year", "location", "location_id"})
+
+_search_index = threading.local()
+
+
+def schedule_search_index_refresh(kind: str, object_ids: Iterable[Any]) -> None:
+    """
+    Refresh the search entries of the given objects
+    once the current transaction is committed.
+    """
+    pending = getattr(_search_index, "pending", None)
+    if pending is None:
+        pending = _search_index.pending = {}
+    ids = {str(object_id) for object_id in object_ids if object_id is not None}
+    if ids:
+        pending.setdefault(kind, set()).update(ids)
+        transaction.on_commit(_refresh_pending_search_index)
+
+
+def _refresh_pending_search_index() -> None:
+    pending = getattr(_search_index, "pending", None)
+    if not pending:
+        return
+    _search_index.pending = {}
+
+    from .search import refresh_search_index  # noqa: PLC0415
+
+    for kind, object_ids in pending.items():
+        refresh_search_index(kind, object_ids)
+
+
+class SearchEntryQuerySet(models.QuerySet):
+    def filter_by_keys(self, keys: Iterable[str]) -> QuerySet:
+        """
+        Get the entries with any of the given (upper-cased) identifiers
+        """
+        return self.filter(keys__overlap=list(keys))
+
+    def filter_by_text(self, value: str) -> QuerySet:
+        """
+        Get the entries containing value or a word similar to it,
+        the most similar first
+        """
+        value = value.upper()
+        return (
+            self.filter(Q(text__contains=value) | Q(text__trigram_word_similar=value))
+            .annotate(rank=TrigramWordSimilarity(value, "text"))
+            .order_by("-rank", "kind", "title")
+        )
+
+
+class LocationQuerySet(models.QuerySet):
+    def filter_types(self, condition: Q) -> QuerySet:
+        """
+        Get the locations with a type matching condition (on the
+        location_types table), without duplicates
+        """
+        return self.filter(
+            Exists(
+                self.model.types.through.objects.filter(
+                    condition, location_id=OuterRef("pk")
+                )
+            )
+        )
+
+    def filter_compatible(self, species_id: int) -> QuerySet:
+        """
+        Get the locations of the location type of a species, the ones
+        its samples can be taken at
+        """
+        return self.filter_types(Q(locationtype__species=species_id))
+
+    def filter_area(self, area_id: int) -> QuerySet:
+        """
+        Get the locations of the location types of the species of an area
+        """
+        return self.filter_types(Q(locationtype__species__area=area_id))
+
+    def filter_prefix(self, value: str) -> QuerySet:
+        """
+        Get the locations whose river id, code or name start with value,
+        served by the upper-case prefix indexes
+        """
+        return self.filter(
+            Q(river_id__istartswith=value)
+            | Q(code__istartswith=value)
+            | Q(name__istartswith=value)
+        )
+
+
 class SampleQuerySet(models.QuerySet):
     def filter_allowed(self, user: User) -> QuerySet:
         """
         Get only samples of projects that the user is part of
         """
-        return self.filter(order__genrequest__project__memberships=user)
+        return self.filter(
+            order__genrequest__project_id__in=get_access_scope(user).project_ids
+        )
 
     def filter_in_draft(self) -> QuerySet:
         """
@@ -101,9 +606,9 @@ class SampleQuerySet(models.QuerySet):
 
     def filter_by_search(self, value: str) -> QuerySet:
         """
-        Filter samples by genlab_id, name, or guid.
+        Filter samples by genlab_id, bird_id, fish_id, name, or guid.
 
-        Searches for samples where genlab_id, name, or guid contains the
+        Searches for samples where any of those fields contains the
         given value.
         """
         if not value:
@@ -111,28 +616,130 @@ class SampleQuerySet(models.QuerySet):
 
         return self.filter(
             Q(genlab_id__icontains=value)
+            | Q(bird_id__icontains=value)
+            | Q(fish_id__icontains=value)
             | Q(name__icontains=value)
             | Q(guid__icontains=value)
         )
 
-    def annotate_numeric_name(self) -> QuerySet:
+    def refresh_fish_ids(self, batch_size: int = 2000) -> int:
         """
-        Create a new column with the numeric version of the name.
-        Only if the name is a valid integer, and up to 18 digits, so it fit in a
-        BigIntegerField.
+        Recompute the stored fish_id, e.g. after the code of a location changed.
+        Return the number of samples updated.
         """
+        updates = []
+        for sample in self.select_related("location").only(
+            "id", "name", "year", "fish_id", "location__code"
+        ):
+            fish_id = sample.get_fish_id()
+            if fish_id != sample.fish_id:
+                sample.fish_id = fish_id
+                updates.append(sample)
+        self.model.objects.bulk_update(updates, ["fish_id"], batch_size=batch_size)
+        return len(updates)
+
+    def update(self, **kwargs: Any) -> int:
+        progress = not SAMPLE_PROGRESS_FIELDS.isdisjoint(kwargs)
+        search = not SAMPLE_SEARCH_FIELDS.isdisjoint(kwargs)
+        fish_id = "fish_id" not in kwargs and not SAMPLE_FISH_ID_FIELDS.isdisjoint(
+            kwargs
+        )
+        if not progress and not search and not fish_id:
+            return super().update(**kwargs)
+
+        order_ids = set()
+        if progress:
+            order_ids = set(
+                self.order_by().values_list("order_id", flat=True).distinct()
+            )
+            new_order = kwargs.get("order", kwargs.get("order_id"))
+            if isinstance(new_order, models.Model):
+                new_order = new_order.pk
+            if isinstance(new_order, int):
+                order_ids.add(new_order)
+        sample_ids = (
+            list(self.values_list("pk", flat=True)) if search or fish_id else []
+        )
 
-        return self.annotate(
-            name_as_int=Case(
-                When(
-                    name__regex=r"^\d{1,18}$",
-                    then=Cast("name", BigIntegerField()),
+        rows = super().update(**kwargs)
+        if fish_id:
+            # as in Sample.save
+            self.model.objects.filter(pk__in=sample_ids).refresh_fish_ids()
+        schedule_sample_progress_refresh(order_ids)
+        schedule_search_index_refresh("sample", sample_ids)
+        return rows
+
+    def bulk_create(self, objs: Iterable[Sample], *args: Any, **kwargs: Any) -> list:
+        objs = list(objs)
+        for sample in objs:
+            # as in Sample.save
+            sample.fish_id = sample.get_fish_id()
+        created = super().bulk_create(objs, *args, **kwargs)
+        schedule_sample_progress_refresh({sample.order_id for sample in created})
+        schedule_search_index_refresh("sample", [sample.pk for sample in created])
+        return created
+
+    def bulk_update(
+        self, objs: Iterable[Sample], fields: Sequence[str], *args: Any, **kwargs: Any
+    ) -> int:
+        objs = list(objs)
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        if "fish_id" not in fields and not SAMPLE_FISH_ID_FIELDS.isdisjoint(fields):
+            # as in Sample.save, the objects may not have their location loaded
+            self.model.objects.filter(
+                pk__in=[sample.pk for sample in objs]
+            ).refresh_fish_ids()
+        if not SAMPLE_PROGRESS_FIELDS.isdisjoint(fields):
+            # the objects may not have their order loaded
+            schedule_sample_progress_refresh(
+                self.model.objects.filter(pk__in=[sample.pk for sample in objs])
+                .order_by()
+                .values_list("order_id", flat=True)
+                .distinct()
+            )
+        if not SAMPLE_SEARCH_FIELDS.isdisjoint(fields):
+            schedule_search_index_refresh("sample", [sample.pk for sample in objs])
+        return rows
+
+    def with_sheet_data(self) -> QuerySet:
+        """
+        Load the relations and annotations used by the sample sheet exports
+        """
+        from .models import AnalysisOrder, ExtractionPlate  # noqa: PLC0415
+
+        return (
+            self.select_related(
+                "type",
+                "species",
+                "order",
+                "order__genrequest",
+                "order__genrequest__area",
+                "location",
+                "position__plate",
+            )
+            .prefetch_related(
+                Prefetch(
+                    "order__analysis_orders",
+                    queryset=AnalysisOrder.objects.only("id"),
+                ),
+                "isolation_method",
+            )
+            .annotate(
+                plate_qiagen_id=Subquery(
+                    ExtractionPlate.objects.filter(
+                        pk=OuterRef("position__plate_id")
+                    ).values("qiagen_id")[:1]
                 ),
-                default=Value(None),
-                output_field=BigIntegerField(),
             )
         )
 
+    @traced(
+        "sample.generate_genlab_ids",
+        lambda self, order_id, selected_samples=None: {
+            "order_id": order_id,
+            "selected_count": len(selected_samples or []),
+        },
+    )
     @transaction.atomic
     def generate_genlab_ids(
         self,
@@ -169,6 +776,7 @@ class SampleQuerySet(models.QuerySet):
             sample.generate_genlab_id(commit=False)
             updates.append(sample)
 
+        current_span().set(sample_count=len(updates))
         self.bulk_update(updates, ["genlab_id"])
 
 
@@ -204,7 +812,9 @@ class SampleAnalysisMarkerQuerySet(models.QuerySet):
         """
         Get only samples of projects that the user is part of
         """
-        return self.filter(order__genrequest__project__memberships=user)
+        return self.filter(
+            order__genrequest__project_id__in=get_access_scope(user).project_ids
+        )
 
     def filter_in_draft(self) -> QuerySet:
         """
@@ -216,20 +826,59 @@ class SampleAnalysisMarkerQuerySet(models.QuerySet):
 
     def filter_by_search(self, value: str) -> QuerySet:
         """
-        Filter sample markers by related sample genlab_id, name, or guid.
+        Filter sample markers by related sample genlab_id, bird_id, fish_id,
+        name, or guid.
 
-        Searches for sample markers whose sample genlab_id, name, or guid
-        contains the given value.
+        Searches for sample markers whose sample has any of those fields
+        containing the given value.
         """
         if not value:
             return self
 
         return self.filter(
             Q(sample__genlab_id__icontains=value)
+            | Q(sample__bird_id__icontains=value)
+            | Q(sample__fish_id__icontains=value)
             | Q(sample__name__icontains=value)
             | Q(sample__guid__icontains=value)
         ).distinct()
 
+    def update(self, **kwargs: Any) -> int:
+        if SAMPLE_MARKER_STATISTICS_FIELDS.isdisjoint(kwargs):
+            return super().update(**kwargs)
+
+        order_ids = set(self.order_by().values_list("order_id", flat=True).distinct())
+        new_order = kwargs.get("order", kwargs.get("order_id"))
+        if isinstance(new_order, models.Model):
+            new_order = new_order.pk
+        order_ids.add(new_order)
+
+        rows = super().update(**kwargs)
+        schedule_statistics_refresh(order_ids=order_ids)
+        return rows
+
+    def bulk_create(
+        self, objs: Iterable[SampleMarkerAnalysis], *args: Any, **kwargs: Any
+    ) -> list:
+        created = super().bulk_create(objs, *args, **kwargs)
+        schedule_statistics_refresh(
+            order_ids={marker.order_id for marker in created if marker.is_analysed}
+        )
+        return created
+
+    def bulk_update(
+        self,
+        objs: Iterable[SampleMarkerAnalysis],
+        fields: Sequence[str],
+        *args: Any,
+        **kwargs: Any,
+    ) -> int:
+        objs = list(objs)
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        if not SAMPLE_MARKER_STATISTICS_FIELDS.isdisjoint(fields):
+            schedule_statistics_refresh(order_ids={marker.order_id for marker in objs})
+        return rows
+
     def filter_status_not_started(self) -> QuerySet:
         """Filter sample markers with no positions on analysis plates and no PCR."""
         return self.filter(
@@ -0,0 +1,106 @@
+# Generated by Django 6.1 on 2026-10-19 09:12
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("genlab_bestilling", "0059_alter_area_is_hidden_alter_species_is_hidden"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="location",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("river_id"),
+                    name="text_pattern_ops",
+                ),
+                name="location_river_prefix_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="location",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("code"),
+                    name="text_pattern_ops",
+                ),
+                name="location_code_prefix_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="location",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"),
+                    name="text_pattern_ops",
+                ),
+                name="location_name_prefix_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="location",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"),
+                    name="gin_trgm_ops",
+                ),
+                name="location_name_trgm_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sample",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("genlab_id"),
+                    name="text_pattern_ops",
+                ),
+                name="sample_gid_prefix_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sample",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("guid"),
+                    name="text_pattern_ops",
+                ),
+                name="sample_guid_prefix_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sample",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"),
+                    name="text_pattern_ops",
+                ),
+                name="sample_name_prefix_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sample",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("genlab_id"),
+                    name="gin_trgm_ops",
+                ),
+                name="sample_gid_trgm_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sample",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"),
+                    name="gin_trgm_ops",
+                ),
+                name="sample_name_trgm_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 6.1 on 2026-10-19 10:41
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("genlab_bestilling", "0060_autocomplete_search_indexes"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="order",
+            index=models.Index(
+                fields=["status", "is_urgent", "is_seen"], name="order_dashboard_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="samplemarkeranalysis",
+            index=models.Index(fields=["order", "marker"], name="sma_order_marker_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="sample",
+            index=models.Index(
+                fields=["order", "genlab_id"], name="sample_order_gid_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="sample",
+            index=models.Index(
+                condition=models.Q(("is_isolated", False)),
+                fields=["order"],
+                name="sample_order_not_isolated_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="sample",
+            index=models.Index(
+                fields=["species", "year"], name="sample_species_year_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="plateposition",
+            index=models.Index(
+                condition=models.Q(("is_full", False)),
+                fields=["plate", "position"],
+                name="position_plate_free_idx",
+            ),
+        ),
+    ]
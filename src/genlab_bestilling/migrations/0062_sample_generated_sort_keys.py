@@ -0,0 +1,93 @@
+# Generated by Django 6.1 on 2026-10-19 13:05
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+def backfill_fish_ids(apps, schema_editor):
+    Sample = apps.get_model("genlab_bestilling", "Sample")
+    samples = Sample.objects.filter(
+        location__code__isnull=False, year__isnull=False
+    ).select_related("location")
+
+    batch = []
+    for sample in samples.iterator(chunk_size=2000):
+        if not (sample.location.code and sample.name and sample.year):
+            continue
+        sample.fish_id = (
+            f"{sample.location.code}_{str(sample.year)[-2:]}_"
+            f"{str(sample.name).zfill(4)}"
+        )
+        batch.append(sample)
+        if len(batch) >= 2000:  # noqa: PLR2004
+            Sample.objects.bulk_update(batch, ["fish_id"])
+            batch = []
+    Sample.objects.bulk_update(batch, ["fish_id"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("genlab_bestilling", "0061_hot_query_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="sample",
+            name="name_as_int",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(
+                        name__regex="^\\d{1,18}$",
+                        then=django.db.models.functions.comparison.Cast(
+                            "name", models.BigIntegerField()
+                        ),
+                    ),
+                    default=None,
+                    output_field=models.BigIntegerField(),
+                ),
+                output_field=models.BigIntegerField(),
+            ),
+        ),
+        migrations.AddField(
+            model_name="sample",
+            name="status_rank",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(is_isolated=True, then=models.Value(3)),
+                    models.When(is_plucked=True, then=models.Value(2)),
+                    models.When(is_marked=True, then=models.Value(1)),
+                    default=models.Value(0),
+                ),
+                output_field=models.PositiveSmallIntegerField(),
+            ),
+        ),
+        migrations.AddField(
+            model_name="sample",
+            name="bird_id",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(
+                        genlab_id__regex="^G\\d{2}([A-Z]{1,3})0*(\\d+)(-\\d+)?",
+                        then=models.Func(
+                            "genlab_id",
+                            models.Value("^G\\d{2}([A-Z]{1,3})0*(\\d+)(-\\d+)?.*$"),
+                            models.Value("\\1\\2\\3"),
+                            function="REGEXP_REPLACE",
+                        ),
+                    ),
+                    default=None,
+                    output_field=models.CharField(),
+                ),
+                output_field=models.CharField(),
+            ),
+        ),
+        migrations.AddField(
+            model_name="sample",
+            name="fish_id",
+            field=models.CharField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_fish_ids, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 6.1 on 2026-10-19 13:06
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("genlab_bestilling", "0062_sample_generated_sort_keys"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="sample",
+            index=models.Index(
+                fields=["order", "name_as_int", "name"], name="sample_order_name_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="sample",
+            index=models.Index(
+                fields=["order", "status_rank"], name="sample_order_status_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="sample",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("bird_id"),
+                    name="text_pattern_ops",
+                ),
+                name="sample_bird_prefix_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="sample",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("fish_id"),
+                    name="text_pattern_ops",
+                ),
+                name="sample_fish_prefix_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,236 @@
+# Generated by Django 6.1 on 2026-10-19 14:20
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+ORDER_LISTING_VIEW = """
+CREATE OR REPLACE VIEW genlab_bestilling_orderlisting AS
+SELECT
+    o.id,
+    o.id AS order_id,
+    CASE
+        WHEN eo.order_ptr_id IS NOT NULL THEN 'extraction'
+        WHEN ao.order_ptr_id IS NOT NULL THEN 'analysis'
+        WHEN qo.order_ptr_id IS NOT NULL THEN 'equipment'
+    END AS order_type,
+    o.name,
+    o.status,
+    o.genrequest_id,
+    o.created_at,
+    o.last_modified_at,
+    o.confirmed_at,
+    o.is_urgent,
+    o.is_prioritized,
+    o.is_seen,
+    o.contact_person,
+    o.contact_email,
+    CASE
+        WHEN o.is_urgent THEN 3
+        WHEN o.is_prioritized THEN 2
+        ELSE 1
+    END AS priority,
+    CASE o.status
+        WHEN 'confirmed' THEN 0
+        WHEN 'draft' THEN 1
+        WHEN 'processing' THEN 2
+        WHEN 'completed' THEN 3
+        ELSE 4
+    END AS status_order,
+    eo.internal_status,
+    COALESCE(eo.needs_guid, qo.needs_guid) AS needs_guid,
+    eo.return_samples,
+    eo.pre_isolated,
+    ao.from_order_id,
+    ao.expected_delivery_date,
+    ao.external_samples,
+    CASE
+        WHEN eo.order_ptr_id IS NOT NULL THEN (
+            SELECT count(*)
+            FROM genlab_bestilling_sample s
+            WHERE s.order_id = o.id
+        )
+        WHEN ao.order_ptr_id IS NOT NULL THEN (
+            SELECT count(DISTINCT sma.sample_id)
+            FROM genlab_bestilling_samplemarkeranalysis sma
+            WHERE sma.order_id = o.id
+        )
+        ELSE 0
+    END AS sample_count,
+    CASE
+        WHEN eo.order_ptr_id IS NOT NULL THEN (
+            SELECT count(*)
+            FROM genlab_bestilling_sample s
+            WHERE s.order_id = o.id AND s.is_isolated
+        )
+        ELSE 0
+    END AS isolated_sample_count,
+    (
+        SELECT string_agg(m.marker_id, ', ' ORDER BY m.marker_id)
+        FROM genlab_bestilling_analysisorder_markers m
+        WHERE m.analysisorder_id = ao.order_ptr_id
+    ) AS markers_list,
+    CASE
+        WHEN eo.order_ptr_id IS NOT NULL THEN (
+            SELECT string_agg(sp.name, ', ' ORDER BY sp.name)
+            FROM genlab_bestilling_extractionorder_species es
+            JOIN genlab_bestilling_species sp ON sp.id = es.species_id
+            WHERE es.extractionorder_id = o.id
+        )
+        WHEN ao.order_ptr_id IS NOT NULL THEN (
+            SELECT string_agg(DISTINCT sp.name, ', ' ORDER BY sp.name)
+            FROM genlab_bestilling_samplemarkeranalysis sma
+            JOIN genlab_bestilling_sample s ON s.id = sma.sample_id
+            JOIN genlab_bestilling_species sp ON sp.id = s.species_id
+            WHERE sma.order_id = o.id
+        )
+    END AS species_list,
+    CASE
+        WHEN eo.order_ptr_id IS NOT NULL THEN (
+            SELECT string_agg(st.name, ', ' ORDER BY st.name)
+            FROM genlab_bestilling_extractionorder_sample_types est
+            JOIN genlab_bestilling_sampletype st ON st.id = est.sampletype_id
+            WHERE est.extractionorder_id = o.id
+        )
+        WHEN qo.order_ptr_id IS NOT NULL THEN (
+            SELECT string_agg(st.name, ', ' ORDER BY st.name)
+            FROM genlab_bestilling_equipmentorder_sample_types qst
+            JOIN genlab_bestilling_sampletype st ON st.id = qst.sampletype_id
+            WHERE qst.equipmentorder_id = o.id
+        )
+    END AS sample_types_list,
+    ARRAY(
+        SELECT rs.user_id
+        FROM genlab_bestilling_order_responsible_staff rs
+        WHERE rs.order_id = o.id
+        ORDER BY rs.user_id
+    ) AS responsible_staff_ids,
+    (
+        -- same as User.__str__
+        SELECT string_agg(
+            CASE
+                WHEN u.first_name <> '' AND u.last_name <> ''
+                THEN u.first_name || ' ' || u.last_name
+                ELSE u.email
+            END,
+            ', ' ORDER BY u.first_name, u.last_name, u.email
+        )
+        FROM genlab_bestilling_order_responsible_staff rs
+        JOIN users_user u ON u.id = rs.user_id
+        WHERE rs.order_id = o.id
+    ) AS responsible_staff_names
+FROM genlab_bestilling_order o
+LEFT JOIN genlab_bestilling_extractionorder eo ON eo.order_ptr_id = o.id
+LEFT JOIN genlab_bestilling_analysisorder ao ON ao.order_ptr_id = o.id
+LEFT JOIN genlab_bestilling_equipmentorder qo ON qo.order_ptr_id = o.id;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("genlab_bestilling", "0063_sample_sort_key_indexes"),
+        ("users", "0002_user_access_scope_version"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            ORDER_LISTING_VIEW,
+            "DROP VIEW IF EXISTS genlab_bestilling_orderlisting;",
+        ),
+        migrations.CreateModel(
+            name="OrderListing",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                (
+                    "order_type",
+                    models.CharField(
+                        choices=[
+                            ("extraction", "Extraction order"),
+                            ("analysis", "Analysis order"),
+                            ("equipment", "Equipment order"),
+                        ],
+                        null=True,
+                    ),
+                ),
+                ("name", models.CharField(null=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("draft", "Draft"),
+                            ("confirmed", "Delivered"),
+                            ("processing", "Processing"),
+                            ("completed", "Completed"),
+                        ]
+                    ),
+                ),
+                ("created_at", models.DateTimeField()),
+                ("last_modified_at", models.DateTimeField()),
+                ("confirmed_at", models.DateTimeField(null=True)),
+                ("is_urgent", models.BooleanField()),
+                ("is_prioritized", models.BooleanField()),
+                ("is_seen", models.BooleanField()),
+                ("contact_person", models.CharField(null=True)),
+                ("contact_email", models.EmailField(max_length=254, null=True)),
+                ("priority", models.PositiveSmallIntegerField()),
+                ("status_order", models.PositiveSmallIntegerField()),
+                (
+                    "internal_status",
+                    models.CharField(
+                        choices=[
+                            ("needs_check", "Needs check"),
+                            ("checked", "Checked"),
+                        ],
+                        null=True,
+                    ),
+                ),
+                ("needs_guid", models.BooleanField(null=True)),
+                ("return_samples", models.BooleanField(null=True)),
+                ("pre_isolated", models.BooleanField(null=True)),
+                ("expected_delivery_date", models.DateField(null=True)),
+                ("external_samples", models.BooleanField(null=True)),
+                ("sample_count", models.PositiveIntegerField()),
+                ("isolated_sample_count", models.PositiveIntegerField()),
+                ("markers_list", models.TextField(null=True)),
+                ("species_list", models.TextField(null=True)),
+                ("sample_types_list", models.TextField(null=True)),
+                (
+                    "responsible_staff_ids",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.BigIntegerField(), size=None
+                    ),
+                ),
+                ("responsible_staff_names", models.TextField(null=True)),
+                (
+                    "from_order",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="genlab_bestilling.extractionorder",
+                    ),
+                ),
+                (
+                    "genrequest",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="genlab_bestilling.genrequest",
+                        verbose_name="Genetic Project",
+                    ),
+                ),
+                (
+                    "order",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="listing",
+                        to="genlab_bestilling.order",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "genlab_bestilling_orderlisting",
+                "managed": False,
+            },
+        ),
+    ]
@@ -0,0 +1,192 @@
+# Generated by Django 6.1 on 2026-10-19 15:02
+
+import importlib
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+# Same columns as in 0064_orderlisting, with the sample counts
+# of the extraction orders read from their progress counters
+ORDER_LISTING_VIEW = """
+CREATE OR REPLACE VIEW genlab_bestilling_orderlisting AS
+SELECT
+    o.id,
+    o.id AS order_id,
+    CASE
+        WHEN eo.order_ptr_id IS NOT NULL THEN 'extraction'
+        WHEN ao.order_ptr_id IS NOT NULL THEN 'analysis'
+        WHEN qo.order_ptr_id IS NOT NULL THEN 'equipment'
+    END AS order_type,
+    o.name,
+    o.status,
+    o.genrequest_id,
+    o.created_at,
+    o.last_modified_at,
+    o.confirmed_at,
+    o.is_urgent,
+    o.is_prioritized,
+    o.is_seen,
+    o.contact_person,
+    o.contact_email,
+    CASE
+        WHEN o.is_urgent THEN 3
+        WHEN o.is_prioritized THEN 2
+        ELSE 1
+    END AS priority,
+    CASE o.status
+        WHEN 'confirmed' THEN 0
+        WHEN 'draft' THEN 1
+        WHEN 'processing' THEN 2
+        WHEN 'completed' THEN 3
+        ELSE 4
+    END AS status_order,
+    eo.internal_status,
+    COALESCE(eo.needs_guid, qo.needs_guid) AS needs_guid,
+    eo.return_samples,
+    eo.pre_isolated,
+    ao.from_order_id,
+    ao.expected_delivery_date,
+    ao.external_samples,
+    CASE
+        WHEN eo.order_ptr_id IS NOT NULL THEN COALESCE(sp.total, 0)::bigint
+        WHEN ao.order_ptr_id IS NOT NULL THEN (
+            SELECT count(DISTINCT sma.sample_id)
+            FROM genlab_bestilling_samplemarkeranalysis sma
+            WHERE sma.order_id = o.id
+        )
+        ELSE 0
+    END AS sample_count,
+    COALESCE(sp.isolated, 0)::bigint AS isolated_sample_count,
+    (
+        SELECT string_agg(m.marker_id, ', ' ORDER BY m.marker_id)
+        FROM genlab_bestilling_analysisorder_markers m
+        WHERE m.analysisorder_id = ao.order_ptr_id
+    ) AS markers_list,
+    CASE
+        WHEN eo.order_ptr_id IS NOT NULL THEN (
+            SELECT string_agg(sp.name, ', ' ORDER BY sp.name)
+            FROM genlab_bestilling_extractionorder_species es
+            JOIN genlab_bestilling_species sp ON sp.id = es.species_id
+            WHERE es.extractionorder_id = o.id
+        )
+        WHEN ao.order_ptr_id IS NOT NULL THEN (
+            SELECT string_agg(DISTINCT sp.name, ', ' ORDER BY sp.name)
+            FROM genlab_bestilling_samplemarkeranalysis sma
+            JOIN genlab_bestilling_sample s ON s.id = sma.sample_id
+            JOIN genlab_bestilling_species sp ON sp.id = s.species_id
+            WHERE sma.order_id = o.id
+        )
+    END AS species_list,
+    CASE
+        WHEN eo.order_ptr_id IS NOT NULL THEN (
+            SELECT string_agg(st.name, ', ' ORDER BY st.name)
+            FROM genlab_bestilling_extractionorder_sample_types est
+            JOIN genlab_bestilling_sampletype st ON st.id = est.sampletype_id
+            WHERE est.extractionorder_id = o.id
+        )
+        WHEN qo.order_ptr_id IS NOT NULL THEN (
+            SELECT string_agg(st.name, ', ' ORDER BY st.name)
+            FROM genlab_bestilling_equipmentorder_sample_types qst
+            JOIN genlab_bestilling_sampletype st ON st.id = qst.sampletype_id
+            WHERE qst.equipmentorder_id = o.id
+        )
+    END AS sample_types_list,
+    ARRAY(
+        SELECT rs.user_id
+        FROM genlab_bestilling_order_responsible_staff rs
+        WHERE rs.order_id = o.id
+        ORDER BY rs.user_id
+    ) AS responsible_staff_ids,
+    (
+        -- same as User.__str__
+        SELECT string_agg(
+            CASE
+                WHEN u.first_name <> '' AND u.last_name <> ''
+                THEN u.first_name || ' ' || u.last_name
+                ELSE u.email
+            END,
+            ', ' ORDER BY u.first_name, u.last_name, u.email
+        )
+        FROM genlab_bestilling_order_responsible_staff rs
+        JOIN users_user u ON u.id = rs.user_id
+        WHERE rs.order_id = o.id
+    ) AS responsible_staff_names
+FROM genlab_bestilling_order o
+LEFT JOIN genlab_bestilling_extractionorder eo ON eo.order_ptr_id = o.id
+LEFT JOIN genlab_bestilling_analysisorder ao ON ao.order_ptr_id = o.id
+LEFT JOIN genlab_bestilling_equipmentorder qo ON qo.order_ptr_id = o.id
+LEFT JOIN genlab_bestilling_ordersampleprogress sp ON sp.order_id = o.id;
+"""
+
+
+def previous_order_listing_view() -> str:
+    return importlib.import_module(
+        "genlab_bestilling.migrations.0064_orderlisting"
+    ).ORDER_LISTING_VIEW
+
+
+def backfill_sample_progress(apps, schema_editor):
+    ExtractionOrder = apps.get_model("genlab_bestilling", "ExtractionOrder")
+    OrderSampleProgress = apps.get_model("genlab_bestilling", "OrderSampleProgress")
+
+    orders = ExtractionOrder.objects.annotate(
+        total=Count("samples"),
+        with_genlab_id=Count("samples", filter=Q(samples__genlab_id__isnull=False)),
+        marked=Count("samples", filter=Q(samples__is_marked=True)),
+        plucked=Count("samples", filter=Q(samples__is_plucked=True)),
+        isolated=Count("samples", filter=Q(samples__is_isolated=True)),
+        invalid=Count("samples", filter=Q(samples__is_invalid=True)),
+    ).values(
+        "pk", "total", "with_genlab_id", "marked", "plucked", "isolated", "invalid"
+    )
+    OrderSampleProgress.objects.bulk_create(
+        [
+            OrderSampleProgress(order_id=order.pop("pk"), **order)
+            for order in orders.iterator(chunk_size=1000)
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("genlab_bestilling", "0064_orderlisting"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OrderSampleProgress",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("total", models.PositiveIntegerField(default=0)),
+                ("with_genlab_id", models.PositiveIntegerField(default=0)),
+                ("marked", models.PositiveIntegerField(default=0)),
+                ("plucked", models.PositiveIntegerField(default=0)),
+                ("isolated", models.PositiveIntegerField(default=0)),
+                ("invalid", models.PositiveIntegerField(default=0)),
+                ("refreshed_at", models.DateTimeField(auto_now=True)),
+                (
+                    "order",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sample_progress",
+                        to="genlab_bestilling.extractionorder",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Order sample progress",
+            },
+        ),
+        migrations.RunPython(backfill_sample_progress, migrations.RunPython.noop),
+        migrations.RunSQL(ORDER_LISTING_VIEW, previous_order_listing_view()),
+    ]
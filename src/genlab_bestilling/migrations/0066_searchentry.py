@@ -0,0 +1,71 @@
+# Generated by Django 6.1 on 2026-10-19 15:40
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("genlab_bestilling", "0065_ordersampleprogress"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("sample", "Sample"),
+                            ("order", "Order"),
+                            ("extraction_plate", "Extraction plate"),
+                            ("analysis_plate", "Analysis plate"),
+                            ("project", "Project"),
+                        ]
+                    ),
+                ),
+                ("object_id", models.CharField()),
+                ("title", models.CharField()),
+                ("description", models.CharField(blank=True)),
+                ("url", models.CharField()),
+                (
+                    "keys",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.CharField(), default=list, size=None
+                    ),
+                ),
+                ("text", models.TextField()),
+                ("refreshed_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name_plural": "Search entries",
+                "indexes": [
+                    django.contrib.postgres.indexes.GinIndex(
+                        fields=["keys"], name="search_entry_keys_idx"
+                    ),
+                    django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.indexes.OpClass(
+                            models.F("text"), name="gin_trgm_ops"
+                        ),
+                        name="search_entry_text_trgm_idx",
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("kind", "object_id"), name="unique_search_entry"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,155 @@
+# Generated by Django 6.1 on 2026-10-19 16:10
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+SMA = "genlab_bestilling_samplemarkeranalysis"
+POSITION = "genlab_bestilling_plateposition"
+PLATE = "genlab_bestilling_plate"
+TRACKED_TABLES = [SMA, POSITION, PLATE]
+PLATE_SUBCLASS_TABLES = [
+    "genlab_bestilling_analysisplate",
+    "genlab_bestilling_extractionplate",
+]
+
+# The id of the writing transaction is stored in change_xid, and a
+# tombstone is written for each deleted row.
+# Rows derived from another one are "touched" (change_xid is set again by
+# their own trigger) when it changes: the sample markers of a position when
+# the sample marker of the position changes, and the plate when the table of
+# its subclass is updated.
+CREATE_FUNCTIONS = """
+CREATE OR REPLACE FUNCTION genlab_bestilling_track_change() RETURNS trigger AS $$
+BEGIN
+    NEW.change_xid := pg_current_xact_id()::text::bigint;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION genlab_bestilling_track_delete() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO genlab_bestilling_deletedrow (table_name, object_id, change_xid)
+    VALUES (TG_TABLE_NAME, OLD.id::text, pg_current_xact_id()::text::bigint);
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION genlab_bestilling_touch_position_sample_markers()
+RETURNS trigger AS $$
+BEGIN
+    UPDATE genlab_bestilling_samplemarkeranalysis SET change_xid = 0
+    WHERE id IN (OLD.sample_marker_id, NEW.sample_marker_id);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION genlab_bestilling_touch_plate() RETURNS trigger AS $$
+BEGIN
+    UPDATE genlab_bestilling_plate SET change_xid = 0 WHERE id = NEW.plate_ptr_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+CREATE_TRIGGERS = (
+    "".join(
+        f"""
+CREATE TRIGGER track_change BEFORE INSERT OR UPDATE ON {table}
+FOR EACH ROW EXECUTE FUNCTION genlab_bestilling_track_change();
+CREATE TRIGGER track_delete AFTER DELETE ON {table}
+FOR EACH ROW EXECUTE FUNCTION genlab_bestilling_track_delete();
+"""
+        for table in TRACKED_TABLES
+    )
+    + f"""
+CREATE TRIGGER touch_sample_markers AFTER UPDATE OF sample_marker_id ON {POSITION}
+FOR EACH ROW WHEN (OLD.sample_marker_id IS DISTINCT FROM NEW.sample_marker_id)
+EXECUTE FUNCTION genlab_bestilling_touch_position_sample_markers();
+"""
+    + "".join(
+        f"""
+CREATE TRIGGER touch_plate AFTER UPDATE ON {table}
+FOR EACH ROW EXECUTE FUNCTION genlab_bestilling_touch_plate();
+"""
+        for table in PLATE_SUBCLASS_TABLES
+    )
+)
+
+DROP_TRIGGERS = (
+    "".join(
+        f"""
+DROP TRIGGER IF EXISTS track_change ON {table};
+DROP TRIGGER IF EXISTS track_delete ON {table};
+"""
+        for table in TRACKED_TABLES
+    )
+    + f"DROP TRIGGER IF EXISTS touch_sample_markers ON {POSITION};"
+    + "".join(
+        f"DROP TRIGGER IF EXISTS touch_plate ON {table};"
+        for table in PLATE_SUBCLASS_TABLES
+    )
+)
+
+DROP_FUNCTIONS = """
+DROP FUNCTION IF EXISTS genlab_bestilling_track_change();
+DROP FUNCTION IF EXISTS genlab_bestilling_track_delete();
+DROP FUNCTION IF EXISTS genlab_bestilling_touch_position_sample_markers();
+DROP FUNCTION IF EXISTS genlab_bestilling_touch_plate();
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("genlab_bestilling", "0066_searchentry"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="samplemarkeranalysis",
+            name="change_xid",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="plateposition",
+            name="change_xid",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="plate",
+            name="change_xid",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name="DeletedRow",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("table_name", models.CharField()),
+                ("object_id", models.CharField()),
+                ("change_xid", models.BigIntegerField()),
+                (
+                    "deleted_at",
+                    models.DateTimeField(
+                        db_default=django.db.models.functions.datetime.Now()
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["table_name", "change_xid"],
+                        name="deleted_row_xid_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(CREATE_FUNCTIONS, DROP_FUNCTIONS),
+        migrations.RunSQL(CREATE_TRIGGERS, DROP_TRIGGERS),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.1 on 2026-10-19 16:12
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("genlab_bestilling", "0067_change_tracking"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="samplemarkeranalysis",
+            index=models.Index(fields=["change_xid"], name="sma_change_xid_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="plateposition",
+            index=models.Index(fields=["change_xid"], name="position_change_xid_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="plate",
+            index=models.Index(fields=["change_xid"], name="plate_change_xid_idx"),
+        ),
+    ]
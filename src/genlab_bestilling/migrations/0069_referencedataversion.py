@@ -0,0 +1,81 @@
+# Generated by Django 6.1 on 2026-10-19 18:02
+
+from django.db import migrations, models
+
+# Tables read by the reference bundle: any statement writing one of them
+# bumps the version, including the bulk and raw ones that send no signal.
+REFERENCE_TABLES = [
+    "genlab_bestilling_area",
+    "genlab_bestilling_species",
+    "genlab_bestilling_species_markers",
+    "genlab_bestilling_marker",
+    "genlab_bestilling_sampletype",
+    "genlab_bestilling_sampletype_areas",
+    "genlab_bestilling_analysistype",
+    "genlab_bestilling_isolationmethod",
+    "genlab_bestilling_isolationmethod_sample_types",
+    "genlab_bestilling_locationtype",
+    "genlab_bestilling_location",
+    "genlab_bestilling_location_types",
+]
+
+# The versions come from a sequence, which is not rolled back: a version
+# seen by a transaction that rolled back is never given to another one.
+CREATE_FUNCTION = """
+INSERT INTO genlab_bestilling_referencedataversion (id, version) VALUES (1, 0);
+CREATE SEQUENCE genlab_bestilling_reference_version_seq;
+
+CREATE OR REPLACE FUNCTION genlab_bestilling_bump_reference_version()
+RETURNS trigger AS $$
+BEGIN
+    UPDATE genlab_bestilling_referencedataversion
+    SET version = nextval('genlab_bestilling_reference_version_seq') WHERE id = 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+CREATE_TRIGGERS = "".join(
+    f"""
+CREATE TRIGGER bump_reference_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+FOR EACH STATEMENT EXECUTE FUNCTION genlab_bestilling_bump_reference_version();
+"""
+    for table in REFERENCE_TABLES
+)
+
+DROP_TRIGGERS = "".join(
+    f"DROP TRIGGER IF EXISTS bump_reference_version ON {table};"
+    for table in REFERENCE_TABLES
+)
+
+DROP_FUNCTION = """
+DROP FUNCTION IF EXISTS genlab_bestilling_bump_reference_version();
+DROP SEQUENCE IF EXISTS genlab_bestilling_reference_version_seq;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("genlab_bestilling", "0068_change_xid_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReferenceDataVersion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("version", models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunSQL(CREATE_FUNCTION, DROP_FUNCTION),
+        migrations.RunSQL(CREATE_TRIGGERS, DROP_TRIGGERS),
+    ]
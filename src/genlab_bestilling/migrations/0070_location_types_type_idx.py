@@ -0,0 +1,28 @@
+# Generated by Django 6.1 on 2026-10-19 18:40
+
+from django.db import migrations
+
+# The locations of a species are looked up from its location type
+# (see LocationQuerySet.filter_types): index the auto-created through table
+# by type first, covering the location too.
+CREATE_INDEX = """
+CREATE INDEX CONCURRENTLY IF NOT EXISTS location_types_type_location_idx
+ON genlab_bestilling_location_types (locationtype_id, location_id);
+"""
+
+DROP_INDEX = """
+DROP INDEX CONCURRENTLY IF EXISTS location_types_type_location_idx;
+"""
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("genlab_bestilling", "0069_referencedataversion"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_INDEX, DROP_INDEX),
+    ]
@@ -0,0 +1,147 @@
+# Generated by Django 6.1 on 2026-10-19 19:05
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, Q
+
+COUNTERS = ("orders_total", "samples", "isolated_samples", "analysed_markers")
+
+
+def empty():
+    return {"orders": {}, "last_activity_at": None, **dict.fromkeys(COUNTERS, 0)}
+
+
+def add(total, stats):
+    for order_type, statuses in stats["orders"].items():
+        counts = total["orders"].setdefault(order_type, {})
+        for status, count in statuses.items():
+            counts[status] = counts.get(status, 0) + count
+    for field in COUNTERS:
+        total[field] += stats[field]
+    last = stats["last_activity_at"]
+    if last is not None and (
+        total["last_activity_at"] is None or last > total["last_activity_at"]
+    ):
+        total["last_activity_at"] = last
+
+
+def backfill_statistics(apps, schema_editor):
+    Genrequest = apps.get_model("genlab_bestilling", "Genrequest")
+    OrderListing = apps.get_model("genlab_bestilling", "OrderListing")
+    Sample = apps.get_model("genlab_bestilling", "Sample")
+    SampleMarkerAnalysis = apps.get_model("genlab_bestilling", "SampleMarkerAnalysis")
+    GenrequestStatistics = apps.get_model("genlab_bestilling", "GenrequestStatistics")
+    ProjectStatistics = apps.get_model("genlab_bestilling", "ProjectStatistics")
+    Project = apps.get_model("nina", "Project")
+
+    genrequests = defaultdict(empty)
+    projects = {pk: empty() for pk in Project.objects.values_list("pk", flat=True)}
+    for row in (
+        OrderListing.objects.order_by()
+        .values("genrequest_id", "order_type", "status")
+        .annotate(count=Count("id"), last=Max("last_modified_at"))
+    ):
+        add(
+            genrequests[row["genrequest_id"]],
+            {
+                **empty(),
+                "orders": {row["order_type"] or "other": {row["status"]: row["count"]}},
+                "orders_total": row["count"],
+                "last_activity_at": row["last"],
+            },
+        )
+    for row in (
+        Sample.objects.order_by()
+        .values("order__genrequest_id")
+        .annotate(
+            samples=Count("id"),
+            isolated_samples=Count("id", filter=Q(is_isolated=True)),
+        )
+    ):
+        genrequests[row.pop("order__genrequest_id")].update(row)
+    for row in (
+        SampleMarkerAnalysis.objects.filter(is_analysed=True)
+        .order_by()
+        .values("order__genrequest_id")
+        .annotate(analysed_markers=Count("id"))
+    ):
+        genrequests[row.pop("order__genrequest_id")].update(row)
+
+    rows = []
+    for pk, project_id in Genrequest.objects.values_list("pk", "project_id"):
+        stats = genrequests[pk]
+        add(projects[project_id], stats)
+        rows.append(GenrequestStatistics(genrequest_id=pk, **stats))
+    GenrequestStatistics.objects.bulk_create(rows, batch_size=1000)
+    ProjectStatistics.objects.bulk_create(
+        [ProjectStatistics(project_id=pk, **stats) for pk, stats in projects.items()],
+        batch_size=1000,
+    )
+
+
+def statistics_fields():
+    return [
+        (
+            "id",
+            models.BigAutoField(
+                auto_created=True,
+                primary_key=True,
+                serialize=False,
+                verbose_name="ID",
+            ),
+        ),
+        ("orders", models.JSONField(default=dict)),
+        ("orders_total", models.PositiveIntegerField(default=0)),
+        ("samples", models.PositiveIntegerField(default=0)),
+        ("isolated_samples", models.PositiveIntegerField(default=0)),
+        ("analysed_markers", models.PositiveIntegerField(default=0)),
+        ("last_activity_at", models.DateTimeField(blank=True, null=True)),
+        ("refreshed_at", models.DateTimeField(auto_now=True)),
+    ]
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("genlab_bestilling", "0070_location_types_type_idx"),
+        ("nina", "0004_add_valid_project_model"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GenrequestStatistics",
+            fields=[
+                *statistics_fields(),
+                (
+                    "genrequest",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="statistics",
+                        to="genlab_bestilling.genrequest",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Genrequest statistics",
+            },
+        ),
+        migrations.CreateModel(
+            name="ProjectStatistics",
+            fields=[
+                *statistics_fields(),
+                (
+                    "project",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="statistics",
+                        to="nina.project",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Project statistics",
+            },
+        ),
+        migrations.RunPython(backfill_statistics, migrations.RunPython.noop),
+    ]
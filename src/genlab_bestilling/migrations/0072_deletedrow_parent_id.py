@@ -0,0 +1,76 @@
+# Generated by Django 6.1 on 2026-10-19 20:30
+
+from django.db import migrations, models
+
+SMA = "genlab_bestilling_samplemarkeranalysis"
+POSITION = "genlab_bestilling_plateposition"
+
+# The tombstones also store the value of the column given as the argument of
+# the trigger (the order of a sample marker, the plate of a position), so that
+# a list is synced with the rows deleted from it only.
+CREATE_FUNCTION = """
+CREATE OR REPLACE FUNCTION genlab_bestilling_track_delete() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO genlab_bestilling_deletedrow
+        (table_name, object_id, parent_id, change_xid)
+    VALUES (
+        TG_TABLE_NAME,
+        OLD.id::text,
+        CASE WHEN TG_NARGS > 0 THEN to_jsonb(OLD) ->> TG_ARGV[0] END,
+        pg_current_xact_id()::text::bigint
+    );
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+DROP_FUNCTION = """
+CREATE OR REPLACE FUNCTION genlab_bestilling_track_delete() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO genlab_bestilling_deletedrow (table_name, object_id, change_xid)
+    VALUES (TG_TABLE_NAME, OLD.id::text, pg_current_xact_id()::text::bigint);
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+CREATE_TRIGGERS = "".join(
+    f"""
+DROP TRIGGER IF EXISTS track_delete ON {table};
+CREATE TRIGGER track_delete AFTER DELETE ON {table}
+FOR EACH ROW EXECUTE FUNCTION genlab_bestilling_track_delete('{column}');
+"""
+    for table, column in [(SMA, "order_id"), (POSITION, "plate_id")]
+)
+
+DROP_TRIGGERS = "".join(
+    f"""
+DROP TRIGGER IF EXISTS track_delete ON {table};
+CREATE TRIGGER track_delete AFTER DELETE ON {table}
+FOR EACH ROW EXECUTE FUNCTION genlab_bestilling_track_delete();
+"""
+    for table in [SMA, POSITION]
+)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("genlab_bestilling", "0071_statistics"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="deletedrow",
+            name="parent_id",
+            field=models.CharField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="deletedrow",
+            index=models.Index(
+                fields=["table_name", "parent_id", "change_xid"],
+                name="deleted_row_parent_xid_idx",
+            ),
+        ),
+        migrations.RunSQL(CREATE_FUNCTION, DROP_FUNCTION),
+        migrations.RunSQL(CREATE_TRIGGERS, DROP_TRIGGERS),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 6.1 on 2026-10-19 20:45
+
+from django.db import migrations
+
+REFERENCE_TABLES = [
+    "genlab_bestilling_area",
+    "genlab_bestilling_species",
+    "genlab_bestilling_species_markers",
+    "genlab_bestilling_marker",
+    "genlab_bestilling_sampletype",
+    "genlab_bestilling_sampletype_areas",
+    "genlab_bestilling_analysistype",
+    "genlab_bestilling_isolationmethod",
+    "genlab_bestilling_isolationmethod_sample_types",
+    "genlab_bestilling_locationtype",
+    "genlab_bestilling_location",
+    "genlab_bestilling_location_types",
+]
+
+# The version is the last value of the sequence: nextval takes no lock, so
+# concurrent writes to the reference tables no longer wait for each other on
+# the row of the version. A sequence is not transactional, so the triggers
+# are deferred to the commit: a bundle read while the writing transaction
+# runs is not cached under the new version.
+CREATE_FUNCTION = """
+CREATE OR REPLACE FUNCTION genlab_bestilling_bump_reference_version()
+RETURNS trigger AS $$
+BEGIN
+    PERFORM nextval('genlab_bestilling_reference_version_seq');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+DROP_FUNCTION = """
+INSERT INTO genlab_bestilling_referencedataversion (id, version)
+SELECT 1, last_value FROM genlab_bestilling_reference_version_seq;
+
+CREATE OR REPLACE FUNCTION genlab_bestilling_bump_reference_version()
+RETURNS trigger AS $$
+BEGIN
+    UPDATE genlab_bestilling_referencedataversion
+    SET version = nextval('genlab_bestilling_reference_version_seq') WHERE id = 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+CREATE_TRIGGERS = "".join(
+    f"""
+DROP TRIGGER IF EXISTS bump_reference_version ON {table};
+CREATE CONSTRAINT TRIGGER bump_reference_version
+AFTER INSERT OR UPDATE OR DELETE ON {table}
+DEFERRABLE INITIALLY DEFERRED
+FOR EACH ROW EXECUTE FUNCTION genlab_bestilling_bump_reference_version();
+CREATE TRIGGER bump_reference_version_truncate AFTER TRUNCATE ON {table}
+FOR EACH STATEMENT EXECUTE FUNCTION genlab_bestilling_bump_reference_version();
+"""
+    for table in REFERENCE_TABLES
+)
+
+DROP_TRIGGERS = "".join(
+    f"""
+DROP TRIGGER IF EXISTS bump_reference_version ON {table};
+DROP TRIGGER IF EXISTS bump_reference_version_truncate ON {table};
+CREATE TRIGGER bump_reference_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+FOR EACH STATEMENT EXECUTE FUNCTION genlab_bestilling_bump_reference_version();
+"""
+    for table in REFERENCE_TABLES
+)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("genlab_bestilling", "0072_deletedrow_parent_id"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TRIGGERS, DROP_TRIGGERS),
+        migrations.RunSQL(CREATE_FUNCTION, DROP_FUNCTION),
+        migrations.DeleteModel(
+            name="ReferenceDataVersion",
+        ),
+    ]
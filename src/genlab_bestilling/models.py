@@ -1,12 +1,16 @@
+import io
 import uuid
-from collections.abc import Sequence
+from collections.abc import Callable, Collection, Mapping, Sequence
 from datetime import timedelta
 from pathlib import Path
 from typing import Any, Self
 
 from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models, transaction
 from django.db.models import Q
+from django.db.models.functions import Cast, Now, Upper
 from django.template.loader import render_to_string
 from django.urls import reverse
 from django.utils import timezone
@@ -27,11 +31,19 @@ from sequencefield.constraints import IntSequenceConstraint
 from sequencefield.fields import IntegerSequenceField
 from taggit.managers import TaggableManager
 
+from shared import events
 from shared.db import assert_is_in_atomic_block
 from shared.mixins import AdminUrlsMixin
+from shared.tracing import current_span, traced
 
 from . import managers
-from .libs.bird_id import bird_id
+from .libs.bird_id import BIRD_ID_PATTERN
+from .libs.result_file import (
+    ResultFileError,
+    WellResult,
+    parse_result_file,
+    stored_well,
+)
 
 an = "genlab_bestilling"  # Short alias for app name.
 
@@ -222,6 +234,30 @@ class Location(AdminUrlsMixin, models.Model):
         help_text="This field can be used to store additional information about the location, such as the species in focus or other relevant details.",  # noqa: E501
     )
 
+    objects = managers.LocationQuerySet.as_manager()
+
+    class Meta:
+        # Support the prefix (istartswith) and substring (icontains) lookups
+        # issued by the autocomplete endpoints
+        indexes = [
+            models.Index(
+                OpClass(Upper("river_id"), name="text_pattern_ops"),
+                name="location_river_prefix_idx",
+            ),
+            models.Index(
+                OpClass(Upper("code"), name="text_pattern_ops"),
+                name="location_code_prefix_idx",
+            ),
+            models.Index(
+                OpClass(Upper("name"), name="text_pattern_ops"),
+                name="location_name_prefix_idx",
+            ),
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="location_name_trgm_idx",
+            ),
+        ]
+
     def __str__(self):
         if self.river_id:
             return f"{self.river_id} {self.name}"
@@ -229,7 +265,7 @@ class Location(AdminUrlsMixin, models.Model):
         return self.name
 
 
-class Genrequest(AdminUrlsMixin, models.Model):  # type: ignore[django-manager-missing]
+class Genrequest(AdminUrlsMixin, LifecycleModelMixin, models.Model):  # type: ignore[django-manager-missing]
     """
     A GenLab genrequest, multiple GenLab requests can have the same NINA project number
     """
@@ -308,6 +344,13 @@ class Genrequest(AdminUrlsMixin, models.Model):  # type: ignore[django-manager-m
             kwargs={"pk": self.pk},
         )
 
+    @hook(AFTER_UPDATE, condition=WhenFieldHasChanged("project"))
+    def refresh_previous_project_statistics(self) -> None:
+        # the new project is refreshed with the genrequest, see signals
+        managers.schedule_statistics_refresh(
+            project_ids=[self.initial_value("project_id")]
+        )
+
     def get_admin_orders_url(self) -> str:
         return f"{Order.get_admin_changelist_url()}?genrequest={self.id}"
 
@@ -396,6 +439,14 @@ class Order(AdminUrlsMixin, LifecycleModelMixin, PolymorphicModel):
     tags = TaggableManager(blank=True)
     objects = managers.OrderManager()
 
+    class Meta:
+        indexes = [
+            # staff dashboard: urgent and unseen orders per status
+            models.Index(
+                fields=["status", "is_urgent", "is_seen"], name="order_dashboard_idx"
+            ),
+        ]
+
     def confirm_order(self) -> None:
         self.status = Order.OrderStatus.DELIVERED
         self.confirmed_at = timezone.now()
@@ -493,6 +544,12 @@ class Order(AdminUrlsMixin, LifecycleModelMixin, PolymorphicModel):
             html_message=html_message,
         )
 
+    @hook(AFTER_UPDATE, on_commit=True, condition=WhenFieldHasChanged("status"))
+    def publish_status_change(self) -> None:
+        events.publish(
+            f"order:{self.pk}", "order-status", id=self.pk, status=self.status
+        )
+
 
 class EquipmentType(models.Model):
     name = models.CharField(max_length=255, null=True, blank=True)
@@ -612,6 +669,24 @@ class ExtractionOrder(Order):
     def get_admin_samples_url(self) -> str:
         return f"{Sample.get_admin_changelist_url()}?order__order_ptr__exact={self.id}"
 
+    def get_sample_progress(self) -> "OrderSampleProgress":
+        """
+        Counters of the samples of the order,
+        all zeros if the order has no samples yet.
+        """
+        try:
+            return self.sample_progress
+        except OrderSampleProgress.DoesNotExist:
+            return OrderSampleProgress(order=self)
+
+    @property
+    def filled_genlab_count(self) -> int:
+        return self.get_sample_progress().with_genlab_id
+
+    @property
+    def isolated_count(self) -> int:
+        return self.get_sample_progress().isolated
+
     def clone(self) -> None:
         """
         Generates a clone of the model, with a different ID
@@ -624,17 +699,20 @@ class ExtractionOrder(Order):
         self.species.add(*species)
         self.sample_types.add(*sample_types)
 
+    @traced("extraction_order.confirm", lambda self, *a, **kw: {"order_id": self.pk})
     def confirm_order(self, persist: bool = True) -> None:
         with transaction.atomic():
             if not self.samples.all().exists():
                 raise ValidationError(_("No samples found"))
 
             invalid = 0
-            for sample in self.samples.all():
+            samples = self.samples.all()
+            for sample in samples:
                 try:
                     sample.has_error  # noqa: B018
                 except ValidationError:
                     invalid += 1
+            current_span().set(sample_count=len(samples), invalid_count=invalid)
 
             if invalid > 0:
                 msg = f"Found {invalid} invalid or incompleted samples"
@@ -687,6 +765,117 @@ class ExtractionOrder(Order):
         )
 
 
+class OrderSampleProgress(models.Model):
+    """
+    Counters of the samples of an extraction order by progress.
+
+    They are refreshed after commit by the sample write paths (save, delete
+    and the bulk queryset methods of Sample, see
+    ``managers.schedule_sample_progress_refresh``) and can be checked
+    against the samples with the ``reconcile_sample_progress`` command.
+    """
+
+    order = models.OneToOneField(
+        f"{an}.ExtractionOrder",
+        on_delete=models.CASCADE,
+        related_name="sample_progress",
+    )
+    total = models.PositiveIntegerField(default=0)
+    with_genlab_id = models.PositiveIntegerField(default=0)
+    marked = models.PositiveIntegerField(default=0)
+    plucked = models.PositiveIntegerField(default=0)
+    isolated = models.PositiveIntegerField(default=0)
+    invalid = models.PositiveIntegerField(default=0)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    objects = managers.OrderSampleProgressQuerySet.as_manager()
+
+    class Meta:
+        verbose_name_plural = "Order sample progress"
+
+    def __str__(self) -> str:
+        return f"{self.order_id}: {self.isolated}/{self.total} isolated"
+
+    def percent(self, count: int) -> float:
+        return count / self.total * 100 if self.total else 0
+
+
+class Statistics(models.Model):
+    """
+    Rollup of the orders and samples shown in the project pages and lists.
+
+    ``orders`` counts the orders by type and status, e.g.
+    ``{"extraction": {"draft": 1, "completed": 2}}``.
+    """
+
+    orders = models.JSONField(default=dict)
+    orders_total = models.PositiveIntegerField(default=0)
+    samples = models.PositiveIntegerField(default=0)
+    isolated_samples = models.PositiveIntegerField(default=0)
+    analysed_markers = models.PositiveIntegerField(default=0)
+    last_activity_at = models.DateTimeField(null=True, blank=True)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+
+    def count_orders(
+        self, order_type: str | None = None, status: str | None = None
+    ) -> int:
+        return sum(
+            count
+            for type_, statuses in self.orders.items()
+            if order_type in (None, type_)
+            for status_, count in statuses.items()
+            if status in (None, status_)
+        )
+
+
+class GenrequestStatistics(Statistics):
+    """
+    Statistics of a genetic project.
+
+    They are refreshed after commit by the write paths of the orders, samples
+    and sample markers (see ``managers.schedule_statistics_refresh``) and
+    reconciled with the ``reconcile_statistics`` command, run nightly.
+    """
+
+    genrequest = models.OneToOneField(
+        f"{an}.Genrequest",
+        on_delete=models.CASCADE,
+        related_name="statistics",
+    )
+
+    objects = managers.GenrequestStatisticsQuerySet.as_manager()
+
+    class Meta:
+        verbose_name_plural = "Genrequest statistics"
+
+    def __str__(self) -> str:
+        return f"{self.genrequest_id}: {self.samples} samples"
+
+
+class ProjectStatistics(Statistics):
+    """
+    Statistics of a project, the sums of the ones of its genetic projects,
+    refreshed with them.
+    """
+
+    project = models.OneToOneField(
+        "nina.Project",
+        on_delete=models.CASCADE,
+        related_name="statistics",
+    )
+
+    objects = managers.ProjectStatisticsQuerySet.as_manager()
+
+    class Meta:
+        verbose_name_plural = "Project statistics"
+
+    def __str__(self) -> str:
+        return f"{self.project_id}: {self.samples} samples"
+
+
 class AnalysisOrderResultsCommunication(AdminUrlsMixin, models.Model):
     analysis_order = models.ForeignKey(
         f"{an}.AnalysisOrder",
@@ -764,6 +953,7 @@ class AnalysisOrder(Order):
     def get_type(self) -> str:
         return "analysis"
 
+    @traced("analysis_order.confirm", lambda self, *a, **kw: {"order_id": self.pk})
     def confirm_order(self, persist: bool = True) -> None:
         with transaction.atomic():
             if not self.external_samples and not self.samples.all().exists():
@@ -775,6 +965,10 @@ class AnalysisOrder(Order):
     def update_status(self) -> None:
         pass
 
+    @traced(
+        "analysis_order.populate_from_order",
+        lambda self: {"order_id": self.pk, "from_order_id": self.from_order_id},
+    )
     def populate_from_order(self) -> None:
         """
         Create the list of markers per sample to analyze
@@ -785,20 +979,136 @@ class AnalysisOrder(Order):
 
         with transaction.atomic():
             transaction_code = uuid.uuid4()
+            sample_markers = created = 0
 
             for marker in self.markers.all():
                 for sample in self.from_order.samples.filter(
                     species__in=marker.species.all()
                 ):
-                    SampleMarkerAnalysis.objects.update_or_create(
+                    _, is_created = SampleMarkerAnalysis.objects.update_or_create(
                         sample=sample,
                         order=self,
                         marker=marker,
                         defaults={"transaction": transaction_code},
                     )
+                    sample_markers += 1
+                    created += is_created
 
             # delete samples that are not generated in this transaction
-            self.sample_markers.exclude(transaction=transaction_code).delete()
+            deleted, _deleted_by_model = self.sample_markers.exclude(
+                transaction=transaction_code
+            ).delete()
+            current_span().set(
+                sample_marker_count=sample_markers,
+                created_count=created,
+                deleted_count=deleted,
+            )
+
+
+class OrderListing(models.Model):
+    """
+    Read model of the order tables and dashboards.
+
+    Each row is an order flattened with the columns of its subclass and the
+    aggregates shown in the lists, so that they can be filtered, sorted and
+    rendered without polymorphic fetches or subclass joins.
+    It is backed by the ``genlab_bestilling_orderlisting`` database view
+    and is always up to date with the orders.
+    """
+
+    class OrderType(models.TextChoices):
+        EXTRACTION = "extraction", _("Extraction order")
+        ANALYSIS = "analysis", _("Analysis order")
+        EQUIPMENT = "equipment", _("Equipment order")
+
+    OrderStatus = Order.OrderStatus
+
+    STR_PREFIXES = {
+        OrderType.EXTRACTION: "EXT",
+        OrderType.ANALYSIS: "ANL",
+        OrderType.EQUIPMENT: "EQP",
+    }
+    URL_NAMES = {
+        OrderType.EXTRACTION: "genrequest-extraction-detail",
+        OrderType.ANALYSIS: "genrequest-analysis-detail",
+        OrderType.EQUIPMENT: "genrequest-equipment-detail",
+    }
+    STAFF_URL_NAMES = {
+        OrderType.EXTRACTION: "staff:order-extraction-detail",
+        OrderType.ANALYSIS: "staff:order-analysis-detail",
+        OrderType.EQUIPMENT: "staff:order-equipment-detail",
+    }
+
+    id = models.BigIntegerField(primary_key=True)
+    order = models.OneToOneField(
+        f"{an}.Order",
+        on_delete=models.DO_NOTHING,
+        related_name="listing",
+    )
+    order_type = models.CharField(choices=OrderType, null=True)
+    name = models.CharField(null=True)
+    status = models.CharField(choices=Order.OrderStatus)
+    genrequest = models.ForeignKey(
+        f"{an}.Genrequest",
+        on_delete=models.DO_NOTHING,
+        related_name="+",
+        verbose_name="Genetic Project",
+    )
+    created_at = models.DateTimeField()
+    last_modified_at = models.DateTimeField()
+    confirmed_at = models.DateTimeField(null=True)
+    is_urgent = models.BooleanField()
+    is_prioritized = models.BooleanField()
+    is_seen = models.BooleanField()
+    contact_person = models.CharField(null=True)
+    contact_email = models.EmailField(null=True)
+    # Order.OrderPriority of the order, and rank of the status in the tables
+    priority = models.PositiveSmallIntegerField()
+    status_order = models.PositiveSmallIntegerField()
+
+    # Subclass columns, null for the other types of orders
+    internal_status = models.CharField(choices=ExtractionOrder.Status, null=True)
+    needs_guid = models.BooleanField(null=True)
+    return_samples = models.BooleanField(null=True)
+    pre_isolated = models.BooleanField(null=True)
+    from_order = models.ForeignKey(
+        f"{an}.ExtractionOrder",
+        on_delete=models.DO_NOTHING,
+        related_name="+",
+        null=True,
+    )
+    expected_delivery_date = models.DateField(null=True)
+    external_samples = models.BooleanField(null=True)
+
+    # Aggregates
+    sample_count = models.PositiveIntegerField()
+    isolated_sample_count = models.PositiveIntegerField()
+    markers_list = models.TextField(null=True)
+    species_list = models.TextField(null=True)
+    sample_types_list = models.TextField(null=True)
+    responsible_staff_ids = ArrayField(models.BigIntegerField())
+    responsible_staff_names = models.TextField(null=True)
+
+    objects = managers.OrderListingQuerySet.as_manager()
+
+    class Meta:
+        managed = False
+        db_table = "genlab_bestilling_orderlisting"
+
+    def __str__(self) -> str:
+        return f"#{self.STR_PREFIXES.get(self.order_type, 'ORD')}_{self.id}"
+
+    def get_absolute_url(self) -> str:
+        return reverse(
+            self.URL_NAMES[self.order_type],
+            kwargs={"pk": self.id, "genrequest_id": self.genrequest_id},
+        )
+
+    def get_absolute_staff_url(self) -> str:
+        return reverse(self.STAFF_URL_NAMES[self.order_type], kwargs={"pk": self.id})
+
+    def get_type(self) -> str:
+        return self.order_type or "order"
 
 
 class SampleMarkerAnalysis(AdminUrlsMixin, models.Model):
@@ -818,6 +1128,9 @@ class SampleMarkerAnalysis(AdminUrlsMixin, models.Model):
     is_analysed = models.BooleanField(default=False)
     is_outputted = models.BooleanField(default=False)
     is_invalid = models.BooleanField(default=False)
+    # Id of the last transaction that changed the row, set by a trigger
+    # (see the ``since`` parameter of the list APIs in ``staff.sync``)
+    change_xid = models.BigIntegerField(default=0, editable=False)
 
     objects = managers.SampleAnalysisMarkerQuerySet.as_manager()
 
@@ -829,12 +1142,22 @@ class SampleMarkerAnalysis(AdminUrlsMixin, models.Model):
                 name="unique_sample_per_analysis",
             )
         ]
+        indexes = [
+            models.Index(fields=["order", "marker"], name="sma_order_marker_idx"),
+            models.Index(fields=["change_xid"], name="sma_change_xid_idx"),
+        ]
 
     def __str__(self):
         return f"{str(self.sample)} {str(self.marker)} @ {str(self.order)}"
 
 
 class Sample(AdminUrlsMixin, models.Model):
+    class StatusRank(models.IntegerChoices):
+        NOT_STARTED = 0, _("Not started")
+        MARKED = 1, _("Marked")
+        PLUCKED = 2, _("Plucked")
+        ISOLATED = 3, _("Isolated")
+
     order = models.ForeignKey(
         f"{an}.ExtractionOrder",
         on_delete=models.CASCADE,
@@ -865,6 +1188,53 @@ class Sample(AdminUrlsMixin, models.Model):
     volume = models.FloatField(null=True, blank=True)
     genlab_id = models.CharField(null=True, blank=True)
 
+    # Sort and search keys stored with the row
+    name_as_int = models.GeneratedField(
+        # only names that are integers fitting in a bigint
+        expression=models.Case(
+            models.When(
+                name__regex=r"^\d{1,18}$",
+                then=Cast("name", models.BigIntegerField()),
+            ),
+            default=None,
+            output_field=models.BigIntegerField(),
+        ),
+        output_field=models.BigIntegerField(),
+        db_persist=True,
+    )
+    status_rank = models.GeneratedField(
+        expression=models.Case(
+            models.When(is_isolated=True, then=models.Value(3)),
+            models.When(is_plucked=True, then=models.Value(2)),
+            models.When(is_marked=True, then=models.Value(1)),
+            default=models.Value(0),
+        ),
+        output_field=models.PositiveSmallIntegerField(),
+        db_persist=True,
+    )
+    # Species code and running number of the genlab id,
+    # e.g. G24ABC00123-12 -> ABC123-12 (see libs.bird_id)
+    bird_id = models.GeneratedField(
+        expression=models.Case(
+            models.When(
+                genlab_id__regex=BIRD_ID_PATTERN,
+                then=models.Func(
+                    "genlab_id",
+                    models.Value(f"{BIRD_ID_PATTERN}.*$"),
+                    models.Value(r"\1\2\3"),
+                    function="REGEXP_REPLACE",
+                ),
+            ),
+            default=None,
+            output_field=models.CharField(),
+        ),
+        output_field=models.CharField(),
+        db_persist=True,
+    )
+    # Depends on the location code, kept up to date by save()
+    # and by the Location post_save signal
+    fish_id = models.CharField(null=True, blank=True, editable=False)
+
     parent = models.ForeignKey("self", on_delete=models.PROTECT, null=True, blank=True)
 
     isolation_method = models.ManyToManyField(
@@ -893,10 +1263,68 @@ class Sample(AdminUrlsMixin, models.Model):
         constraints = [
             models.UniqueConstraint(fields=["genlab_id"], name="unique_genlab_id")
         ]
+        # Support the prefix (istartswith) and substring (icontains) lookups
+        # issued by the autocomplete endpoints
+        indexes = [
+            models.Index(
+                OpClass(Upper("genlab_id"), name="text_pattern_ops"),
+                name="sample_gid_prefix_idx",
+            ),
+            models.Index(
+                OpClass(Upper("guid"), name="text_pattern_ops"),
+                name="sample_guid_prefix_idx",
+            ),
+            models.Index(
+                OpClass(Upper("name"), name="text_pattern_ops"),
+                name="sample_name_prefix_idx",
+            ),
+            GinIndex(
+                OpClass(Upper("genlab_id"), name="gin_trgm_ops"),
+                name="sample_gid_trgm_idx",
+            ),
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="sample_name_trgm_idx",
+            ),
+            # lab view: samples of an order sorted by genlab id
+            models.Index(fields=["order", "genlab_id"], name="sample_order_gid_idx"),
+            # ExtractionOrder.update_status
+            models.Index(
+                fields=["order"],
+                condition=Q(is_isolated=False),
+                name="sample_order_not_isolated_idx",
+            ),
+            # genlab id generation, partitioned by species and year
+            models.Index(fields=["species", "year"], name="sample_species_year_idx"),
+            # staff tables sorted by name or status within an order
+            models.Index(
+                fields=["order", "name_as_int", "name"], name="sample_order_name_idx"
+            ),
+            models.Index(
+                fields=["order", "status_rank"], name="sample_order_status_idx"
+            ),
+            models.Index(
+                OpClass(Upper("bird_id"), name="text_pattern_ops"),
+                name="sample_bird_prefix_idx",
+            ),
+            models.Index(
+                OpClass(Upper("fish_id"), name="text_pattern_ops"),
+                name="sample_fish_prefix_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.genlab_id or f"#SMP_{self.id}"
 
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            self.fish_id = self.get_fish_id()
+        elif {"name", "year", "location"} & set(update_fields):
+            self.fish_id = self.get_fish_id()
+            kwargs["update_fields"] = {*update_fields, "fish_id"}
+        super().save(*args, **kwargs)
+
     def get_absolute_url(self) -> str:
         return reverse("staff:samples-detail", kwargs={"pk": self.pk})
 
@@ -909,8 +1337,7 @@ class Sample(AdminUrlsMixin, models.Model):
     def get_admin_changelist_url() -> str:
         return reverse("admin:genlab_bestilling_sample_changelist")
 
-    @property
-    def fish_id(self) -> str | None:
+    def get_fish_id(self) -> str | None:
         """
         Generate a unique fish ID for the sample.
 
@@ -926,21 +1353,6 @@ class Sample(AdminUrlsMixin, models.Model):
         format_name = str(self.name).zfill(4)  # Fill from left with zeros.
         return f"{self.location.code}_{format_year}_{format_name}"
 
-    @property
-    def bird_id(self) -> str | None:
-        """
-        Generate a bird ID based on the species code and last three digits
-        of the running number from the genlab_id.
-
-        Format: {species.code}{last_three_digits}
-        Example: if genlab_id is 'G24ABC00123', returns 'ABC123'
-        Example: if genlab_id is 'G24ABC00123-12', returns 'ABC123-12'
-        """
-        if not self.genlab_id:
-            return None
-
-        return bird_id(self.genlab_id)
-
     @property
     def status(self) -> str:
         """
@@ -965,40 +1377,63 @@ class Sample(AdminUrlsMixin, models.Model):
         This cannot be done inside a clean_ method because each sample is always
         a valid row in the database, but in certain contexts it might be invalid.
         """
+        msg = self.get_sheet_error(
+            {
+                "name": self.name,
+                "type_id": self.type_id,
+                "guid": self.guid,
+                "species_id": self.species_id,
+                "year": self.year,
+                "location_id": self.location_id,
+                "location_mandatory": (
+                    self.order.genrequest.area.location_mandatory  # type: ignore[union-attr] # FIXME: Order can be None.
+                ),
+                "species_location_type_id": self.species.location_type_id,
+            },
+            lambda: [location_type.pk for location_type in self.location.types.all()],  # type: ignore[union-attr]
+        )
+        if msg:
+            raise ValidationError(msg)
+        return False
+
+    @staticmethod
+    def get_sheet_error(
+        row: Mapping[str, Any], location_type_ids: Callable[[], Collection[int]]
+    ) -> str | None:
+        """
+        Return the error of a sample sheet row (see has_error), None if valid.
+
+        ``row`` has the fields of the sample, ``location_mandatory`` of its area
+        and ``species_location_type_id``; ``location_type_ids`` returns the
+        types of the location of the sample, it is only called when needed.
+        """
         if not all(
             [
-                self.name,
-                self.type,
-                self.guid,
-                self.species,
-                self.year,
+                row["name"],
+                row["type_id"],
+                row["guid"],
+                row["species_id"],
+                row["year"],
             ]
         ):
-            msg = "GUID, Sample Name, Sample Type, Species and Year are required"
-            raise ValidationError(msg)
+            return "GUID, Sample Name, Sample Type, Species and Year are required"
 
-        if self.order.genrequest.area.location_mandatory:  # type: ignore[union-attr] # FIXME: Order can be None.
-            if not self.location_id:
-                msg = "Location is required"
-                raise ValidationError(msg)
+        if row["location_mandatory"]:
+            if not row["location_id"]:
+                return "Location is required"
             # ensure that location is correct for the selected species
             if (
-                self.species.location_type
-                and self.species.location_type_id
-                not in self.location.types.values_list("id", flat=True)  # type: ignore[union-attr] # FIXME: Order can be None.
+                row["species_location_type_id"]
+                and row["species_location_type_id"] not in location_type_ids()
             ):
-                msg = "Invalid location for the selected species"
-                raise ValidationError(msg)
-        elif self.species.location_type_id and self.location:
+                return "Invalid location for the selected species"
+        elif row["species_location_type_id"] and row["location_id"]:
             # if the location is optional, but it's provided,
             # check it is compatible with the species
-            if self.species.location_type_id not in self.location.types.values_list(
-                "id", flat=True
-            ):
-                msg = "Selected location not compatible with the selected species"
-                raise ValidationError(msg)
+            if row["species_location_type_id"] not in location_type_ids():
+                return "Selected location not compatible with the selected species"
 
-        return False
+        return None
 
     class MissingOrder(Exception):
         """
@@ -1141,6 +1576,7 @@ class GIDSequence(AdminUrlsMixin, models.Model):
     def __str__(self):
         return f"{self.id}@{self.last_value}"
 
+    @traced("gid_sequence.next_value", lambda self: {"sequence_id": self.pk})
     def next_value(self) -> str:
         """
         Update the last_value transactionally and return the corresponding genlab_id
@@ -1158,6 +1594,14 @@ class Plate(LifecycleModelMixin, PolymorphicModel):
     created_at = models.DateTimeField(auto_now_add=True)
     last_modified_at = models.DateTimeField(auto_now=True)
     notes = models.TextField(null=True, blank=True)
+    # Id of the last transaction that changed the row, set by a trigger
+    # (see the ``since`` parameter of the list APIs in ``staff.sync``)
+    change_xid = models.BigIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["change_xid"], name="plate_change_xid_idx"),
+        ]
 
     ROWS = "ABCDEFGH"  # 8 rows
     COLUMNS = 12  # 12 columns
@@ -1190,6 +1634,25 @@ class Plate(LifecycleModelMixin, PolymorphicModel):
     class InvalidColumn(ValueError):
         """Exception raised when an invalid column number is provided."""
 
+    @classmethod
+    def coordinates_to_position(cls, coordinate: str) -> int:
+        """Return the position index of a plate coordinate (e.g., B2 -> 9).
+
+        Inverse of `PlatePosition.position_to_coordinates`.
+
+        Raises:
+            InvalidRow: If the row letter is not valid
+            InvalidColumn: If the column is not in range 1-12
+        """
+        row, column = coordinate[:1].upper(), coordinate[1:]
+        if not row or row not in cls.ROWS:
+            msg = f"Invalid row '{row}'. Must be one of {cls.ROWS}"
+            raise cls.InvalidRow(msg)
+        if not column.isdigit() or not 1 <= int(column) <= cls.COLUMNS:
+            msg = f"Invalid column {column}. Must be between 1 and {cls.COLUMNS}"
+            raise cls.InvalidColumn(msg)
+        return (int(column) - 1) * len(cls.ROWS) + cls.ROWS.index(row)
+
     @transaction.atomic
     def empty_row(self, row: str) -> int:
         """Empty all positions in a row.
@@ -1331,6 +1794,14 @@ class Plate(LifecycleModelMixin, PolymorphicModel):
             .update(is_reserved=True)
         )
 
+    @traced(
+        "plate.populate",
+        lambda self, items, field_name: {
+            "plate_id": self.pk,
+            "item_count": len(items),
+            "field_name": field_name,
+        },
+    )
     @transaction.atomic
     def populate(self, items: list, field_name: str) -> None:
         if field_name not in ["sample_raw", "sample_marker_analysis"]:
@@ -1432,11 +1903,15 @@ class ExtractionPlate(Plate):
             self.validate_sample(sample)
         super().populate(items, "sample_raw")
 
+    @traced("extraction_plate.isolate_all_samples", lambda self: {"plate_id": self.pk})
     def deferred_isolate_all_samples(self) -> None:
         with transaction.atomic():
-            Sample.objects.filter(position__plate_id=self.pk).select_related(
-                "position"
-            ).update(is_isolated=True)
+            isolated = (
+                Sample.objects.filter(position__plate_id=self.pk)
+                .select_related("position")
+                .update(is_isolated=True)
+            )
+            current_span().set(sample_count=isolated)
             self.isolated_at = timezone.now()
             self.save()
 
@@ -1530,6 +2005,194 @@ class AnalysisPlate(Plate):
             self.validate_sample_marker(sample_marker)
         super().populate(items, "sample_marker")
 
+    class InvalidResultFile(Exception):
+        """Raised when the result file is missing or cannot be parsed."""
+
+    def matches_result_label(self, label: str | None) -> bool:
+        """Tell whether a plate label of a result file refers to this plate."""
+        if not label:
+            return True
+        label = label.strip().lstrip("#").upper()
+        return label in {
+            f"A{self.analysis_number}",
+            str(self.analysis_number),
+            (self.name or "").strip().upper(),
+        }
+
+    def other_plate_results(
+        self, sample_marker_ids: Collection[int]
+    ) -> tuple[set[int], set[int]]:
+        """Tell which sample markers have results in the result files of the
+        other analysis plates (replicates).
+
+        Returns:
+            The ids among `sample_marker_ids` with a result, and with an output.
+        """
+        analysed: set[int] = set()
+        outputted: set[int] = set()
+        if not sample_marker_ids:
+            return analysed, outputted
+
+        positions = list(
+            PlatePosition.objects.filter(sample_marker_id__in=sample_marker_ids)
+            .exclude(plate_id=self.pk)
+            .values_list("plate_id", "position", "sample_marker_id")
+        )
+        extras = dict(
+            AnalysisPlate.objects.filter(
+                pk__in={plate_id for plate_id, _, _ in positions}
+            ).values_list("pk", "extra")
+        )
+        for plate_id, position, sample_marker_id in positions:
+            coordinate = PlatePosition.index_to_coordinates(position)
+            rows = ((extras.get(plate_id) or {}).get("results") or {}).get(
+                coordinate, []
+            )
+            if rows:
+                analysed.add(sample_marker_id)
+            if any(stored_well(coordinate, values).has_output for values in rows):
+                outputted.add(sample_marker_id)
+        return analysed, outputted
+
+    def apply_well_results(
+        self,
+        positions: dict[int, "PlatePosition"],
+        wells: dict[int, list[WellResult]],
+    ) -> list["PlatePosition"]:
+        """Set the flags of the wells of a result file and of the previous one.
+
+        Args:
+            positions: The positions of the plate by index, with their
+                sample marker.
+            wells: The rows of the result file by position index.
+
+        Returns:
+            The positions updated.
+        """
+        previous: set[int] = set()
+        for coordinate in (self.extra or {}).get("results") or {}:
+            try:
+                previous.add(self.coordinates_to_position(coordinate))
+            except (self.InvalidRow, self.InvalidColumn):
+                continue
+
+        touched = [
+            positions[index] for index in previous | wells.keys() if index in positions
+        ]
+        sample_markers = {
+            p.sample_marker.id: p.sample_marker for p in touched if p.sample_marker
+        }
+        analysed: set[int] = set()
+        outputted: set[int] = set()
+        for index, index_wells in wells.items():
+            sample_marker_id = positions[index].sample_marker_id
+            analysed.add(sample_marker_id)
+            if any(well.has_output for well in index_wells):
+                outputted.add(sample_marker_id)
+        other_analysed, other_outputted = self.other_plate_results(
+            sample_markers.keys() - outputted
+        )
+        for sample_marker_id, sample_marker in sample_markers.items():
+            sample_marker.is_analysed = (
+                sample_marker_id in analysed or sample_marker_id in other_analysed
+            )
+            sample_marker.is_outputted = (
+                sample_marker_id in outputted or sample_marker_id in other_outputted
+            )
+        for position in touched:
+            position.is_invalid = any(
+                well.failed for well in wells.get(position.position, [])
+            )
+
+        SampleMarkerAnalysis.objects.bulk_update(
+            sample_markers.values(), ["is_analysed", "is_outputted"]
+        )
+        PlatePosition.objects.bulk_update(touched, ["is_invalid"])
+
+        return touched
+
+    @transaction.atomic
+    def ingest_result_file(self) -> dict[str, Any]:
+        """Apply the uploaded result file to the plate's sample markers.
+
+        The file is streamed row by row; rows of other plates (multi-plate
+        files) are skipped. Wells with a result mark their sample marker as
+        analysed and outputted, failed wells mark the position as invalid.
+        Only the wells of the file and the wells of the previous file of the
+        plate are updated, so a file replaces the results of the previous one
+        but keeps the flags set by hand on the other wells. A sample marker
+        keeps the results it has on other plates.
+        The parsed values are stored per well in `extra["results"]`.
+
+        Returns:
+            A summary with the number of wells read, updated and skipped,
+            and the wells whose marker column (case-insensitive) is not the
+            marker of the position.
+
+        Raises:
+            InvalidResultFile: If there is no result file or it cannot be parsed.
+        """
+        if not self.result_file:
+            msg = f"Plate {self} has no result file"
+            raise self.InvalidResultFile(msg)
+
+        positions = {
+            p.position: p
+            for p in self.positions.select_for_update().select_related("sample_marker")
+        }
+        results: dict[str, list[dict[str, str]]] = {}
+        wells: dict[int, list[WellResult]] = {}
+        skipped: list[str] = []
+        marker_mismatches: list[str] = []
+
+        try:
+            with (
+                self.result_file.open("rb") as raw,
+                io.TextIOWrapper(raw, encoding="utf-8-sig", newline="") as file,
+            ):
+                for well in parse_result_file(file):
+                    if not self.matches_result_label(well.plate):
+                        continue
+
+                    try:
+                        index = self.coordinates_to_position(well.coordinate)
+                    except (self.InvalidRow, self.InvalidColumn):
+                        skipped.append(well.coordinate)
+                        continue
+
+                    position = positions.get(index)
+                    sample_marker = position.sample_marker if position else None
+                    if position is None or sample_marker is None:
+                        skipped.append(well.coordinate)
+                        continue
+                    if (
+                        well.marker
+                        and well.marker.casefold() != sample_marker.marker_id.casefold()
+                    ):
+                        marker_mismatches.append(well.coordinate)
+                        continue
+
+                    results.setdefault(well.coordinate, []).append(well.values)
+                    wells.setdefault(index, []).append(well)
+        except (ResultFileError, UnicodeDecodeError) as e:
+            msg = f"Cannot read the result file of plate {self}: {e}"
+            raise self.InvalidResultFile(msg) from e
+
+        touched = self.apply_well_results(positions, wells)
+
+        self.extra = {**(self.extra or {}), "results": results}
+        self.save(update_fields=["extra"])
+
+        return {
+            "wells": len(results),
+            "sample_markers": len(
+                {positions[index].sample_marker_id for index in wells}
+            ),
+            "invalid_positions": sum(position.is_invalid for position in touched),
+            "skipped": skipped,
+            "marker_mismatches": marker_mismatches,
+        }
+
     def add_sample_markers(
         self, sample_marker_ids: list[int]
     ) -> list[dict[str, int | str]]:
@@ -1671,6 +2334,14 @@ class AnalysisPlate(Plate):
 
         return target_positions
 
+    @traced(
+        "analysis_plate.add_sample_markers_with_replicas",
+        lambda self, sample_marker_ids, replicates=1: {
+            "plate_id": self.pk,
+            "sample_count": len(sample_marker_ids),
+            "replicates": replicates,
+        },
+    )
     def add_sample_markers_with_replicas(
         self: Self, sample_marker_ids: list[int], replicates: int = 1
     ) -> list[dict[str, int | str]]:
@@ -1768,6 +2439,7 @@ class AnalysisPlate(Plate):
 
         return added
 
+    @traced("analysis_plate.clone", lambda self: {"plate_id": self.pk})
     @transaction.atomic
     def clone(self: "AnalysisPlate") -> "AnalysisPlate":
         """Clone plate with same name, markers, and filled positions.
@@ -1827,6 +2499,9 @@ class AnalysisPlate(Plate):
                 fields=["sample_marker", "is_reserved", "positive_control", "notes"],
             )
 
+        current_span().set(
+            new_plate_id=new_plate.pk, position_count=len(source_positions)
+        )
         return new_plate
 
     class Meta:
@@ -1893,6 +2568,9 @@ class PlatePosition(AdminUrlsMixin, LifecycleModelMixin, models.Model):
         output_field=models.BooleanField(),
         db_persist=True,
     )
+    # Id of the last transaction that changed the row, set by a trigger
+    # (see the ``since`` parameter of the list APIs in ``staff.sync``)
+    change_xid = models.BigIntegerField(default=0, editable=False)
 
     class Meta:
         constraints = [
@@ -1937,6 +2615,15 @@ class PlatePosition(AdminUrlsMixin, LifecycleModelMixin, models.Model):
                 name="position_in_plate_value_range",
             ),
         ]
+        indexes = [
+            # free positions of a plate, used by Plate.populate
+            models.Index(
+                fields=["plate", "position"],
+                condition=Q(is_full=False),
+                name="position_plate_free_idx",
+            ),
+            models.Index(fields=["change_xid"], name="position_change_xid_idx"),
+        ]
 
     class NoSampleMarkerToMove(Exception):
         """Raised when trying to move from a position with no sample marker."""
@@ -1968,13 +2655,18 @@ class PlatePosition(AdminUrlsMixin, LifecycleModelMixin, models.Model):
     def position_to_coordinates(self) -> str:
         """
         Return the plate coordinate of this position (e.g., A1, B2, etc.)
+        """
+        return self.index_to_coordinates(self.position)
+
+    @staticmethod
+    def index_to_coordinates(position: int) -> str:
+        """
+        Return the plate coordinate of a position index.
         Uses column-wise filling: A1=0, B1=1, C1=2..., H1=7, A2=8, B2=9...
         """
-        row_label = Plate.ROWS[
-            self.position % len(Plate.ROWS)
-        ]  # 8 rows, so position % 8
+        row_label = Plate.ROWS[position % len(Plate.ROWS)]  # 8 rows, so position % 8
         column_label = (
-            self.position // len(Plate.ROWS)
+            position // len(Plate.ROWS)
         ) + 1  # Every 8 positions moves to next column
         return f"{row_label}{column_label}"
 
@@ -2035,3 +2727,88 @@ class PlatePosition(AdminUrlsMixin, LifecycleModelMixin, models.Model):
             self.filled_at = None
 
         self.save(update_fields=["filled_at"])
+        events.publish(
+            f"plate:{self.plate_id}",
+            "position",
+            id=self.pk,
+            plate=self.plate_id,
+            position=self.position,
+            filled_at=self.filled_at,
+        )
+
+
+class SearchEntry(models.Model):
+    """
+    Row of the staff search index.
+
+    Each sample, order, plate and project has an entry with the identifiers
+    it can be looked up by (``keys``, upper-cased) and the text matched by
+    the fuzzy search (``text``, upper-cased). Entries are refreshed after
+    commit by the write paths of the indexed models (see ``search.py``) and
+    rebuilt with the ``rebuild_search_index`` command.
+    """
+
+    class Kind(models.TextChoices):
+        SAMPLE = "sample", _("Sample")
+        ORDER = "order", _("Order")
+        EXTRACTION_PLATE = "extraction_plate", _("Extraction plate")
+        ANALYSIS_PLATE = "analysis_plate", _("Analysis plate")
+        PROJECT = "project", _("Project")
+
+    kind = models.CharField(choices=Kind)
+    object_id = models.CharField()
+    title = models.CharField()
+    description = models.CharField(blank=True)
+    url = models.CharField()
+    keys = ArrayField(models.CharField(), default=list)
+    text = models.TextField()
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    objects = managers.SearchEntryQuerySet.as_manager()
+
+    class Meta:
+        verbose_name_plural = "Search entries"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "object_id"], name="unique_search_entry"
+            )
+        ]
+        indexes = [
+            GinIndex(fields=["keys"], name="search_entry_keys_idx"),
+            GinIndex(
+                OpClass("text", name="gin_trgm_ops"),
+                name="search_entry_text_trgm_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.get_kind_display()} {self.title}"
+
+
+class DeletedRow(models.Model):
+    """
+    Tombstone of a row deleted from a table synced incrementally
+    (see ``staff.sync``), written by a trigger and pruned with the
+    ``prune_deleted_rows`` command.
+    """
+
+    table_name = models.CharField()
+    object_id = models.CharField()
+    # the order of a sample marker, the plate of a position
+    parent_id = models.CharField(null=True, blank=True)
+    change_xid = models.BigIntegerField()
+    deleted_at = models.DateTimeField(db_default=Now())
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["table_name", "change_xid"], name="deleted_row_xid_idx"
+            ),
+            models.Index(
+                fields=["table_name", "parent_id", "change_xid"],
+                name="deleted_row_parent_xid_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.table_name} {self.object_id}"
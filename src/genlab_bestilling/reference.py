@@ -0,0 +1,186 @@
+"""
+Reference data bundle: the species, markers, sample and analysis types,
+isolation methods and locations the forms and React apps need, in one
+payload per area.
+
+Each table is sent as ``{"fields": [...], "rows": [[...], ...]}``. A bundle
+is identified by the hash of its content and the pages embed its URL with
+that version (``reference_bundle_url``), so that browsers cache it for good
+and only fetch it again once the reference data changed.
+
+Bundles are cached by the last value of a sequence, which triggers bump
+when a transaction writing the reference tables commits.
+"""
+
+import hashlib
+import json
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q
+from django.urls import reverse
+
+from .models import (
+    AnalysisType,
+    IsolationMethod,
+    Location,
+    LocationType,
+    Marker,
+    SampleType,
+    Species,
+)
+
+
+@dataclass(frozen=True)
+class ReferenceBundle:
+    version: str
+    content: bytes
+
+
+def table(fields: tuple[str, ...], rows: list[list[Any]]) -> dict[str, Any]:
+    return {"fields": fields, "rows": rows}
+
+
+def group_pairs(pairs: Any) -> dict[Any, list[Any]]:
+    groups = defaultdict(list)
+    for key, value in pairs:
+        groups[key].append(value)
+    return groups
+
+
+def get_data_version() -> int:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT CASE WHEN is_called THEN last_value ELSE 0 END "
+            "FROM genlab_bestilling_reference_version_seq"
+        )
+        (version,) = cursor.fetchone()
+    return version
+
+
+def get_locations(location_type_ids: set[int]) -> list[list[Any]] | None:
+    """
+    Rows of the locations of the given types, or None when there are
+    more than ``REFERENCE_BUNDLE_MAX_LOCATIONS`` of them.
+    """
+    locations = Location.objects.filter_types(
+        Q(locationtype__in=location_type_ids)
+    ).order_by("name", "pk")
+    if locations.count() > settings.REFERENCE_BUNDLE_MAX_LOCATIONS:
+        return None
+
+    rows = list(locations.values_list("id", "name", "river_id"))
+    types = group_pairs(
+        Location.types.through.objects.filter(location_id__in=[row[0] for row in rows])
+        .order_by("locationtype_id")
+        .values_list("location_id", "locationtype_id")
+    )
+    return [[*row, types[row[0]]] for row in rows]
+
+
+def build_bundle_data(area_id: int | None) -> dict[str, Any]:
+    species = Species.objects.order_by("name", "pk")
+    sample_types = SampleType.objects.order_by("name", "pk")
+    markers = Marker.objects.order_by("name")
+    if area_id is not None:
+        species = species.filter(area_id=area_id)
+        sample_types = sample_types.filter(areas=area_id)
+        markers = markers.filter(species__in=species).distinct()
+
+    species_rows = list(species.values_list("id", "name", "location_type_id"))
+    species_markers = group_pairs(
+        Species.markers.through.objects.filter(
+            species_id__in=[row[0] for row in species_rows]
+        )
+        .order_by("marker_id")
+        .values_list("species_id", "marker_id")
+    )
+    method_sample_types = group_pairs(
+        IsolationMethod.sample_types.through.objects.order_by(
+            "sampletype_id"
+        ).values_list("isolationmethod_id", "sampletype_id")
+    )
+    location_type_ids = {row[2] for row in species_rows if row[2] is not None}
+    locations = get_locations(location_type_ids)
+
+    return {
+        "species": table(
+            ("id", "name", "location_type", "markers"),
+            [[*row, species_markers[row[0]]] for row in species_rows],
+        ),
+        "markers": table(
+            ("id", "analysis_type"),
+            [list(row) for row in markers.values_list("name", "analysis_type_id")],
+        ),
+        "sample_types": table(
+            ("id", "name"),
+            [list(row) for row in sample_types.values_list("id", "name")],
+        ),
+        "analysis_types": table(
+            ("id", "name"),
+            [
+                list(row)
+                for row in AnalysisType.objects.order_by("name", "pk").values_list(
+                    "id", "name"
+                )
+            ],
+        ),
+        "isolation_methods": table(
+            ("id", "name", "sample_types"),
+            [
+                [pk, name, method_sample_types[pk]]
+                for pk, name in IsolationMethod.objects.order_by(
+                    "name", "pk"
+                ).values_list("id", "name")
+            ],
+        ),
+        "location_types": table(
+            ("id", "name"),
+            [
+                list(row)
+                for row in LocationType.objects.filter(pk__in=location_type_ids)
+                .order_by("name", "pk")
+                .values_list("id", "name")
+            ],
+        ),
+        # None when there are too many, see REFERENCE_BUNDLE_MAX_LOCATIONS
+        "locations": None
+        if locations is None
+        else table(("id", "name", "river_id", "types"), locations),
+    }
+
+
+def build_bundle(area_id: int | None) -> ReferenceBundle:
+    content = json.dumps(
+        build_bundle_data(area_id), separators=(",", ":"), ensure_ascii=False
+    ).encode()
+    return ReferenceBundle(
+        version=hashlib.sha256(content).hexdigest()[:16], content=content
+    )
+
+
+def get_bundle(area_id: int | None = None) -> ReferenceBundle:
+    """
+    Reference data of an area, or of all the areas when ``area_id`` is None.
+    """
+    # read before the data: a bundle built from newer data than its key
+    # is rebuilt with the next version, never served for an older one
+    key = f"reference-bundle:{area_id or 'all'}:{get_data_version()}"
+    bundle = cache.get(key)
+    if bundle is None:
+        bundle = build_bundle(area_id)
+        cache.set(key, bundle, settings.REFERENCE_BUNDLE_CACHE_TIMEOUT)
+    return bundle
+
+
+def reference_bundle_url(area_id: int | None = None) -> str:
+    """URL of the current bundle of an area, to embed in the pages."""
+    query: dict[str, Any] = {"v": get_bundle(area_id).version}
+    if area_id is not None:
+        query["area"] = area_id
+    return f"{reverse('reference-bundle')}?{urlencode(query)}"
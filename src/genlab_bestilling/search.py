@@ -0,0 +1,275 @@
+"""
+Staff search over samples, orders, plates and projects.
+
+Searches only read the ``SearchEntry`` index. A term that looks like an
+identifier (genlab id, GUID, ``#ORD_12``/``#EXT_12``/``#ANL_12``, ``#Q12``,
+``#A12``, project number) is looked up exactly, and when nothing has that
+identifier the term is matched by trigram similarity instead.
+"""
+
+import itertools
+import re
+from collections.abc import Collection, Iterator
+from dataclasses import dataclass, field
+
+from django.db import OperationalError, transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from nina.models import Project
+from shared.db import is_query_canceled, statement_timeout
+from shared.tracing import current_span, traced
+
+from .models import AnalysisPlate, ExtractionPlate, OrderListing, Sample, SearchEntry
+
+Kind = SearchEntry.Kind
+
+MAX_RESULTS = 20
+MIN_FUZZY_LENGTH = 3
+STATEMENT_TIMEOUT_MS = 300
+BATCH_SIZE = 1000
+
+ORDER_ID_RE = re.compile(r"^(?:ORD|EXT|ANA|ANL|EQU|EQP)_(\d+)$")
+
+
+def exact_keys(term: str) -> list[str]:
+    """The index keys that an identifier typed by the staff can stand for."""
+    key = term.strip().lstrip("#").upper()
+    if not key:
+        return []
+    keys = {key}
+    if match := ORDER_ID_RE.match(key):
+        keys.add(f"ORD_{match[1]}")
+    elif key.isdigit():
+        keys.update({f"ORD_{key}", f"Q{key}", f"A{key}"})
+    return sorted(keys)
+
+
+@dataclass
+class SearchResults:
+    query: str
+    entries: list[SearchEntry] = field(default_factory=list)
+    # the entries have the identifier that was searched for
+    exact: bool = False
+    timed_out: bool = False
+
+
+@traced("search", lambda term, *args, **kwargs: {"term_length": len(term)})
+def search(term: str, limit: int = MAX_RESULTS) -> SearchResults:
+    """
+    Search the index within STATEMENT_TIMEOUT_MS,
+    an empty result is returned when the budget is exceeded.
+    """
+    results = SearchResults(query=term.strip())
+    if not results.query:
+        return results
+
+    try:
+        with transaction.atomic(), statement_timeout(STATEMENT_TIMEOUT_MS):
+            results.entries = list(
+                SearchEntry.objects.filter_by_keys(exact_keys(results.query)).order_by(
+                    "kind", "title"
+                )[:limit]
+            )
+            results.exact = bool(results.entries)
+            if not results.exact and len(results.query) >= MIN_FUZZY_LENGTH:
+                results.entries = list(
+                    SearchEntry.objects.filter_by_text(results.query)[:limit]
+                )
+    except OperationalError as e:
+        if not is_query_canceled(e):
+            raise
+        results.entries = []
+        results.timed_out = True
+
+    current_span().set(
+        result_count=len(results.entries),
+        exact=results.exact,
+        timed_out=results.timed_out,
+    )
+    return results
+
+
+def _text(*values: object) -> str:
+    return " ".join(str(value) for value in values if value).upper()
+
+
+def _keys(*values: str | None) -> list[str]:
+    return sorted({value.upper() for value in values if value})
+
+
+def sample_entries(object_ids: Collection[str] | None) -> Iterator[SearchEntry]:
+    samples = Sample.objects.order_by()
+    if object_ids is not None:
+        samples = samples.filter(pk__in=[int(pk) for pk in object_ids])
+    rows = samples.values_list(
+        "id",
+        "genlab_id",
+        "guid",
+        "name",
+        "fish_id",
+        "bird_id",
+        "order_id",
+        "species__name",
+        "location__name",
+    )
+    for (
+        pk,
+        genlab_id,
+        guid,
+        name,
+        fish_id,
+        bird_id,
+        order_id,
+        species,
+        location,
+    ) in rows.iterator(chunk_size=BATCH_SIZE):
+        title = genlab_id or name or f"Sample {pk}"
+        yield SearchEntry(
+            kind=Kind.SAMPLE,
+            object_id=str(pk),
+            title=title,
+            description=", ".join(
+                filter(None, [species, location, order_id and f"#ORD_{order_id}"])
+            ),
+            url=reverse("staff:samples-detail", kwargs={"pk": pk}),
+            keys=_keys(genlab_id, guid, fish_id, bird_id),
+            text=_text(genlab_id, guid, name, species, location),
+        )
+
+
+def order_entries(object_ids: Collection[str] | None) -> Iterator[SearchEntry]:
+    # the listing has the columns of the subclasses without polymorphic fetches
+    orders = OrderListing.objects.filter(order_type__isnull=False).order_by()
+    if object_ids is not None:
+        orders = orders.filter(pk__in=[int(pk) for pk in object_ids])
+    orders = orders.select_related("genrequest").only(
+        "id",
+        "order_type",
+        "name",
+        "species_list",
+        "genrequest__name",
+        "genrequest__project_id",
+    )
+    for order in orders.iterator(chunk_size=BATCH_SIZE):
+        yield SearchEntry(
+            kind=Kind.ORDER,
+            object_id=str(order.id),
+            title=str(order),
+            description=", ".join(
+                filter(None, [order.name, order.genrequest.project_id])
+            ),
+            url=order.get_absolute_staff_url(),
+            keys=[f"ORD_{order.id}"],
+            text=_text(
+                order,
+                order.name,
+                order.genrequest.name,
+                order.genrequest.project_id,
+                order.species_list,
+            ),
+        )
+
+
+def extraction_plate_entries(
+    object_ids: Collection[str] | None,
+) -> Iterator[SearchEntry]:
+    plates = ExtractionPlate.objects.non_polymorphic().order_by()
+    if object_ids is not None:
+        plates = plates.filter(pk__in=object_ids)
+    for pk, qiagen_id in plates.values_list("id", "qiagen_id").iterator(
+        chunk_size=BATCH_SIZE
+    ):
+        yield SearchEntry(
+            kind=Kind.EXTRACTION_PLATE,
+            object_id=str(pk),
+            title=f"#Q{qiagen_id}",
+            url=reverse("staff:extraction-plates-detail", kwargs={"pk": pk}),
+            keys=[f"Q{qiagen_id}"],
+            text=_text(f"#Q{qiagen_id}"),
+        )
+
+
+def analysis_plate_entries(
+    object_ids: Collection[str] | None,
+) -> Iterator[SearchEntry]:
+    plates = AnalysisPlate.objects.non_polymorphic().order_by()
+    if object_ids is not None:
+        plates = plates.filter(pk__in=object_ids)
+    for pk, analysis_number, name in plates.values_list(
+        "id", "analysis_number", "name"
+    ).iterator(chunk_size=BATCH_SIZE):
+        yield SearchEntry(
+            kind=Kind.ANALYSIS_PLATE,
+            object_id=str(pk),
+            title=f"#A{analysis_number}",
+            description=name or "",
+            url=reverse("staff:analysis-plates-detail", kwargs={"pk": pk}),
+            keys=[f"A{analysis_number}"],
+            text=_text(f"#A{analysis_number}", name),
+        )
+
+
+def project_entries(object_ids: Collection[str] | None) -> Iterator[SearchEntry]:
+    projects = Project.objects.order_by()
+    if object_ids is not None:
+        projects = projects.filter(pk__in=object_ids)
+    for number, name in projects.values_list("number", "name").iterator(
+        chunk_size=BATCH_SIZE
+    ):
+        yield SearchEntry(
+            kind=Kind.PROJECT,
+            object_id=number,
+            title=number,
+            description=name or "",
+            url=reverse("staff:projects-detail", kwargs={"pk": number}),
+            keys=_keys(number),
+            text=_text(number, name),
+        )
+
+
+ENTRY_BUILDERS = {
+    Kind.SAMPLE: sample_entries,
+    Kind.ORDER: order_entries,
+    Kind.EXTRACTION_PLATE: extraction_plate_entries,
+    Kind.ANALYSIS_PLATE: analysis_plate_entries,
+    Kind.PROJECT: project_entries,
+}
+
+
+@traced(
+    "search.refresh_index",
+    lambda kind, object_ids=None: {
+        "kind": kind,
+        "object_count": "all" if object_ids is None else len(object_ids),
+    },
+)
+def refresh_search_index(kind: str, object_ids: Collection[str] | None = None) -> int:
+    """
+    Rebuild the entries of the given objects of a kind (all if object_ids
+    is None) and drop the ones of objects that no longer exist.
+    Return the number of entries written.
+    """
+    started = timezone.now()
+    count = 0
+    for batch in itertools.batched(ENTRY_BUILDERS[kind](object_ids), BATCH_SIZE):
+        SearchEntry.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=["kind", "object_id"],
+            update_fields=[
+                "title",
+                "description",
+                "url",
+                "keys",
+                "text",
+                "refreshed_at",
+            ],
+        )
+        count += len(batch)
+
+    stale = SearchEntry.objects.filter(kind=kind, refreshed_at__lt=started)
+    if object_ids is not None:
+        stale = stale.filter(object_id__in=object_ids)
+    stale.delete()
+    return count
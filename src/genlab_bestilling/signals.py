@@ -0,0 +1,164 @@
+from typing import Any
+
+from django.db import close_old_connections
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.tasks.signals import task_finished, task_started
+
+from nina.models import Project
+
+from .managers import (
+    SAMPLE_MARKER_STATISTICS_FIELDS,
+    SAMPLE_PROGRESS_FIELDS,
+    SAMPLE_SEARCH_FIELDS,
+    schedule_sample_progress_refresh,
+    schedule_search_index_refresh,
+    schedule_statistics_refresh,
+)
+from .models import (
+    AnalysisOrder,
+    AnalysisPlate,
+    EquipmentOrder,
+    ExtractionOrder,
+    ExtractionPlate,
+    Genrequest,
+    Location,
+    Order,
+    Sample,
+    SampleMarkerAnalysis,
+    SearchEntry,
+)
+
+# Tasks run outside of the request cycle, so the request_started/finished
+# handlers never fire: mirror them around each task so that stale or
+# broken connections are dropped and pooled ones are handed back.
+task_started.connect(close_old_connections)
+task_finished.connect(close_old_connections)
+
+
+@receiver(post_save, sender=Location)
+def refresh_location_fish_ids(
+    sender: type[Location], instance: Location, created: bool, **kwargs: Any
+) -> None:
+    # the fish id of a sample embeds the code of its location
+    if not created:
+        Sample.objects.filter(location=instance).refresh_fish_ids()
+
+
+@receiver(post_save, sender=Sample)
+def refresh_saved_sample_progress(
+    sender: type[Sample],
+    instance: Sample,
+    created: bool,
+    update_fields: frozenset[str] | None,
+    **kwargs: Any,
+) -> None:
+    if created or update_fields is None or SAMPLE_PROGRESS_FIELDS & update_fields:
+        schedule_sample_progress_refresh([instance.order_id])
+
+
+@receiver(post_delete, sender=Sample)
+def refresh_deleted_sample_progress(
+    sender: type[Sample], instance: Sample, **kwargs: Any
+) -> None:
+    schedule_sample_progress_refresh([instance.order_id])
+
+
+@receiver(post_save, sender=Sample)
+def refresh_saved_sample_search_entry(
+    sender: type[Sample],
+    instance: Sample,
+    created: bool,
+    update_fields: frozenset[str] | None,
+    **kwargs: Any,
+) -> None:
+    if created or update_fields is None or SAMPLE_SEARCH_FIELDS & update_fields:
+        schedule_search_index_refresh(SearchEntry.Kind.SAMPLE, [instance.pk])
+
+
+@receiver(post_delete, sender=Sample)
+def refresh_deleted_sample_search_entry(
+    sender: type[Sample], instance: Sample, **kwargs: Any
+) -> None:
+    schedule_search_index_refresh(SearchEntry.Kind.SAMPLE, [instance.pk])
+
+
+# post_save and post_delete are sent with the concrete class of the instance
+@receiver([post_save, post_delete], sender=AnalysisOrder)
+@receiver([post_save, post_delete], sender=EquipmentOrder)
+@receiver([post_save, post_delete], sender=ExtractionOrder)
+def refresh_order_search_entry(
+    sender: type[Order], instance: Order, **kwargs: Any
+) -> None:
+    schedule_search_index_refresh(SearchEntry.Kind.ORDER, [instance.pk])
+
+
+@receiver([post_save, post_delete], sender=AnalysisOrder)
+@receiver([post_save, post_delete], sender=EquipmentOrder)
+@receiver([post_save, post_delete], sender=ExtractionOrder)
+def refresh_order_statistics(
+    sender: type[Order], instance: Order, **kwargs: Any
+) -> None:
+    schedule_statistics_refresh(genrequest_ids=[instance.genrequest_id])
+
+
+@receiver(post_save, sender=SampleMarkerAnalysis)
+def refresh_saved_sample_marker_statistics(
+    sender: type[SampleMarkerAnalysis],
+    instance: SampleMarkerAnalysis,
+    update_fields: frozenset[str] | None,
+    **kwargs: Any,
+) -> None:
+    if update_fields is None or SAMPLE_MARKER_STATISTICS_FIELDS & update_fields:
+        schedule_statistics_refresh(order_ids=[instance.order_id])
+
+
+@receiver(post_delete, sender=SampleMarkerAnalysis)
+def refresh_deleted_sample_marker_statistics(
+    sender: type[SampleMarkerAnalysis], instance: SampleMarkerAnalysis, **kwargs: Any
+) -> None:
+    schedule_statistics_refresh(order_ids=[instance.order_id])
+
+
+@receiver(post_save, sender=Genrequest)
+def refresh_saved_genrequest_statistics(
+    sender: type[Genrequest], instance: Genrequest, **kwargs: Any
+) -> None:
+    schedule_statistics_refresh(genrequest_ids=[instance.pk])
+
+
+@receiver(post_delete, sender=Genrequest)
+def refresh_deleted_genrequest_statistics(
+    sender: type[Genrequest], instance: Genrequest, **kwargs: Any
+) -> None:
+    # the statistics of the genrequest are deleted with it
+    schedule_statistics_refresh(project_ids=[instance.project_id])
+
+
+@receiver(post_save, sender=Project)
+def refresh_project_statistics(
+    sender: type[Project], instance: Project, created: bool, **kwargs: Any
+) -> None:
+    if created:
+        schedule_statistics_refresh(project_ids=[instance.pk])
+
+
+@receiver([post_save, post_delete], sender=ExtractionPlate)
+def refresh_extraction_plate_search_entry(
+    sender: type[ExtractionPlate], instance: ExtractionPlate, **kwargs: Any
+) -> None:
+    schedule_search_index_refresh(SearchEntry.Kind.EXTRACTION_PLATE, [instance.pk])
+
+
+@receiver([post_save, post_delete], sender=AnalysisPlate)
+def refresh_analysis_plate_search_entry(
+    sender: type[AnalysisPlate], instance: AnalysisPlate, **kwargs: Any
+) -> None:
+    schedule_search_index_refresh(SearchEntry.Kind.ANALYSIS_PLATE, [instance.pk])
+
+
+@receiver([post_save, post_delete], sender=Project)
+def refresh_project_search_entry(
+    sender: type[Project], instance: Project, **kwargs: Any
+) -> None:
+    schedule_search_index_refresh(SearchEntry.Kind.PROJECT, [instance.pk])
@@ -10,6 +10,7 @@ from .models import (
     ExtractionOrder,
     Genrequest,
     Order,
+    OrderListing,
     Sample,
 )
 
@@ -37,15 +38,15 @@ class BaseOrderTable(tables.Table):
 
 
 class OrderTable(BaseOrderTable):
-    polymorphic_ctype = tables.Column(verbose_name="Type")
+    order_type = tables.Column(verbose_name="Type")
     genrequest = tables.Column(linkify=True)
 
     class Meta:
-        model = Order
+        model = OrderListing
         fields = (
             "name",
             "status",
-            "polymorphic_ctype",
+            "order_type",
             "genrequest",
             "genrequest__project",
             "created_at",
@@ -55,13 +56,10 @@ class OrderTable(BaseOrderTable):
             "id",
             "name",
             "status",
-            "polymorphic_ctype",
+            "order_type",
         )
         empty_text = "No Orders"
 
-    def render_polymorphic_ctype(self, value: Any) -> str:
-        return value.name
-
     def render_id(self, record: Any) -> str:
         return str(record)
 
@@ -70,6 +68,8 @@ class GenrequestTable(tables.Table):
     id = tables.Column(linkify=True, orderable=False, empty_values=())
     project_id = tables.Column(linkify=True)
     is_archived = tables.Column(verbose_name="Status", orderable=False)
+    statistics__orders_total = tables.Column(verbose_name="Orders", orderable=False)
+    statistics__samples = tables.Column(verbose_name="Samples", orderable=False)
 
     class Meta:
         model = Genrequest
@@ -83,6 +83,8 @@ class GenrequestTable(tables.Table):
             "expected_total_samples",
             "expected_samples_delivery_date",
             "expected_analysis_delivery_date",
+            "statistics__orders_total",
+            "statistics__samples",
         )
         sequence = (
             "id",
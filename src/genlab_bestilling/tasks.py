@@ -1,12 +1,75 @@
-from django.db import close_old_connections
+import contextlib
+import tempfile
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import storages
+from django.http import QueryDict
 from django.tasks import task
+from django.utils import timezone
 
-from .models import ExtractionPlate
+from .api.constants import SAMPLE_CSV_FIELDS_BY_AREA
+from .api.serializers import SampleCSVSerializer
+from .api.xlsx import SampleXLSXExporter
+from .filters import SampleFilter
+from .models import ExtractionPlate, Sample
 
 
 @task
 def isolate_all_samples(
     plate_id: str,
 ) -> None:
-    close_old_connections()
     ExtractionPlate.objects.get(pk=plate_id).deferred_isolate_all_samples()
+
+
+@task
+def export_samples_xlsx(
+    user_id: int,
+    params: dict[str, list[str]],
+    filename: str,
+) -> str:
+    """
+    Write the sample sheet matching the SampleFilter ``params`` to the
+    exports storage and return the path of the file.
+    """
+    data = QueryDict(mutable=True)
+    for key, values in params.items():
+        data.setlist(key, values)
+    queryset = SampleFilter(
+        data,
+        queryset=Sample.objects.with_sheet_data().order_by("genlab_id", "type"),
+    ).qs
+
+    exporter = SampleXLSXExporter(SampleCSVSerializer, SAMPLE_CSV_FIELDS_BY_AREA)
+    with tempfile.TemporaryFile() as file:
+        exporter.write(queryset, file)
+        file.seek(0)
+        return storages["exports"].save(
+            f"exports/{user_id}/{uuid.uuid4()}/{filename}", File(file)
+        )
+
+
+def prune_exports() -> int:
+    """
+    Delete the exports older than DIRECT_TRANSFER_EXPIRY, their download
+    urls are expired by then. Return the number of files deleted.
+    """
+    storage = storages["exports"]
+    cutoff = timezone.now() - timedelta(seconds=settings.DIRECT_TRANSFER_EXPIRY)
+    users: list[str] = []
+    with contextlib.suppress(FileNotFoundError):
+        users, _ = storage.listdir("exports")
+
+    deleted = 0
+    for user in users:
+        exports, _ = storage.listdir(f"exports/{user}")
+        for export in exports:
+            _, files = storage.listdir(f"exports/{user}/{export}")
+            for name in files:
+                path = f"exports/{user}/{export}/{name}"
+                if storage.get_modified_time(path) < cutoff:
+                    storage.delete(path)
+                    deleted += 1
+    return deleted
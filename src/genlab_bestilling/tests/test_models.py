@@ -1,26 +1,39 @@
+import asyncio
 import itertools
 import uuid
 
 import pytest
 from django.core import mail
 from django.core.files.base import ContentFile
+from django.core.management import call_command
 from django.db import IntegrityError, transaction
 from django.utils import timezone
 from pytest_django.asserts import assertQuerySetEqual
 
+from capps.users.models import User
 from genlab_bestilling.models import (
     AnalysisOrder,
     AnalysisPlate,
     AnalysisType,
     ExtractionOrder,
     ExtractionPlate,
+    Genrequest,
+    GenrequestStatistics,
     GIDSequence,
+    Location,
     Marker,
+    OrderListing,
+    OrderSampleProgress,
     PlatePosition,
     PositiveControl,
+    ProjectStatistics,
     Sample,
     SampleMarkerAnalysis,
+    SearchEntry,
 )
+from genlab_bestilling.search import search
+from nina.models import Project, ProjectMembership
+from shared import events
 
 
 def test_analysis_populate_without_order(genlab_setup):
@@ -67,6 +80,32 @@ def test_analysis_populate_with_order_all_markers(extraction):
     assert ao.sample_markers.count() == 6
 
 
+def test_order_listing_flattens_orders(extraction):
+    ao = AnalysisOrder.objects.create(genrequest_id=1, from_order=extraction)
+    ao.markers.add(Marker.objects.get(name="Elvemusling A"))
+    ao.populate_from_order()
+
+    extraction_row = OrderListing.objects.get(id=extraction.id)
+    assert extraction_row.order_type == OrderListing.OrderType.EXTRACTION
+    assert str(extraction_row) == str(extraction)
+    assert extraction_row.get_absolute_staff_url() == (
+        extraction.get_absolute_staff_url()
+    )
+    assert extraction_row.sample_count == extraction.samples.count()
+    assert extraction_row.isolated_sample_count == 0
+    assert set(extraction_row.species_list.split(", ")) == set(
+        extraction.species.values_list("name", flat=True)
+    )
+
+    analysis_row = OrderListing.objects.get(id=ao.id)
+    assert analysis_row.order_type == OrderListing.OrderType.ANALYSIS
+    assert str(analysis_row) == str(ao)
+    assert analysis_row.from_order_id == extraction.id
+    assert analysis_row.sample_count == ao.sample_markers.count()
+    assert analysis_row.markers_list == "Elvemusling A"
+    assert analysis_row.responsible_staff_ids == []
+
+
 def test_gid_sequence_for_species_year(extraction):
     extraction.confirm_order()
     assert GIDSequence.objects.exists() is False
@@ -160,6 +199,53 @@ def test_sample_genlab_id_generation(extraction):
         )
 
 
+def test_sample_stored_sort_and_search_keys(extraction):
+    location = Location.objects.create(name="Test river", code="TR")
+    sample = extraction.samples.first()
+    sample.name = "42"
+    sample.year = 2024
+    sample.location = location
+    sample.genlab_id = "G24ABC00123-2"
+    sample.is_marked = True
+    sample.save()
+
+    sample.refresh_from_db()
+    assert sample.name_as_int == 42
+    assert sample.status_rank == Sample.StatusRank.MARKED
+    assert sample.bird_id == "ABC123-2"
+    assert sample.fish_id == "TR_24_0042"
+
+    # renaming the location code refreshes the stored fish id
+    location.code = "TX"
+    location.save()
+    sample.refresh_from_db()
+    assert sample.fish_id == "TX_24_0042"
+
+    # and so do the bulk write paths
+    Sample.objects.filter(pk=sample.pk).update(name="7")
+    sample.refresh_from_db()
+    assert sample.fish_id == "TX_24_0007"
+
+    sample.year = 2025
+    Sample.objects.bulk_update([sample], ["year"])
+    sample.refresh_from_db()
+    assert sample.fish_id == "TX_25_0007"
+
+    (created,) = Sample.objects.bulk_create(
+        [
+            Sample(
+                order=extraction,
+                species=sample.species,
+                type=sample.type,
+                name="8",
+                year=2024,
+                location=location,
+            )
+        ]
+    )
+    assert Sample.objects.get(pk=created.pk).fish_id == "TX_24_0008"
+
+
 def test_full_order_ids_generation(extraction):
     """
     Test that by default all the ids are generated
@@ -1138,3 +1224,316 @@ def test_analysis_plate_clone_does_not_copy_result_file(genlab_setup):
 
     # Clean up
     plate.result_file.delete()
+
+
+# --- AnalysisPlate.ingest_result_file tests ---
+
+
+def test_plate_coordinates_to_position_roundtrip():
+    for index in range(96):
+        coordinate = PlatePosition(position=index).position_to_coordinates()
+        assert AnalysisPlate.coordinates_to_position(coordinate) == index
+
+
+@pytest.mark.django_db(transaction=True)
+def test_analysis_plate_ingest_result_file(analysis_order_with_markers):
+    """Test that result rows update the sample markers of the matching wells."""
+    plate = AnalysisPlate.objects.create()
+    sample_markers = list(
+        analysis_order_with_markers.sample_markers.values_list("id", flat=True)[:2],
+    )
+    with transaction.atomic():
+        plate.add_sample_markers(sample_markers)
+
+    content = (
+        "Chip Run Info,run 1\n"
+        "\n"
+        "Plate,Well,Call,Value\n"
+        f"#A{plate.analysis_number},A01,XY,0.93\n"
+        f"#A{plate.analysis_number},B01,No Call,\n"
+        f"#A{plate.analysis_number},C01,XX,0.88\n"
+        "#A999999,A01,XX,0.5\n"
+    )
+    plate.result_file.save("results.csv", ContentFile(content.encode()))
+
+    summary = plate.ingest_result_file()
+
+    assert summary["sample_markers"] == 2
+    assert summary["skipped"] == ["C1"]
+
+    first, second = (
+        SampleMarkerAnalysis.objects.get(id=sm_id) for sm_id in sample_markers
+    )
+    assert first.is_analysed and first.is_outputted
+    assert second.is_analysed and not second.is_outputted
+    assert plate.positions.get(position=1).is_invalid
+    assert not plate.positions.get(position=0).is_invalid
+
+    plate.refresh_from_db()
+    assert plate.extra["results"]["A1"] == [
+        {
+            "Plate": f"#A{plate.analysis_number}",
+            "Well": "A01",
+            "Call": "XY",
+            "Value": "0.93",
+        }
+    ]
+
+    # a new file replaces the results of the previous one, its marker
+    # column is compared case-insensitively
+    marker = first.marker_id
+    content = (
+        "Plate,Well,Marker,Call\n"
+        f"#A{plate.analysis_number},A01,{marker.swapcase()},No Call\n"
+        f"#A{plate.analysis_number},B01,not-{marker},XY\n"
+    )
+    plate.result_file.save("results.csv", ContentFile(content.encode()))
+
+    summary = plate.ingest_result_file()
+
+    assert summary["sample_markers"] == 1
+    assert summary["marker_mismatches"] == ["B1"]
+    first, second = (
+        SampleMarkerAnalysis.objects.get(id=sm_id) for sm_id in sample_markers
+    )
+    assert first.is_analysed and not first.is_outputted
+    assert not second.is_analysed and not second.is_outputted
+    assert plate.positions.get(position=0).is_invalid
+    assert not plate.positions.get(position=1).is_invalid
+
+    # Clean up
+    plate.result_file.delete()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_analysis_plate_ingest_partial_result_file(analysis_order_with_markers):
+    """Test that a file only updates its wells and the wells of the previous
+    file, and keeps the results of the replicates on other plates."""
+    plate = AnalysisPlate.objects.create()
+    replicate_plate = AnalysisPlate.objects.create()
+    first_id, second_id = analysis_order_with_markers.sample_markers.values_list(
+        "id", flat=True
+    )[:2]
+    with transaction.atomic():
+        plate.add_sample_markers([first_id, second_id])
+        replicate_plate.add_sample_markers([first_id])
+
+    # set by hand on a well missing from the files
+    plate.positions.filter(position=1).update(is_invalid=True)
+    SampleMarkerAnalysis.objects.filter(id=second_id).update(
+        is_analysed=True, is_outputted=True
+    )
+
+    content = f"Plate,Well,Call\n#A{replicate_plate.analysis_number},A01,XY\n"
+    replicate_plate.result_file.save("results.csv", ContentFile(content.encode()))
+    replicate_plate.ingest_result_file()
+
+    # the first sample marker failed on this plate
+    content = f"Plate,Well,Call\n#A{plate.analysis_number},A01,No Call\n"
+    plate.result_file.save("results.csv", ContentFile(content.encode()))
+    summary = plate.ingest_result_file()
+
+    assert summary["wells"] == 1
+    assert summary["invalid_positions"] == 1
+    first = SampleMarkerAnalysis.objects.get(id=first_id)
+    second = SampleMarkerAnalysis.objects.get(id=second_id)
+    # the output of the replicate is kept
+    assert first.is_analysed and first.is_outputted
+    assert plate.positions.get(position=0).is_invalid
+    assert second.is_analysed and second.is_outputted
+    assert plate.positions.get(position=1).is_invalid
+
+    # a file without the first well clears the flags of the previous file
+    content = f"Plate,Well,Call\n#A{plate.analysis_number},B01,XY\n"
+    plate.result_file.save("results.csv", ContentFile(content.encode()))
+    plate.ingest_result_file()
+
+    first.refresh_from_db()
+    assert first.is_analysed and first.is_outputted
+    assert not plate.positions.get(position=0).is_invalid
+    assert not plate.positions.get(position=1).is_invalid
+
+    # Clean up
+    plate.result_file.delete()
+    replicate_plate.result_file.delete()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_populate_from_order_is_traced(extraction, settings, caplog):
+    """Test that populate_from_order logs a span with its attributes."""
+    settings.TRACING_SAMPLE_RATES = {"default": 0}
+    extraction.confirm_order()
+    ao = AnalysisOrder.objects.create(genrequest_id=1, from_order=extraction)
+    ao.markers.add(Marker.objects.filter(name__startswith="Salamander").first())
+
+    with caplog.at_level("INFO", logger="genlab.tracing"):
+        ao.populate_from_order()
+    assert not caplog.records
+
+    settings.TRACING_SAMPLE_RATES = {"analysis_order.populate_from_order": 1}
+    with caplog.at_level("INFO", logger="genlab.tracing"):
+        ao.populate_from_order()
+
+    (record,) = caplog.records
+    assert record.operation == "analysis_order.populate_from_order"
+    assert record.span["order_id"] == ao.pk
+    assert record.span["sample_marker_count"] == ao.sample_markers.count()
+    assert record.span["created_count"] == 0  # created by the first call
+    assert record.span["status"] == "ok"
+
+
+@pytest.mark.django_db
+def test_filter_allowed_follows_membership_changes(genlab_setup):
+    """Test that the cached access scope is invalidated by membership changes."""
+    user = User.objects.create_user(email="scope@example.com", password="x")  # noqa: S106
+    genrequest = Genrequest.objects.get(pk=1)
+    assert not Genrequest.objects.filter_allowed(user).exists()
+
+    membership = ProjectMembership.objects.create(
+        user=user, project_id=genrequest.project_id
+    )
+    user = User.objects.get(pk=user.pk)
+    assert list(Genrequest.objects.filter_allowed(user)) == [genrequest]
+
+    membership.delete()
+    user = User.objects.get(pk=user.pk)
+    assert not Genrequest.objects.filter_allowed(user).exists()
+
+    Project.objects.get(pk=genrequest.project_id).memberships.add(user)
+    user = User.objects.get(pk=user.pk)
+    assert Genrequest.objects.filter_allowed(user).exists()
+    assert not user.is_genlab_staff()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_sample_progress_follows_sample_writes(extraction):
+    """Test that the progress counters are refreshed by the sample write paths."""
+
+    def progress():
+        return OrderSampleProgress.objects.get(order=extraction)
+
+    samples = list(extraction.samples.order_by("id"))
+    assert progress().total == len(samples)
+    assert progress().isolated == 0
+
+    samples[0].is_isolated = True
+    samples[0].save()
+    assert progress().isolated == 1
+
+    extraction.samples.update(is_marked=True)
+    assert progress().marked == len(samples)
+
+    for sample in samples:
+        sample.is_invalid = True
+    Sample.objects.bulk_update(samples, ["is_invalid"])
+    assert progress().invalid == len(samples)
+
+    samples[-1].delete()
+    assert progress().total == len(samples) - 1
+    assert extraction.get_sample_progress().isolated == 1
+
+    # counters changed behind the bulk paths are fixed by the reconcile command
+    OrderSampleProgress.objects.filter(order=extraction).update(total=0)
+    call_command("reconcile_sample_progress")
+    assert progress().total == len(samples) - 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_statistics_follow_writes(extraction):
+    """Test that the statistics rollups are refreshed by the write paths."""
+
+    def statistics():
+        return GenrequestStatistics.objects.get(genrequest=extraction.genrequest)
+
+    samples = list(extraction.samples.order_by("id"))
+    assert statistics().samples == len(samples)
+    assert statistics().count_orders("extraction") == 1
+    assert statistics().last_activity_at is not None
+
+    AnalysisOrder.objects.create(genrequest=extraction.genrequest)
+    assert statistics().orders_total == 2
+    assert statistics().count_orders("analysis") == 1
+
+    samples[0].is_isolated = True
+    samples[0].save()
+    assert statistics().isolated_samples == 1
+
+    project = ProjectStatistics.objects.get(project=extraction.genrequest.project)
+    assert project.samples == len(samples)
+    assert project.isolated_samples == 1
+    assert project.orders == statistics().orders
+
+    # both projects are refreshed when the genrequest moves
+    genrequest = extraction.genrequest
+    previous_project = genrequest.project
+    genrequest.project = Project.objects.create(number="999999")
+    genrequest.save()
+    assert ProjectStatistics.objects.get(project=previous_project).samples == 0
+    assert ProjectStatistics.objects.get(project=genrequest.project).samples == len(
+        samples
+    )
+    Genrequest.objects.filter(pk=genrequest.pk).update(project=previous_project)
+    assert ProjectStatistics.objects.get(project=genrequest.project).samples == 0
+    assert ProjectStatistics.objects.get(project=previous_project).samples == len(
+        samples
+    )
+
+    # rollups changed behind the bulk paths are fixed by the reconcile command
+    GenrequestStatistics.objects.update(samples=0)
+    ProjectStatistics.objects.update(samples=0)
+    call_command("reconcile_statistics")
+    assert statistics().samples == len(samples)
+    assert ProjectStatistics.objects.get(
+        project=extraction.genrequest.project
+    ).samples == len(samples)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_search_index_follows_writes(extraction):
+    """Test that the search finds exact identifiers and falls back to fuzzy matches."""
+    sample = extraction.samples.order_by("id").first()
+    sample.genlab_id = "G25TEST00001"
+    sample.save()
+
+    results = search("g25test00001")
+    assert results.exact
+    assert [entry.url for entry in results.entries] == [sample.get_absolute_url()]
+
+    results = search(f"#EXT_{extraction.pk}")
+    assert results.exact
+    assert [entry.title for entry in results.entries] == [f"#EXT_{extraction.pk}"]
+
+    results = search("G25TEST")
+    assert not results.exact
+    assert sample.get_absolute_url() in [entry.url for entry in results.entries]
+
+    sample_id = sample.pk
+    sample.delete()
+    assert not SearchEntry.objects.filter(
+        kind=SearchEntry.Kind.SAMPLE, object_id=str(sample_id)
+    ).exists()
+    assert not search("G25TEST00001").entries
+
+
+def test_order_status_change_is_published_after_commit(
+    extraction, django_capture_on_commit_callbacks, monkeypatch
+):
+    """Test that an order status transition reaches the event streams."""
+    broker = events.LocalBroker()
+    monkeypatch.setattr(events, "_broker", broker)
+    loop = asyncio.new_event_loop()
+    subscribe = broker.subscribe([f"order:{extraction.pk}"])
+    subscription = loop.run_until_complete(subscribe.__aenter__())
+    try:
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            extraction.to_processing()
+            assert callbacks
+        event = loop.run_until_complete(
+            asyncio.wait_for(subscription.queue.get(), timeout=1)
+        )
+    finally:
+        loop.run_until_complete(subscribe.__aexit__(None, None, None))
+        loop.close()
+
+    assert event.type == "order-status"
+    assert event.data == {"id": extraction.pk, "status": "processing"}
@@ -0,0 +1,471 @@
+import json
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+
+from capps.core.middleware import fingerprint_sql
+from capps.core.models import SlowQuery
+from genlab_bestilling.api.projections import SampleProjection
+from genlab_bestilling.api.serializers import SampleSerializer
+from genlab_bestilling.autocomplete import LocationAutocomplete
+from genlab_bestilling.models import (
+    AnalysisOrder,
+    AnalysisPlate,
+    Area,
+    ExtractionPlate,
+    Location,
+    LocationType,
+    Marker,
+    Sample,
+    Species,
+)
+from genlab_bestilling.reference import reference_bundle_url
+from nina.models import ProjectMembership
+from shared.db import WriteInReadOnlyRequest, forbid_writes
+from shared.profiling import list_profiles
+from shared.projections import FastJSONRenderer
+from shared.transfers import DirectFileTransfer
+from staff.api import SampleMarkerViewSet
+from staff.projections import OrderSampleMarkerProjection
+from staff.serializers import OrderSampleMarkerSerializer
+
+
+def test_forbid_writes_rejects_insert(genlab_setup):
+    with (
+        connection.execute_wrapper(forbid_writes),
+        pytest.raises(WriteInReadOnlyRequest),
+    ):
+        Area.objects.create(name="Read only")
+
+
+def test_forbid_writes_allows_select(genlab_setup):
+    with connection.execute_wrapper(forbid_writes):
+        assert Area.objects.exists()
+
+
+@pytest.mark.parametrize(
+    "url_name",
+    [
+        "staff:dashboard",
+        "staff:order-analysis-list",
+        "staff:order-extraction-list",
+        "staff:order-equipment-list",
+        "staff:projects-list",
+    ],
+)
+def test_read_only_staff_views_do_not_write(genlab_setup, admin_client, url_name):
+    response = admin_client.get(reverse(url_name))
+    assert response.status_code == 200
+
+
+def test_direct_transfer_local_round_trip(genlab_setup, client, settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    plate = AnalysisPlate.objects.create()
+    transfer = DirectFileTransfer(plate, "result_file", max_size=1024)
+
+    started = transfer.start_upload("results.csv")
+    response = client.post(
+        started["upload"]["url"],
+        {
+            **started["upload"]["fields"],
+            "file": SimpleUploadedFile("results.csv", b"Well,Call\nA1,PASS\n"),
+        },
+    )
+    assert response.status_code == 204
+
+    transfer.finalize(started["token"])
+    plate.refresh_from_db()
+    assert plate.result_file.read() == b"Well,Call\nA1,PASS\n"
+
+    with pytest.raises(DirectFileTransfer.TransferError):
+        DirectFileTransfer(
+            AnalysisPlate.objects.create(), "result_file", max_size=1024
+        ).finalize(started["token"])
+
+
+def test_request_profiler_stores_speedscope_file(
+    genlab_setup, admin_client, settings, tmp_path
+):
+    settings.MEDIA_ROOT = tmp_path
+    settings.REQUEST_PROFILER_ENABLED = True
+    order = AnalysisOrder.objects.create(genrequest_id=1)
+    url = reverse("staff:order-analysis-detail", kwargs={"pk": order.pk})
+
+    response = admin_client.get(url)
+    assert "X-Profile" not in response
+
+    response = admin_client.get(url, {"_profile": "1"})
+    assert response.status_code == 200
+    assert response["X-Profile"] in list_profiles()
+    assert "sql;dur=" in response["Server-Timing"]
+
+    download = admin_client.get(
+        reverse(
+            "request-profile-download",
+            kwargs={"filename": response["X-Profile"].rsplit("/", 1)[-1]},
+        )
+    )
+    data = json.loads(b"".join(download.streaming_content))
+    assert [p["type"] for p in data["profiles"]] == ["sampled", "evented", "evented"]
+    assert data["profiles"][2]["events"]
+
+
+def test_slow_query_fingerprint_ignores_placeholder_lists():
+    assert fingerprint_sql("SELECT 1 FROM t WHERE id IN (%s, %s)") == fingerprint_sql(
+        "SELECT 1\n  FROM t WHERE id IN (%s, %s, %s)"
+    )
+    assert fingerprint_sql("SELECT 1 FROM t") != fingerprint_sql("SELECT 2 FROM t")
+
+
+def test_slow_query_middleware_records_filter_params(
+    genlab_setup, admin_client, settings
+):
+    settings.SLOW_QUERY_RECORDER_ENABLED = True
+    settings.SLOW_QUERY_THRESHOLD_MS = 0
+    settings.SLOW_QUERY_THROTTLE_SECONDS = 0
+
+    with mock.patch("capps.core.middleware.record_slow_query") as record:
+        admin_client.get(reverse("staff:order-analysis-list"), {"status": "draft"})
+
+    assert record.enqueue.called
+    (query,) = record.enqueue.call_args.args
+    assert query["view"] == "staff:order-analysis-list"
+    assert query["query_params"] == {"status": ["draft"]}
+
+    slow_query = SlowQuery.objects.create(
+        fingerprint=query["fingerprint"],
+        sql="SELECT id FROM genlab_bestilling_area WHERE name = %s",
+        params=["Akvatisk"],
+        duration_ms=query["duration_ms"],
+    )
+    slow_query.explain()
+    assert "Scan" in slow_query.plan
+    slow_query.refresh_from_db()
+    assert slow_query.params == []
+
+
+def test_hot_queries_use_indexes(genlab_setup):
+    call_command("check_query_plans")
+
+
+def test_startup_defers_admin_and_schema(tmp_path, admin_client):
+    budget = tmp_path / "import_budget.json"
+    budget.write_text(
+        json.dumps(
+            {"web": {"deferred": ["genlab_bestilling.admin", "drf_spectacular.views"]}}
+        )
+    )
+    call_command("check_import_time", "--budget", str(budget), "--runs", "1")
+
+    # imported on first use
+    assert admin_client.get(reverse("admin:index")).status_code == 200
+    assert admin_client.get(reverse("swagger-ui")).status_code == 200
+
+
+def test_api_schema_is_served_from_the_build(tmp_path, settings, client):
+    settings.DEBUG = False
+    settings.API_SCHEMA_FILE = str(tmp_path / "openapi.json")
+    assert client.get(reverse("schema")).status_code == 404
+
+    call_command("build_api_schema")
+    call_command("build_api_schema", "--check")
+    response = client.get(reverse("schema"))
+    assert response.status_code == 200
+    assert "/api/samples/" in response.json()["paths"]
+
+    response = client.get(reverse("schema"), HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == 304
+
+
+def test_sample_marker_facets_count_without_own_filter(extraction, admin_client):
+    extraction.confirm_order()
+    ao = AnalysisOrder.objects.create(genrequest_id=1, from_order=extraction)
+    ao.markers.add(*Marker.objects.filter(name__startswith="Salamander")[:2])
+    ao.populate_from_order()
+    sample_markers = ao.sample_markers.all()
+    species = sample_markers.first().sample.species
+
+    url = reverse("staff:api-sample-markers-facets")
+    response = admin_client.get(url, {"order": ao.pk, "species": species.pk})
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["count"] == sample_markers.filter(sample__species=species).count()
+    # the species facet is counted without the species filter
+    assert sum(item["count"] for item in data["facets"]["species"]) == (
+        sample_markers.count()
+    )
+    assert {item["value"] for item in data["facets"]["marker"]} <= set(
+        ao.markers.values_list("name", flat=True)
+    )
+
+
+def test_sample_marker_facets_count_rows_with_search_and_status(
+    extraction, admin_client
+):
+    extraction.confirm_order()
+    ao = AnalysisOrder.objects.create(genrequest_id=1, from_order=extraction)
+    ao.markers.add(*Marker.objects.filter(name__startswith="Salamander")[:2])
+    ao.populate_from_order()
+    sample_markers = ao.sample_markers.all()
+    sample_markers.update(has_pcr=True)
+
+    url = reverse("staff:api-sample-markers-facets")
+    # the sample names are uuids, all of them match the search
+    params = {"order": ao.pk, "search": "-", "status": "pcr"}
+    response = admin_client.get(url, params)
+    assert response.status_code == 200
+    data = response.json()
+
+    # the search and status filters select distinct rows, which must not
+    # collapse the rows sharing the same facet values
+    assert data["count"] == sample_markers.count()
+    assert sum(item["count"] for item in data["facets"]["marker"]) == (
+        sample_markers.count()
+    )
+
+
+def test_sample_marker_delta_sync(extraction, admin_client):
+    extraction.confirm_order()
+    ao = AnalysisOrder.objects.create(genrequest_id=1, from_order=extraction)
+    ao.markers.add(*Marker.objects.filter(name__startswith="Salamander")[:2])
+    ao.populate_from_order()
+    changed, removed = ao.sample_markers.all()[:2]
+
+    url = reverse("staff:api-analysis-order-sample-markers", kwargs={"order_pk": ao.pk})
+    response = admin_client.get(url)
+    assert response.status_code == 200
+    token = response["X-Sync-Token"]
+
+    changed.is_outputted = True
+    changed.save()
+    removed_id = removed.pk
+    removed.delete()
+
+    response = admin_client.get(url, {"since": token})
+    assert response.status_code == 200
+    data = response.json()
+    assert not data["reset"]
+    assert data["token"]
+    assert changed.pk in {row["id"] for row in data["results"]}
+    assert removed_id not in {row["id"] for row in data["results"]}
+    assert removed_id in data["deleted"]
+
+    response = admin_client.get(url, {"since": "not-a-token"})
+    assert response.status_code == 400
+
+
+def test_sample_marker_delta_sync_follows_filters_and_order(extraction, admin_client):
+    extraction.confirm_order()
+    markers = Marker.objects.filter(name__startswith="Salamander")[:2]
+    ao, other = (
+        AnalysisOrder.objects.create(genrequest_id=1, from_order=extraction)
+        for _ in range(2)
+    )
+    for order in (ao, other):
+        order.markers.add(*markers)
+        order.populate_from_order()
+        order.sample_markers.update(has_pcr=True)
+
+    url = reverse("staff:api-sample-markers-list")
+    params = {"order": ao.pk, "status": "pcr"}
+    response = admin_client.get(url, params)
+    assert response.status_code == 200
+    token = response["X-Sync-Token"]
+
+    # no longer matches the status filter
+    unmatched = ao.sample_markers.first()
+    unmatched.has_pcr = False
+    unmatched.save()
+    # deleted from another order
+    other_removed = other.sample_markers.first()
+    other_removed_id = other_removed.pk
+    other_removed.delete()
+
+    response = admin_client.get(url, {**params, "since": token})
+    assert response.status_code == 200
+    data = response.json()
+    assert not data["reset"]
+    assert unmatched.pk not in {row["id"] for row in data["results"]}
+    assert data["deleted"] == [unmatched.pk]
+    assert other_removed_id not in data["deleted"]
+
+
+def test_sample_bulk_update(extraction, admin_client, admin_user):
+    ProjectMembership.objects.create(
+        user=admin_user, project_id=extraction.genrequest.project_id
+    )
+    first, second = extraction.samples.order_by("id")[:2]
+
+    response = admin_client.patch(
+        reverse("samples-bulk-create"),
+        data=json.dumps(
+            [
+                {"id": first.pk, "name": "renamed", "year": 2021},
+                {"id": second.pk, "species": 0},
+                {"id": 0, "name": "missing"},
+                {"name": "no id"},
+            ]
+        ),
+        content_type="application/json",
+    )
+    assert response.status_code == 200
+    data = response.json()
+
+    assert [row["id"] for row in data["results"]] == [first.pk]
+    assert [error["index"] for error in data["errors"]] == [1, 2, 3]
+    assert "species" in data["errors"][0]["errors"]
+
+    first.refresh_from_db()
+    assert (first.name, first.year) == ("renamed", 2021)
+
+    extraction.confirm_order()
+    response = admin_client.patch(
+        reverse("samples-bulk-create"),
+        data=json.dumps([{"id": second.pk, "name": "too late"}]),
+        content_type="application/json",
+    )
+    assert response.json()["errors"][0]["index"] == 0
+    second.refresh_from_db()
+    assert second.name != "too late"
+
+
+def test_projections_render_like_the_serializers(extraction):
+    first, second = extraction.samples.order_by("id")[:2]
+    first.location = Location.objects.create(name="Elvå\u2028", river_id="012.3")
+    # formatted 1e-05 by the json module and 0.00001 by orjson
+    first.volume = 1e-05
+    first.save()
+    second.name = None
+    second.save()
+
+    extraction.confirm_order()
+    ao = AnalysisOrder.objects.create(genrequest_id=1, from_order=extraction)
+    ao.markers.add(*Marker.objects.filter(name__startswith="Salamander")[:2])
+    ao.populate_from_order()
+    with transaction.atomic():
+        AnalysisPlate.objects.create().add_sample_markers(
+            list(ao.sample_markers.values_list("id", flat=True)[:2])
+        )
+
+    for queryset, serializer_class, projection_class in [
+        (
+            SampleMarkerViewSet().get_queryset().order_by("id"),
+            OrderSampleMarkerSerializer,
+            OrderSampleMarkerProjection,
+        ),
+        (
+            Sample.objects.with_sheet_data().order_by("id"),
+            SampleSerializer,
+            SampleProjection,
+        ),
+    ]:
+        projection = projection_class()
+        rows = projection.serialize(projection.project(queryset))
+        assert FastJSONRenderer().render(rows) == JSONRenderer().render(
+            serializer_class(queryset, many=True).data
+        )
+
+
+# the version is bumped when the transaction writing the reference data commits
+@pytest.mark.django_db(transaction=True)
+def test_reference_bundle_is_versioned_by_content(extraction, admin_client):
+    area_id = extraction.genrequest.area_id
+    url = reference_bundle_url(area_id)
+    response = admin_client.get(url)
+    assert response.status_code == 200
+    assert "immutable" in response["Cache-Control"]
+    bundle = response.json()
+    assert {row[1] for row in bundle["species"]["rows"]} == set(
+        Species.objects.filter(area_id=area_id).values_list("name", flat=True)
+    )
+    assert (
+        admin_client.get(url, headers={"if-none-match": response["ETag"]}).status_code
+        == 304
+    )
+
+    Species.objects.filter(pk__in=extraction.species.all()).update(name="Renamed")
+    assert reference_bundle_url(area_id) != url
+    response = admin_client.get(url)
+    assert response["Cache-Control"] == "private, no-cache"
+    assert "Renamed" in {row[1] for row in response.json()["species"]["rows"]}
+
+
+def test_autocomplete_matches_short_terms_by_prefix_only(genlab_setup, admin_client):
+    cache.clear()
+    prefix = Location.objects.create(name="Zyxalta")
+    inner = Location.objects.create(name="Storzyxa")
+
+    def search(term):
+        response = admin_client.get(reverse("autocomplete:location"), {"q": term})
+        assert response.status_code == 200
+        return {int(row["id"]) for row in response.json()["results"]}
+
+    # the trigram indexes cannot serve terms shorter than three characters
+    ids = search("zy")
+    assert prefix.pk in ids
+    assert inner.pk not in ids
+    assert {prefix.pk, inner.pk} <= search("zyx")
+
+
+def test_available_sample_marker_autocomplete_matches_the_id(extraction, admin_client):
+    cache.clear()
+    extraction.confirm_order()
+    ao = AnalysisOrder.objects.create(genrequest_id=1, from_order=extraction)
+    ao.markers.add(*Marker.objects.filter(name__startswith="Salamander")[:1])
+    ao.populate_from_order()
+    sample_marker = ao.sample_markers.first()
+    position = ExtractionPlate.objects.create().positions.get(position=0)
+    position.sample_raw = sample_marker.sample
+    position.save()
+
+    response = admin_client.get(
+        reverse("autocomplete:available-sample-marker"), {"q": str(sample_marker.pk)}
+    )
+    assert response.status_code == 200
+    assert sample_marker.pk in {int(row["id"]) for row in response.json()["results"]}
+
+
+def test_autocomplete_returns_no_results_on_timeout(
+    genlab_setup, admin_client, monkeypatch
+):
+    cache.clear()
+    Location.objects.create(name="Zyxalta")
+
+    def slow_queryset(view):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_sleep(1)")
+        return Location.objects.all()
+
+    monkeypatch.setattr(LocationAutocomplete, "statement_timeout_ms", 10)
+    monkeypatch.setattr(LocationAutocomplete, "get_queryset", slow_queryset)
+    url = reverse("autocomplete:location")
+    response = admin_client.get(url, {"q": "zyx"})
+    assert response.status_code == 200
+    assert response.json() == {"results": [], "pagination": {"more": False}}
+
+    # the empty result of the canceled query is not cached
+    monkeypatch.undo()
+    assert admin_client.get(url, {"q": "zyx"}).json()["results"]
+
+
+def test_location_lookup_returns_compatible_locations(extraction, admin_client):
+    species = extraction.species.first()
+    species.location_type = LocationType.objects.create(name="River")
+    species.save()
+    river = Location.objects.create(name="Alta", river_id="212.Z", code="ALT")
+    river.types.add(species.location_type)
+    Location.objects.create(name="Altevatn")
+
+    for search in ("212", "alt", "Al"):
+        response = admin_client.get(
+            reverse("locations-list"), {"species": species.pk, "search": search}
+        )
+        assert response.status_code == 200
+        assert [row["id"] for row in response.json()["results"]] == [river.pk]
@@ -0,0 +1,45 @@
+import io
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import storages
+from django.core.management import call_command
+from openpyxl import load_workbook
+
+from genlab_bestilling.api.constants import (
+    SAMPLE_CSV_FIELD_LABELS,
+    SAMPLE_CSV_FIELDS_BY_AREA,
+)
+from genlab_bestilling.api.serializers import SampleCSVSerializer
+from genlab_bestilling.api.xlsx import SampleXLSXExporter
+from genlab_bestilling.models import Sample
+
+
+def test_xlsx_export_one_sheet_per_area(extraction):
+    queryset = Sample.objects.with_sheet_data().filter(order=extraction)
+    exporter = SampleXLSXExporter(SampleCSVSerializer, SAMPLE_CSV_FIELDS_BY_AREA)
+
+    file = io.BytesIO()
+    count = exporter.write(queryset, file)
+    assert count == queryset.count()
+
+    workbook = load_workbook(file, read_only=True)
+    rows = 0
+    for sheet in workbook.worksheets:
+        header, *data = list(sheet.values)
+        fields = exporter.get_fields(sheet.title)
+        assert list(header) == [SAMPLE_CSV_FIELD_LABELS.get(f, f) for f in fields]
+        rows += len(data)
+    assert rows == count
+
+
+def test_exports_are_pruned_once_expired(tmp_path, settings):
+    settings.MEDIA_ROOT = str(tmp_path)
+    storage = storages["exports"]
+    name = storage.save("exports/1/export/sheet.xlsx", ContentFile(b"xlsx"))
+
+    call_command("prune_exports")
+    assert storage.exists(name)
+
+    settings.DIRECT_TRANSFER_EXPIRY = 0
+    call_command("prune_exports")
+    assert not storage.exists(name)
@@ -25,7 +25,12 @@ from rest_framework.exceptions import ValidationError
 from view_breadcrumbs import BaseBreadcrumbMixin
 
 from nina.models import Project
-from shared.views import ActionView, FormsetCreateView, FormsetUpdateView
+from shared.views import (
+    ActionView,
+    FormsetCreateView,
+    FormsetUpdateView,
+    ReadOnlyRequestMixin,
+)
 
 from .api.serializers import AnalysisSerializer, ExtractionSerializer
 from .filters import (
@@ -52,9 +57,11 @@ from .models import (
     ExtractionOrder,
     Genrequest,
     Order,
+    OrderListing,
     Sample,
     SampleMarkerAnalysis,
 )
+from .reference import reference_bundle_url
 from .tables import (
     AnalysisOrderTable,
     AnalysisSampleTable,
@@ -68,7 +75,11 @@ from .tables import (
 
 
 class GenrequestListView(
-    BaseBreadcrumbMixin, LoginRequiredMixin, SingleTableMixin, FilterView
+    ReadOnlyRequestMixin,
+    BaseBreadcrumbMixin,
+    LoginRequiredMixin,
+    SingleTableMixin,
+    FilterView,
 ):
     model = Genrequest
     table_class = GenrequestTable
@@ -83,13 +94,15 @@ class GenrequestListView(
         return (
             super()
             .get_queryset()
-            .select_related("project", "area")
+            .select_related("project", "area", "statistics")
             .prefetch_related("tags", "sample_types", "species")
             .filter_allowed(self.request.user)
         )
 
 
-class GenrequestDetailView(BaseBreadcrumbMixin, LoginRequiredMixin, DetailView):
+class GenrequestDetailView(
+    ReadOnlyRequestMixin, BaseBreadcrumbMixin, LoginRequiredMixin, DetailView
+):
     model = Genrequest
     add_home = False
 
@@ -267,18 +280,24 @@ class GenrequestNestedMixin(BaseBreadcrumbMixin, LoginRequiredMixin):
         return kwargs
 
 
-class GenrequestOrderListView(GenrequestNestedMixin, SingleTableMixin, FilterView):
+class GenrequestOrderListView(
+    ReadOnlyRequestMixin, GenrequestNestedMixin, SingleTableMixin, FilterView
+):
     model = Order
+    queryset = OrderListing.objects.all()
     table_class = OrderTable
     filterset_class = OrderFilter
     gen_crumbs = [("Orders", "")]
 
     def get_queryset(self) -> QuerySet:
-        return super().get_queryset().select_related("genrequest", "polymorphic_ctype")
+        return super().get_queryset().select_related("genrequest")
 
 
-class OrderListView(SingleTableMixin, LoginRequiredMixin, FilterView):
+class OrderListView(
+    ReadOnlyRequestMixin, SingleTableMixin, LoginRequiredMixin, FilterView
+):
     model = Order
+    queryset = OrderListing.objects.all()
     table_class = OrderTable
     filterset_class = OrderFilter
     crumbs = [("Orders", "")]
@@ -288,12 +307,16 @@ class OrderListView(SingleTableMixin, LoginRequiredMixin, FilterView):
             super()
             .get_queryset()
             .filter_allowed(self.request.user)
-            .select_related("genrequest", "polymorphic_ctype", "genrequest__project")
+            .select_related("genrequest", "genrequest__project")
         )
 
 
 class MySamplesListView(
-    BaseBreadcrumbMixin, LoginRequiredMixin, SingleTableMixin, FilterView
+    ReadOnlyRequestMixin,
+    BaseBreadcrumbMixin,
+    LoginRequiredMixin,
+    SingleTableMixin,
+    FilterView,
 ):
     """Samples list view for My orders > Samples page."""
 
@@ -350,7 +373,7 @@ class MySamplesListView(
 
 
 class GenrequestEquipmentOrderListView(
-    GenrequestNestedMixin, SingleTableMixin, FilterView
+    ReadOnlyRequestMixin, GenrequestNestedMixin, SingleTableMixin, FilterView
 ):
     model = EquipmentOrder
     table_class = EquipmentOrderTable
@@ -376,7 +399,9 @@ class GenrequestEquipmentOrderListView(
         return super().get_queryset().select_related("genrequest")
 
 
-class EquipmentOrderListView(SingleTableMixin, LoginRequiredMixin, FilterView):
+class EquipmentOrderListView(
+    ReadOnlyRequestMixin, SingleTableMixin, LoginRequiredMixin, FilterView
+):
     model = EquipmentOrder
     table_class = EquipmentOrderTable
     filterset_class = OrderEquipmentFilter
@@ -406,7 +431,7 @@ class EquipmentOrderListView(SingleTableMixin, LoginRequiredMixin, FilterView):
 
 
 class GenrequestExtractionOrderListView(
-    GenrequestNestedMixin, SingleTableMixin, FilterView
+    ReadOnlyRequestMixin, GenrequestNestedMixin, SingleTableMixin, FilterView
 ):
     model = ExtractionOrder
     table_class = ExtractionOrderTable
@@ -432,7 +457,9 @@ class GenrequestExtractionOrderListView(
         return super().get_queryset().select_related("genrequest")
 
 
-class ExtractionOrderListView(SingleTableMixin, LoginRequiredMixin, FilterView):
+class ExtractionOrderListView(
+    ReadOnlyRequestMixin, SingleTableMixin, LoginRequiredMixin, FilterView
+):
     model = ExtractionOrder
     table_class = ExtractionOrderTable
     filterset_class = OrderExtractionFilter
@@ -462,7 +489,7 @@ class ExtractionOrderListView(SingleTableMixin, LoginRequiredMixin, FilterView):
 
 
 class GenrequestAnalysisOrderListView(
-    GenrequestNestedMixin, SingleTableMixin, FilterView
+    ReadOnlyRequestMixin, GenrequestNestedMixin, SingleTableMixin, FilterView
 ):
     model = AnalysisOrder
     table_class = AnalysisOrderTable
@@ -490,7 +517,9 @@ class GenrequestAnalysisOrderListView(
         )
 
 
-class AnalysisOrderListView(SingleTableMixin, LoginRequiredMixin, FilterView):
+class AnalysisOrderListView(
+    ReadOnlyRequestMixin, SingleTableMixin, LoginRequiredMixin, FilterView
+):
     model = AnalysisOrder
     table_class = AnalysisOrderTable
     filterset_class = OrderAnalysisFilter
@@ -519,7 +548,7 @@ class AnalysisOrderListView(SingleTableMixin, LoginRequiredMixin, FilterView):
         )
 
 
-class EquipmentOrderDetailView(GenrequestNestedMixin, DetailView):
+class EquipmentOrderDetailView(ReadOnlyRequestMixin, GenrequestNestedMixin, DetailView):
     model = EquipmentOrder
 
     @cached_property
@@ -543,7 +572,7 @@ class EquipmentOrderDetailView(GenrequestNestedMixin, DetailView):
         ]
 
 
-class AnalysisOrderDetailView(GenrequestNestedMixin, DetailView):
+class AnalysisOrderDetailView(ReadOnlyRequestMixin, GenrequestNestedMixin, DetailView):
     model = AnalysisOrder
 
     @cached_property
@@ -584,7 +613,9 @@ class AnalysisOrderDetailView(GenrequestNestedMixin, DetailView):
         )
 
 
-class ExtractionOrderDetailView(GenrequestNestedMixin, DetailView):
+class ExtractionOrderDetailView(
+    ReadOnlyRequestMixin, GenrequestNestedMixin, DetailView
+):
     model = ExtractionOrder
 
     @cached_property
@@ -1050,7 +1081,7 @@ class EquipmentOrderQuantityUpdateView(GenrequestNestedMixin, BulkEditCollection
         return initial  # noqa: RET504
 
 
-class SamplesFrontendView(GenrequestNestedMixin, DetailView):
+class SamplesFrontendView(ReadOnlyRequestMixin, GenrequestNestedMixin, DetailView):
     model = ExtractionOrder
     template_name = "genlab_bestilling/sample_form_frontend.html"
 
@@ -1085,6 +1116,9 @@ class SamplesFrontendView(GenrequestNestedMixin, DetailView):
             "order": self.object.id,
             "csrf": get_token(self.request),
             "analysis_data": ExtractionSerializer(self.object).data,
+            "reference_bundle_url": reference_bundle_url(
+                self.object.genrequest.area_id
+            ),
         }
         return context
 
@@ -1092,7 +1126,7 @@ class SamplesFrontendView(GenrequestNestedMixin, DetailView):
         return super().get_queryset().filter_in_draft()  # type: ignore[attr-defined]
 
 
-class SamplesListView(GenrequestNestedMixin, SingleTableView):
+class SamplesListView(ReadOnlyRequestMixin, GenrequestNestedMixin, SingleTableView):
     genrequest_accessor = "order__genrequest"
     table_pagination = False
 
@@ -1131,7 +1165,9 @@ class SamplesListView(GenrequestNestedMixin, SingleTableView):
         return context
 
 
-class AnalysisSamplesFrontendView(GenrequestNestedMixin, DetailView):
+class AnalysisSamplesFrontendView(
+    ReadOnlyRequestMixin, GenrequestNestedMixin, DetailView
+):
     model = AnalysisOrder
     template_name = "genlab_bestilling/analysis_sample_form_frontend.html"
 
@@ -1166,6 +1202,9 @@ class AnalysisSamplesFrontendView(GenrequestNestedMixin, DetailView):
             "order": self.object.id,
             "csrf": get_token(self.request),
             "analysis_data": AnalysisSerializer(self.object).data,
+            "reference_bundle_url": reference_bundle_url(
+                self.object.genrequest.area_id
+            ),
         }
         return context
 
@@ -1173,7 +1212,9 @@ class AnalysisSamplesFrontendView(GenrequestNestedMixin, DetailView):
         return super().get_queryset().filter_in_draft()  # type: ignore[attr-defined]
 
 
-class AnalysisSamplesListView(GenrequestNestedMixin, SingleTableView):
+class AnalysisSamplesListView(
+    ReadOnlyRequestMixin, GenrequestNestedMixin, SingleTableView
+):
     genrequest_accessor = "order__genrequest"
     table_pagination = False
 
@@ -6,10 +6,19 @@ from .models import ProjectMembership
 class MyProjectsTable(tables.Table):
     project = tables.Column(linkify=True)
     project__verified_at = tables.BooleanColumn()
+    project__statistics__orders_total = tables.Column(verbose_name="Orders")
+    project__statistics__samples = tables.Column(verbose_name="Samples")
 
     class Meta:
         model = ProjectMembership
-        fields = ("project", "role", "project__active", "project__verified_at")
+        fields = (
+            "project",
+            "role",
+            "project__active",
+            "project__verified_at",
+            "project__statistics__orders_total",
+            "project__statistics__samples",
+        )
 
 
 class MembersTable(tables.Table):
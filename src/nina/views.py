@@ -9,7 +9,7 @@ from formset.views import (
     BulkEditCollectionView,
 )
 
-from genlab_bestilling.models import Genrequest, Order
+from genlab_bestilling.models import Genrequest, OrderListing, ProjectStatistics
 from genlab_bestilling.tables import GenrequestTable, OrderTable
 from shared.views import FormsetCreateView, FormsetUpdateView
 
@@ -23,7 +23,12 @@ class ProjectList(LoginRequiredMixin, SingleTableView):
     table_class = MyProjectsTable
 
     def get_queryset(self) -> QuerySet:
-        return super().get_queryset().filter(user=self.request.user)
+        return (
+            super()
+            .get_queryset()
+            .filter(user=self.request.user)
+            .select_related("project__statistics")
+        )
 
 
 class ProjectDetailView(LoginRequiredMixin, DetailView):
@@ -44,15 +49,18 @@ class ProjectDetailView(LoginRequiredMixin, DetailView):
         # Get genetic projects (genrequests) for this project
         genrequests = (
             Genrequest.objects.filter(project=self.object)
-            .select_related("area")
+            .select_related("area", "statistics")
             .prefetch_related("species", "sample_types")
         )
         ctx["genrequests_table"] = GenrequestTable(data=genrequests)
+        ctx["statistics"] = ProjectStatistics.objects.filter(
+            project=self.object
+        ).first()
 
         # Get orders for all genetic projects under this project
         orders = (
-            Order.objects.filter(genrequest__project=self.object)
-            .select_related("genrequest", "genrequest__project", "polymorphic_ctype")
+            OrderListing.objects.filter(genrequest__project=self.object)
+            .select_related("genrequest", "genrequest__project")
             .order_by("-created_at")
         )
         ctx["orders_table"] = OrderTable(data=orders)
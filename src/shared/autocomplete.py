@@ -0,0 +1,79 @@
+import hashlib
+import json
+from typing import Any
+
+from django.core.cache import cache
+from django.db import OperationalError, models, transaction
+from django.http import HttpRequest, HttpResponse, JsonResponse
+
+from .db import is_query_canceled, statement_timeout
+from .views import ReadOnlyRequestMixin
+
+
+class IndexedAutocompleteMixin(ReadOnlyRequestMixin):
+    """
+    Index-friendly search and short-lived result caching for dal views.
+
+    ``prefix_fields`` are matched with ``istartswith`` and ``trigram_fields``
+    with ``icontains``; both are expected to be backed by ``Upper()``
+    expression indexes (``text_pattern_ops`` and ``gin_trgm_ops``).
+    Trigram indexes cannot serve terms shorter than three characters, so
+    short terms only hit the prefix fields.
+
+    Responses are cached per user, search term, page and forwarded values,
+    and the lookup runs under a statement timeout so that queries for
+    keystrokes the user already moved past do not pile up.
+    """
+
+    prefix_fields: tuple[str, ...] = ()
+    trigram_fields: tuple[str, ...] = ()
+    min_trigram_length = 3
+    max_results = 50
+    cache_timeout = 30
+    statement_timeout_ms = 2000
+
+    def get_search_filter(self, term: str) -> models.Q:
+        condition = models.Q()
+        for field in self.prefix_fields:
+            condition |= models.Q(**{f"{field}__istartswith": term})
+        if len(term) >= self.min_trigram_length:
+            for field in self.trigram_fields:
+                condition |= models.Q(**{f"{field}__icontains": term})
+        return condition
+
+    def search(self, qs: models.QuerySet) -> models.QuerySet:
+        term = self.q.strip()  # type: ignore[attr-defined]
+        if term:
+            qs = qs.filter(self.get_search_filter(term))
+        return qs
+
+    def get_cache_key(self, request: HttpRequest) -> str:
+        payload = json.dumps(
+            [
+                request.GET.get("q", ""),
+                request.GET.get("page", ""),
+                self.forwarded,  # type: ignore[attr-defined]
+            ],
+            sort_keys=True,
+        )
+        digest = hashlib.sha256(payload.encode()).hexdigest()
+        view = f"{type(self).__module__}.{type(self).__qualname__}"
+        return f"autocomplete:{view}:{request.user.pk}:{digest}"
+
+    def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        key = self.get_cache_key(request)
+        content = cache.get(key)
+        if content is not None:
+            return HttpResponse(content, content_type="application/json")
+
+        try:
+            with transaction.atomic(), statement_timeout(self.statement_timeout_ms):
+                response = super().get(request, *args, **kwargs)  # type: ignore[misc]
+        except OperationalError as e:
+            if not is_query_canceled(e):
+                raise
+            return JsonResponse({"results": [], "pagination": {"more": False}})
+
+        if response.status_code == 200:  # noqa: PLR2004
+            cache.set(key, response.content, self.cache_timeout)
+        return response
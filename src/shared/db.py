@@ -1,7 +1,71 @@
-from django.db import connection
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from django.db import connection, connections
 
 
 def assert_is_in_atomic_block() -> None:
     assert (  # noqa: S101
         connection.in_atomic_block
     ), "This function must be run inside of a DB transaction."
+
+
+# https://www.postgresql.org/docs/current/errcodes-appendix.html
+QUERY_CANCELED = "57014"
+
+
+@contextmanager
+def statement_timeout(milliseconds: int) -> Iterator[None]:
+    """
+    Cancel any statement of the current transaction running longer than
+    ``milliseconds``; the setting is dropped when the transaction ends.
+    """
+    assert_is_in_atomic_block()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT set_config('statement_timeout', %s, true)", [str(milliseconds)]
+        )
+    yield
+
+
+def is_query_canceled(err: Exception) -> bool:
+    """Tell whether ``err`` was raised by a statement timeout or cancellation."""
+    return getattr(err.__cause__, "sqlstate", None) == QUERY_CANCELED
+
+
+def pool_stats() -> dict[str, dict[str, Any]]:
+    """
+    Return the psycopg pool statistics of this process, keyed by database alias.
+
+    Aliases that are not configured with a pool are omitted.
+    """
+    stats = {}
+    for alias in connections:
+        pool = getattr(connections[alias], "pool", None)
+        if pool is not None:
+            stats[alias] = {"name": pool.name, **pool.get_stats()}
+    return stats
+
+
+class WriteInReadOnlyRequest(AssertionError):
+    """A statement that modifies data was issued while serving a read-only request."""
+
+
+WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE", "MERGE", "TRUNCATE")
+
+
+def forbid_writes(
+    execute: Callable, sql: str, params: Any, many: bool, context: dict[str, Any]
+) -> Any:
+    """
+    Execute wrapper (see ``connection.execute_wrapper``) rejecting writes.
+
+    ``SELECT ... FOR UPDATE`` is rejected as well: locking rows only makes
+    sense inside a transaction.
+    """
+    statement = sql.lstrip().upper()
+    if statement.startswith(WRITE_STATEMENTS) or " FOR UPDATE" in statement:
+        msg = f"Read-only request attempted to write: {sql[:200]}"
+        raise WriteInReadOnlyRequest(msg)
+    return execute(sql, params, many, context)
@@ -0,0 +1,157 @@
+"""
+Change events pushed to the browsers over server-sent events.
+
+Events are published to a topic (e.g. ``plate:<id>``, ``order:<id>``)
+after the transaction that caused them commits, and delivered to the
+streams subscribed to that topic. The broker is chosen with
+``EVENTS_BROKER``:
+
+- ``shared.events.LocalBroker`` delivers the events to the streams of the
+  same process only, enough for a single ASGI worker;
+- ``shared.events.PostgresBroker`` sends them through ``NOTIFY`` so that
+  every worker listening on the channel delivers them to its streams.
+
+Delivery is best effort: a stream that falls behind drops events, and a
+client reloads its data when it reconnects.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import threading
+from collections.abc import AsyncIterator, Collection
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, connections, transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# events waiting in a stream before the newer ones are dropped
+QUEUE_SIZE = 100
+NOTIFY_CHANNEL = "genlab_events"
+
+
+@dataclass(frozen=True)
+class Event:
+    topic: str
+    type: str
+    data: dict[str, Any] = field(default_factory=dict)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), cls=DjangoJSONEncoder)
+
+    @classmethod
+    def from_json(cls, payload: str) -> "Event":
+        return cls(**json.loads(payload))
+
+
+class Subscription:
+    def __init__(self, topics: Collection[str]) -> None:
+        self.topics = frozenset(topics)
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue[Event] = asyncio.Queue(QUEUE_SIZE)
+
+    def put(self, event: Event) -> None:
+        # runs in the loop of the subscription
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning(
+                "Event stream full, dropped %s on %s", event.type, event.topic
+            )
+
+
+class LocalBroker:
+    """Deliver the events to the subscriptions of this process."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.subscriptions: set[Subscription] = set()
+
+    def publish(self, event: Event) -> None:
+        self.dispatch(event)
+
+    def dispatch(self, event: Event) -> None:
+        # publishers are request threads, the subscriptions live in event loops
+        with self.lock:
+            subscriptions = [
+                sub for sub in self.subscriptions if event.topic in sub.topics
+            ]
+        for sub in subscriptions:
+            with contextlib.suppress(RuntimeError):  # the loop was closed
+                sub.loop.call_soon_threadsafe(sub.put, event)
+
+    async def start(self) -> None:
+        pass
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, topics: Collection[str]) -> AsyncIterator[Subscription]:
+        await self.start()
+        sub = Subscription(topics)
+        with self.lock:
+            self.subscriptions.add(sub)
+        try:
+            yield sub
+        finally:
+            with self.lock:
+                self.subscriptions.discard(sub)
+
+
+class PostgresBroker(LocalBroker):
+    """
+    Publish the events with ``NOTIFY``, each process listens on the channel
+    with a connection of its own and dispatches them to its subscriptions.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.listener: asyncio.Task | None = None
+
+    def publish(self, event: Event) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_notify(%s, %s)", [NOTIFY_CHANNEL, event.to_json()]
+            )
+
+    async def start(self) -> None:
+        if self.listener is None or self.listener.done():
+            self.listener = asyncio.create_task(self.listen())
+
+    async def listen(self) -> None:
+        import psycopg  # noqa: PLC0415
+
+        # the parameters of the Django connections, OPTIONS (sslmode, ...)
+        # included, without the cursor class of the synchronous connections
+        params = connections["default"].get_connection_params()
+        params.pop("cursor_factory", None)
+        params["autocommit"] = True
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(**params) as conn:
+                    await conn.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                    async for notify in conn.notifies():
+                        self.dispatch(Event.from_json(notify.payload))
+            except psycopg.OperationalError:
+                logger.exception("Lost the connection listening for events")
+                await asyncio.sleep(5)
+
+
+_broker: LocalBroker | None = None
+
+
+def get_broker() -> LocalBroker:
+    global _broker  # noqa: PLW0603
+    if _broker is None:
+        _broker = import_string(settings.EVENTS_BROKER)()
+    return _broker
+
+
+def publish(topic: str, event_type: str, **data: Any) -> None:
+    """Publish an event once the current transaction (if any) commits."""
+    event = Event(topic=topic, type=event_type, data=data)
+    transaction.on_commit(lambda: get_broker().publish(event), robust=True)
@@ -0,0 +1,95 @@
+"""
+Facet counts of a filtered queryset, computed in a single grouped query.
+
+Each facet is counted with the filters of the *other* facets applied but
+not its own, so that the counts tell how many rows each value would give
+if it was selected instead of the current one.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from django.db import connections, models
+
+
+@dataclass(frozen=True)
+class Facet:
+    value: str
+    label: str
+
+
+def facet_counts(
+    queryset: models.QuerySet,
+    facets: dict[str, Facet],
+    conditions: dict[str, models.Q],
+) -> dict[str, Any]:
+    """
+    Count the rows of ``queryset`` by the value of each facet.
+
+    ``facets`` maps the name of a facet to the fields of its value and label,
+    ``conditions`` the name of a facet to its current filter (if any).
+    Return the number of rows matching every condition and, by facet,
+    the values with a non-zero count.
+    """
+    if queryset.query.distinct:
+        # a DISTINCT would apply to the facet columns once projected and
+        # collapse the rows sharing the same values, so filter by key instead
+        queryset = queryset.model._base_manager.filter(
+            pk__in=queryset.order_by().values("pk")
+        )
+    names = list(facets)
+    columns: dict[str, Any] = {}
+    for i, name in enumerate(names):
+        columns[f"facet_{i}_value"] = models.F(facets[name].value)
+        columns[f"facet_{i}_label"] = models.F(facets[name].label)
+        columns[f"facet_{i}_match"] = (
+            models.ExpressionWrapper(
+                conditions[name], output_field=models.BooleanField()
+            )
+            if name in conditions
+            else models.Value(True)
+        )
+    sql, params = queryset.order_by().values(**columns).query.sql_with_params()
+
+    def matches(skip: int | None = None) -> str:
+        return " AND ".join(
+            [f"facet_{i}_match" for i in range(len(names)) if i != skip] or ["TRUE"]
+        )
+
+    values = ", ".join(f"facet_{i}_value" for i in range(len(names)))
+    selects = ", ".join(
+        f"facet_{i}_value, facet_{i}_label, "
+        f"count(*) FILTER (WHERE {matches(skip=i)}) AS facet_{i}_count"
+        for i in range(len(names))
+    )
+    grouping_sets = ", ".join(
+        f"(facet_{i}_value, facet_{i}_label)" for i in range(len(names))
+    )
+    # GROUPING() has a bit set for each column aggregated away, the first
+    # column being the most significant: a set of a single facet clears its bit
+    statement = (
+        f"SELECT GROUPING({values}), {selects}, "  # noqa: S608
+        f"count(*) FILTER (WHERE {matches()}) "
+        f"FROM ({sql}) AS facets "
+        f"GROUP BY GROUPING SETS ({grouping_sets}, ())"
+    )
+
+    all_bits = (1 << len(names)) - 1
+    result: dict[str, Any] = {"count": 0, "facets": {name: [] for name in names}}
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(statement, params)
+        for row in cursor.fetchall():
+            grouping, total = row[0], row[-1]
+            if grouping == all_bits:
+                result["count"] = total
+                continue
+            i = len(names) - (all_bits ^ grouping).bit_length()
+            value, label, count = row[1 + 3 * i : 4 + 3 * i]
+            if count:
+                result["facets"][names[i]].append(
+                    {"value": value, "label": label, "count": count}
+                )
+
+    for values_counts in result["facets"].values():
+        values_counts.sort(key=lambda item: (-item["count"], str(item["label"])))
+    return result
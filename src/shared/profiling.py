@@ -0,0 +1,339 @@
+"""
+Opt-in request profiler for superusers.
+
+A profiled request collects three timelines:
+
+* a sampled call stack of the thread serving the request,
+* every SQL statement sent to the database,
+* every template render (including ``{% include %}``),
+
+and stores them as a speedscope file (https://www.speedscope.app) in the
+default storage, under ``REQUEST_PROFILER_LOCATION``.
+"""
+
+import contextlib
+import json
+import logging
+import sys
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from contextvars import ContextVar
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+from django.template import base as template_base
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+PROFILE_SUFFIX = ".speedscope.json"
+PROFILE_TIME_FORMAT = "%Y%m%dT%H%M%S"
+MAX_STACK_DEPTH = 200
+MAX_EVENTS = 5000
+MAX_SQL_LENGTH = 300
+
+# Intervals (label, start, end) of the templates rendered by the profiled request
+_template_renders: ContextVar[list[tuple[str, float, float]] | None] = ContextVar(
+    "template_renders", default=None
+)
+# Only one request per process is profiled at a time, to bound the overhead
+_profiling = threading.Lock()
+
+
+def _timed_template_render(render: Callable) -> Callable:
+    def wrapper(self: template_base.Template, context: Any) -> str:
+        renders = _template_renders.get()
+        if renders is None:
+            return render(self, context)
+        start = time.perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            if len(renders) < MAX_EVENTS:
+                name = self.origin.template_name or self.name or "<string>"
+                renders.append((str(name), start, time.perf_counter()))
+
+    wrapper.profiled = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+def install_template_timer() -> None:
+    """Time template renders, only while a request is being profiled."""
+    render = template_base.Template.render
+    if not getattr(render, "profiled", False):
+        template_base.Template.render = _timed_template_render(render)
+
+
+class StackSampler(threading.Thread):
+    """Sample the call stack of a thread at a fixed interval."""
+
+    def __init__(self, thread_id: int, interval: float, max_samples: int) -> None:
+        super().__init__(daemon=True, name="request-profiler")
+        self.thread_id = thread_id
+        self.interval = interval
+        self.max_samples = max_samples
+        self.samples: list[tuple[tuple[str, str, int], ...]] = []
+        self.weights: list[float] = []
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            if frame is None or len(self.samples) >= self.max_samples:
+                break
+            stack = []
+            while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                code = frame.f_code
+                stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            self.samples.append(tuple(reversed(stack)))
+            self.weights.append(now - last)
+            last = now
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+class RequestProfile:
+    """Collect the timelines of a request and export them for speedscope."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.queries: list[tuple[str, float, float]] = []
+        self.templates: list[tuple[str, float, float]] = []
+        self.sampler = StackSampler(
+            threading.get_ident(),
+            interval=settings.REQUEST_PROFILER_INTERVAL_MS / 1000,
+            max_samples=settings.REQUEST_PROFILER_MAX_SAMPLES,
+        )
+        self.start = self.end = 0.0
+
+    def record_query(
+        self,
+        execute: Callable,
+        sql: str,
+        params: Any,
+        many: bool,
+        context: dict[str, Any],
+    ) -> Any:
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            if len(self.queries) < MAX_EVENTS:
+                self.queries.append(
+                    (" ".join(sql.split())[:MAX_SQL_LENGTH], start, time.perf_counter())
+                )
+
+    @contextlib.contextmanager
+    def collect(self) -> Iterator[None]:
+        install_template_timer()
+        token = _template_renders.set(self.templates)
+        self.start = time.perf_counter()
+        self.sampler.start()
+        try:
+            with contextlib.ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(self.record_query))
+                yield
+        finally:
+            self.end = time.perf_counter()
+            self.sampler.stop()
+            _template_renders.reset(token)
+
+    def elapsed(self, at: float) -> float:
+        return (at - self.start) * 1000
+
+    def sampled_profile(self, frames: "FrameIndex") -> dict[str, Any]:
+        return {
+            "type": "sampled",
+            "name": f"{self.name} (call stack)",
+            "unit": "milliseconds",
+            "startValue": 0,
+            "endValue": self.elapsed(self.end),
+            "samples": [
+                [frames.get(*frame) for frame in stack]
+                for stack in self.sampler.samples
+            ],
+            "weights": [weight * 1000 for weight in self.sampler.weights],
+        }
+
+    def evented_profile(
+        self,
+        label: str,
+        intervals: list[tuple[str, float, float]],
+        frames: "FrameIndex",
+    ) -> dict[str, Any]:
+        """
+        Build a speedscope evented profile, nested intervals
+        (e.g. included templates) are kept inside their parent.
+        """
+        events: list[dict[str, Any]] = []
+        stack: list[tuple[int, float]] = []
+        for name, start, end in sorted(intervals, key=lambda i: (i[1], -i[2])):
+            while stack and stack[-1][1] <= start:
+                frame, at = stack.pop()
+                events.append({"type": "C", "frame": frame, "at": self.elapsed(at)})
+            frame = frames.get(name, label, 0)
+            events.append({"type": "O", "frame": frame, "at": self.elapsed(start)})
+            stack.append((frame, min(end, stack[-1][1]) if stack else end))
+        while stack:
+            frame, at = stack.pop()
+            events.append({"type": "C", "frame": frame, "at": self.elapsed(at)})
+
+        return {
+            "type": "evented",
+            "name": f"{self.name} ({label})",
+            "unit": "milliseconds",
+            "startValue": 0,
+            "endValue": self.elapsed(self.end),
+            "events": events,
+        }
+
+    def to_speedscope(self) -> dict[str, Any]:
+        frames = FrameIndex()
+        profiles = [
+            self.sampled_profile(frames),
+            self.evented_profile("SQL", self.queries, frames),
+            self.evented_profile("templates", self.templates, frames),
+        ]
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": self.name,
+            "exporter": "genlab_bestilling",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames.frames},
+            "profiles": profiles,
+        }
+
+    def server_timing(self) -> str:
+        """Summary of the profile as a Server-Timing header value."""
+        sql = sum(end - start for _, start, end in self.queries) * 1000
+        templates = 0.0
+        last_end = 0.0
+        for _, start, end in sorted(self.templates, key=lambda i: (i[1], -i[2])):
+            # only count outermost renders, includes are part of their parent
+            if start >= last_end:
+                templates += (end - start) * 1000
+                last_end = end
+        return ", ".join(
+            [
+                f"total;dur={self.elapsed(self.end):.1f}",
+                f'sql;dur={sql:.1f};desc="{len(self.queries)} queries"',
+                f"templates;dur={templates:.1f}",
+            ]
+        )
+
+
+class FrameIndex:
+    """Shared frame table of a speedscope file."""
+
+    def __init__(self) -> None:
+        self.frames: list[dict[str, Any]] = []
+        self._index: dict[tuple[str, str, int], int] = {}
+
+    def get(self, name: str, file: str, line: int) -> int:
+        key = (name, file, line)
+        if key not in self._index:
+            self._index[key] = len(self.frames)
+            frame: dict[str, Any] = {"name": name, "file": file}
+            if line:
+                frame["line"] = line
+            self.frames.append(frame)
+        return self._index[key]
+
+
+def save_profile(profile: RequestProfile) -> str:
+    """Store the profile and prune the ones beyond the retention limits."""
+    name = default_storage.save(
+        f"{settings.REQUEST_PROFILER_LOCATION}/"
+        f"{timezone.now().strftime(PROFILE_TIME_FORMAT)}-{uuid.uuid4().hex[:8]}"
+        f"{PROFILE_SUFFIX}",
+        ContentFile(json.dumps(profile.to_speedscope()).encode()),
+    )
+    try:
+        prune_profiles()
+    except Exception:
+        logger.exception("Cannot prune the stored request profiles")
+    return name
+
+
+def list_profiles() -> list[str]:
+    """Names of the stored profiles, most recent first."""
+    location = settings.REQUEST_PROFILER_LOCATION
+    try:
+        _, files = default_storage.listdir(location)
+    except FileNotFoundError:
+        return []
+    return sorted(
+        (f"{location}/{file}" for file in files if file.endswith(PROFILE_SUFFIX)),
+        reverse=True,
+    )
+
+
+def prune_profiles() -> None:
+    profiles = list_profiles()
+    oldest = (
+        timezone.now() - timedelta(days=settings.REQUEST_PROFILER_RETENTION_DAYS)
+    ).strftime(PROFILE_TIME_FORMAT)
+    for index, name in enumerate(profiles):
+        created = name.rsplit("/", 1)[-1][: len(oldest)]
+        if index >= settings.REQUEST_PROFILER_MAX_PROFILES or created < oldest:
+            default_storage.delete(name)
+
+
+class ProfiledViewMixin:
+    """
+    Let superusers profile a request by adding ``?_profile=1``
+    to the url or by sending the ``X-Profile: 1`` header.
+
+    The name of the stored profile is returned in the ``X-Profile`` header
+    and a summary in the ``Server-Timing`` header.
+    """
+
+    profile_param = "_profile"
+    profile_header = "X-Profile"
+
+    def should_profile(self, request: HttpRequest) -> bool:
+        return (
+            settings.REQUEST_PROFILER_ENABLED
+            and request.user.is_superuser
+            and (
+                request.GET.get(self.profile_param) == "1"
+                or request.headers.get(self.profile_header) == "1"
+            )
+        )
+
+    def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        if not self.should_profile(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        if not _profiling.acquire(blocking=False):
+            response = super().dispatch(request, *args, **kwargs)
+            response[self.profile_header] = "busy"
+            return response
+
+        try:
+            profile = RequestProfile(f"{request.method} {request.path}")
+            with profile.collect():
+                response = super().dispatch(request, *args, **kwargs)
+                # template responses are lazy, render them while profiling
+                if hasattr(response, "render"):
+                    response.render()
+        finally:
+            _profiling.release()
+
+        response[self.profile_header] = save_profile(profile)
+        response["Server-Timing"] = profile.server_timing()
+        return response
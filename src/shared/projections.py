@@ -0,0 +1,130 @@
+"""
+Read-only serialization of large API lists without model instances.
+
+A ``Projection`` reads the rows of a list page with ``values()`` and builds
+the same dicts as the DRF serializer it stands for, loading the related
+rows it needs with one query per relation. Viewsets opt in with
+``ProjectedListMixin.projection_class``; the other actions and the
+``?since=`` sync (see ``staff.sync``) keep using the serializer.
+
+``FastJSONRenderer`` encodes such plain data with orjson, producing the
+same bytes as DRF's ``JSONRenderer``. orjson formats the floats its own way
+(``0.00001`` for ``1e-05``), so data with floats is left to ``JSONRenderer``.
+"""
+
+import operator
+from collections.abc import Callable, Iterable
+from typing import Any
+
+import orjson
+from django.db.models import QuerySet
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+
+class Projection:
+    """
+    ``output`` lists the keys of a row in the order of the serializer fields.
+    A key found in ``lookups`` is read from the ``values()`` column of that
+    lookup, any other key is computed by ``get_<key>(row)``, which can read
+    the ``columns`` as well. ``prepare`` receives the rows of the page first,
+    to load the related rows.
+    """
+
+    output: tuple[str, ...] = ()
+    lookups: dict[str, str] = {}
+    columns: tuple[str, ...] = ()
+
+    def __init__(self) -> None:
+        self.accessors: list[tuple[str, Callable[[dict[str, Any]], Any]]] = [
+            (
+                key,
+                operator.itemgetter(self.lookups[key])
+                if key in self.lookups
+                else getattr(self, f"get_{key}"),
+            )
+            for key in self.output
+        ]
+
+    def project(self, queryset: QuerySet) -> QuerySet:
+        # the annotations are kept for the cursor pagination to read the ordering
+        columns = {
+            *self.lookups.values(),
+            *self.columns,
+            *queryset.query.annotation_select,
+        }
+        return queryset.prefetch_related(None).values(*columns)
+
+    def prepare(self, rows: list[dict[str, Any]]) -> None:
+        pass
+
+    def serialize(self, rows: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+        rows = list(rows)
+        self.prepare(rows)
+        accessors = self.accessors
+        return [{key: get(row) for key, get in accessors} for row in rows]
+
+
+def has_floats(data: Any) -> bool:
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, float):
+            return True
+        if isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, list | tuple):
+            stack.extend(item)
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Same output as ``JSONRenderer``, encoded with orjson when the data
+    is made of plain JSON types other than floats only.
+    """
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: str | None = None,
+        renderer_context: dict[str, Any] | None = None,
+    ) -> bytes:
+        if (
+            data is None
+            or self.get_indent(accepted_media_type or "", renderer_context or {})
+            or has_floats(data)
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # escaped by JSONRenderer for the JavaScript parsers
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+
+
+class ProjectedListMixin:
+    """
+    List a viewset with ``projection_class`` (when set) instead of
+    the serializer, the filters and the pagination are applied as usual.
+    """
+
+    projection_class: type[Projection] | None = None
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        if self.projection_class is None:
+            return super().list(request, *args, **kwargs)  # type: ignore[misc]
+
+        projection = self.projection_class()
+        queryset = projection.project(
+            self.filter_queryset(self.get_queryset())  # type: ignore[attr-defined]
+        )
+        page = self.paginate_queryset(queryset)  # type: ignore[attr-defined]
+        if page is not None:
+            return self.get_paginated_response(projection.serialize(page))  # type: ignore[attr-defined]
+        return Response(projection.serialize(queryset))
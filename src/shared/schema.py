@@ -0,0 +1,97 @@
+"""
+The OpenAPI schema of the API.
+
+Generating it introspects every serializer, so it is built once per release
+by ``manage.py build_api_schema`` into ``settings.API_SCHEMA_FILE`` and
+served from that file, identified by the hash of its content.
+With ``DEBUG`` it is generated by the first request of the process instead
+(the development server restarts on code changes), and again on demand
+with ``?regenerate=1``.
+"""
+
+import functools
+import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Self
+
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import AllowAny
+from rest_framework.request import Request
+from rest_framework.views import APIView
+
+from .views import ReadOnlyRequestMixin
+
+CONTENT_TYPE = "application/vnd.oai.openapi+json"
+
+
+@dataclass(frozen=True)
+class ApiSchema:
+    version: str
+    content: bytes
+
+    @classmethod
+    def from_content(cls, content: bytes) -> Self:
+        return cls(version=hashlib.sha256(content).hexdigest()[:16], content=content)
+
+
+def generate_schema() -> ApiSchema:
+    # drf-spectacular is only imported to generate the schema
+    from drf_spectacular.renderers import OpenApiJsonRenderer  # noqa: PLC0415
+    from drf_spectacular.settings import spectacular_settings  # noqa: PLC0415
+
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(request=None, public=True)
+    return ApiSchema.from_content(
+        OpenApiJsonRenderer().render(schema, renderer_context={})
+    )
+
+
+@functools.cache
+def load_schema(path: str) -> ApiSchema:
+    return ApiSchema.from_content(Path(path).read_bytes())
+
+
+@functools.cache
+def generated_schema() -> ApiSchema:
+    return generate_schema()
+
+
+def get_schema(*, regenerate: bool = False) -> ApiSchema:
+    """
+    The built schema, or the generated one with ``DEBUG``.
+    Raises FileNotFoundError if the schema is not built.
+    """
+    if settings.DEBUG:
+        if regenerate:
+            generated_schema.cache_clear()
+        return generated_schema()
+    return load_schema(settings.API_SCHEMA_FILE)
+
+
+class ApiSchemaView(ReadOnlyRequestMixin, APIView):
+    """
+    The OpenAPI schema (see ``shared.schema``), revalidated by its ETag.
+    """
+
+    # same as drf-spectacular's SERVE_PERMISSIONS
+    permission_classes = [AllowAny]
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> HttpResponse:
+        try:
+            schema = get_schema(regenerate="regenerate" in request.query_params)
+        except FileNotFoundError as e:
+            msg = "The API schema is not built, run manage.py build_api_schema."
+            raise NotFound(msg) from e
+
+        etag = f'"{schema.version}"'
+        if etag in request.headers.get("If-None-Match", ""):
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = HttpResponse(schema.content, content_type=CONTENT_TYPE)
+        response["ETag"] = etag
+        response["Cache-Control"] = "public, no-cache"
+        return response
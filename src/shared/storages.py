@@ -0,0 +1,45 @@
+from typing import Any
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import FileSystemStorage
+from django.urls import reverse
+
+
+class LocalDirectTransferStorage(FileSystemStorage):
+    """
+    FileSystemStorage with the presigned transfer API of
+    ``config.storages.MediaRootS3Boto3Storage``.
+
+    Stand-in for local runs and tests: the "presigned" upload url points to
+    ``shared.views.LocalDirectUploadView`` and carries a signed token instead
+    of an S3 policy.
+    """
+
+    UPLOAD_SALT = "shared.storages.upload"
+
+    def presigned_upload(
+        self, name: str, *, max_size: int, expires_in: int
+    ) -> dict[str, Any]:
+        # the view saves the file with a storage of the same location
+        token = signing.dumps(
+            {"name": name, "max_size": max_size, "location": self.location},
+            salt=self.UPLOAD_SALT,
+        )
+        return {
+            "method": "POST",
+            "url": reverse("direct-upload", kwargs={"token": token}),
+            "fields": {},
+        }
+
+    def presigned_download(
+        self, name: str, *, expires_in: int, filename: str | None = None
+    ) -> str:
+        return self.url(name)
+
+    @classmethod
+    def load_upload_token(cls, token: str) -> dict[str, Any]:
+        """Raises signing.BadSignature if the token is forged or expired."""
+        return signing.loads(
+            token, salt=cls.UPLOAD_SALT, max_age=settings.DIRECT_TRANSFER_EXPIRY
+        )
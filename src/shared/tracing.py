@@ -0,0 +1,154 @@
+"""
+Spans around domain operations whose cost grows with the data.
+
+A span is reported as a Sentry performance span (when Sentry is configured)
+and as a structured log line on the ``genlab.tracing`` logger, e.g.::
+
+    operation=plate.populate duration_ms=12.3 plate_id=... item_count=40
+
+Whether an operation is traced is sampled per call, with the rates
+configured in ``TRACING_SAMPLE_RATES`` (``"default"`` applies to the
+operations that are not listed).
+"""
+
+import contextlib
+import functools
+import logging
+import random
+import time
+from collections.abc import Callable, Iterator
+from contextvars import ContextVar
+from typing import Any
+
+from django.conf import settings
+
+logger = logging.getLogger("genlab.tracing")
+
+
+class Span:
+    def __init__(self, operation: str, attributes: dict[str, Any]) -> None:
+        self.operation = operation
+        self.attributes = attributes
+        self.sentry_span: Any = None
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+        if self.sentry_span is not None:
+            for key, value in attributes.items():
+                self.sentry_span.set_data(key, value)
+
+
+class _NoopSpan(Span):
+    def set(self, **attributes: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan("noop", {})
+_current_span: ContextVar[Span] = ContextVar("current_span", default=_NOOP_SPAN)
+
+
+def current_span() -> Span:
+    """The innermost span being recorded, a no-op span if none is."""
+    return _current_span.get()
+
+
+def is_sampled(operation: str) -> bool:
+    rates = settings.TRACING_SAMPLE_RATES
+    rate = rates.get(operation, rates.get("default", 0))
+    return rate >= 1 or random.random() < rate  # noqa: S311
+
+
+@contextlib.contextmanager
+def _sentry_span(span: Span) -> Iterator[None]:
+    if not getattr(settings, "SENTRY_DSN", None):
+        yield
+        return
+
+    import sentry_sdk  # noqa: PLC0415
+
+    with sentry_sdk.start_span(op=span.operation) as sentry_span:
+        span.sentry_span = sentry_span
+        for key, value in span.attributes.items():
+            sentry_span.set_data(key, value)
+        yield
+
+
+def _format(value: Any) -> str:
+    value = str(value)
+    return f'"{value}"' if " " in value or not value else value
+
+
+@contextlib.contextmanager
+def span(operation: str, **attributes: Any) -> Iterator[Span]:
+    """
+    Time the wrapped block as ``operation``, more attributes
+    can be added with ``Span.set`` while the block runs.
+    """
+    if not is_sampled(operation):
+        with _skip() as current:
+            yield current
+        return
+
+    with _record(operation, attributes) as current:
+        yield current
+
+
+@contextlib.contextmanager
+def _skip() -> Iterator[Span]:
+    # attributes set in an unsampled operation must not leak to its parent
+    token = _current_span.set(_NOOP_SPAN)
+    try:
+        yield _NOOP_SPAN
+    finally:
+        _current_span.reset(token)
+
+
+@contextlib.contextmanager
+def _record(operation: str, attributes: dict[str, Any]) -> Iterator[Span]:
+    current = Span(operation, attributes)
+    token = _current_span.set(current)
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        with _sentry_span(current):
+            yield current
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        duration = (time.perf_counter() - start) * 1000
+        _current_span.reset(token)
+        fields = {"duration_ms": round(duration, 1), "status": status}
+        fields.update(current.attributes)
+        logger.info(
+            "operation=%s %s",
+            operation,
+            " ".join(f"{key}={_format(value)}" for key, value in fields.items()),
+            extra={"operation": operation, "span": fields},
+        )
+
+
+def traced(
+    operation: str,
+    attributes: Callable[..., dict[str, Any]] | None = None,
+) -> Callable:
+    """
+    Decorate a function to run it inside ``span(operation)``.
+
+    ``attributes`` receives the arguments of the call and returns
+    the initial attributes of the span.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not is_sampled(operation):
+                with _skip():
+                    return func(*args, **kwargs)
+            initial = attributes(*args, **kwargs) if attributes else {}
+            with _record(operation, initial):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,123 @@
+import uuid
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core import signing
+from django.db import models, transaction
+from django.db.models.fields.files import FieldFile
+
+
+class DirectFileTransfer:
+    """
+    Presigned upload and download of a FileField, bypassing the app server.
+
+    1. ``start_upload`` returns where the browser should POST the file
+       (with ``fields`` as extra form fields and the file as ``file``),
+       plus a signed token.
+    2. once the upload is done, ``finalize`` checks the token and the
+       stored object and registers it on the instance.
+
+    The storage of the field must implement ``presigned_upload`` and
+    ``presigned_download`` (see ``config.storages`` and ``shared.storages``).
+    """
+
+    SALT = "shared.transfers"
+
+    class TransferError(Exception):
+        """Raised when a transfer cannot be started or finalized."""
+
+    def __init__(
+        self,
+        instance: models.Model,
+        field_name: str,
+        *,
+        max_size: int,
+        extensions: tuple[str, ...] | None = None,
+    ) -> None:
+        self.instance = instance
+        self.field_name = field_name
+        self.field = instance._meta.get_field(field_name)
+        self.max_size = max_size
+        self.extensions = extensions
+
+    @property
+    def storage(self) -> Any:
+        storage = self.field.storage
+        if not hasattr(storage, "presigned_upload"):
+            msg = "The storage does not support direct transfers"
+            raise self.TransferError(msg)
+        return storage
+
+    @property
+    def file(self) -> FieldFile:
+        return getattr(self.instance, self.field_name)
+
+    def get_target(self) -> dict[str, str]:
+        return {
+            "model": self.instance._meta.label_lower,
+            "pk": str(self.instance.pk),
+            "field": self.field_name,
+        }
+
+    def get_upload_name(self, filename: str) -> str:
+        """
+        Build the object name from the field ``upload_to``, with a random
+        suffix so that the current file stays untouched until finalized.
+        """
+        path = Path(self.field.generate_filename(self.instance, filename))
+        return str(path.with_name(f"{path.stem}-{uuid.uuid4().hex[:8]}{path.suffix}"))
+
+    def start_upload(self, filename: str) -> dict[str, Any]:
+        extension = Path(filename).suffix.lower()
+        if self.extensions and extension not in self.extensions:
+            allowed = ", ".join(self.extensions)
+            msg = f"Files of type '{extension}' are not allowed. Allowed: {allowed}"
+            raise self.TransferError(msg)
+
+        name = self.get_upload_name(filename)
+        upload = self.storage.presigned_upload(
+            name, max_size=self.max_size, expires_in=settings.DIRECT_TRANSFER_EXPIRY
+        )
+        token = signing.dumps({**self.get_target(), "name": name}, salt=self.SALT)
+        return {"upload": upload, "token": token, "max_size": self.max_size}
+
+    def finalize(self, token: str) -> FieldFile:
+        try:
+            data = signing.loads(
+                token, salt=self.SALT, max_age=settings.DIRECT_TRANSFER_EXPIRY
+            )
+        except signing.BadSignature as e:
+            msg = "Invalid or expired upload token"
+            raise self.TransferError(msg) from e
+
+        name = data.pop("name")
+        if data != self.get_target():
+            msg = "The upload token belongs to another file"
+            raise self.TransferError(msg)
+
+        storage = self.storage
+        if not storage.exists(name):
+            msg = "The file has not been uploaded"
+            raise self.TransferError(msg)
+        if storage.size(name) > self.max_size:
+            storage.delete(name)
+            msg = f"The file exceeds the maximum size of {self.max_size} bytes"
+            raise self.TransferError(msg)
+
+        previous = self.file.name
+        setattr(self.instance, self.field_name, name)
+        self.instance.save(update_fields=[self.field_name])
+        if previous and previous != name:
+            transaction.on_commit(lambda: storage.delete(previous))
+        return self.file
+
+    def download_url(self) -> str:
+        if not self.file:
+            msg = "There is no file to download"
+            raise self.TransferError(msg)
+        return self.storage.presigned_download(
+            self.file.name,
+            expires_in=settings.DIRECT_TRANSFER_EXPIRY,
+            filename=Path(self.file.name).name,
+        )
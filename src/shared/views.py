@@ -1,5 +1,16 @@
+import functools
+from collections.abc import Callable
+from typing import Any
+
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import HttpRequest, HttpResponse
+from django.core import signing
+from django.db import connection, transaction
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.utils.decorators import method_decorator
+from django.utils.module_loading import import_string
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from django.views.generic import (
     CreateView,
     FormView,
@@ -10,7 +21,61 @@ from formset.views import (
     IncompleteSelectResponseMixin,
 )
 
+from .db import forbid_writes
 from .forms import ActionForm
+from .storages import LocalDirectTransferStorage
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def lazy_view(view_path: str, **initkwargs: Any) -> Callable[..., HttpResponse]:
+    """
+    ``as_view(**initkwargs)`` of the class based view at ``view_path``,
+    imported by its first request instead of with the URLconf.
+
+    Meant for the read-only views of heavy optional subsystems (e.g. the
+    API schema): the attributes ``as_view`` sets on the view, like
+    ``csrf_exempt``, are not seen by the middlewares.
+    """
+
+    @functools.cache
+    def get_view() -> Callable[..., HttpResponse]:
+        return import_string(view_path).as_view(**initkwargs)
+
+    def view(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        return get_view()(request, *args, **kwargs)
+
+    return view
+
+
+class ReadOnlyRequestMixin:
+    """
+    Serve safe requests (GET, HEAD, OPTIONS) outside of ``ATOMIC_REQUESTS``.
+
+    Rendering large tables inside the request transaction keeps a snapshot
+    open for the whole render, so read-only views run in autocommit instead.
+    Any other method is still wrapped in a transaction, as before.
+
+    Works for both django views and DRF views/viewsets.
+    With ``settings.READ_ONLY_REQUESTS_STRICT`` any write issued while
+    serving a safe request raises ``WriteInReadOnlyRequest``.
+    """
+
+    @classmethod
+    def as_view(cls, *args: Any, **initkwargs: Any) -> Callable:
+        view = super().as_view(*args, **initkwargs)  # type: ignore[misc]
+        return transaction.non_atomic_requests(view)
+
+    def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> Any:
+        if request.method not in SAFE_METHODS:
+            with transaction.atomic():
+                return super().dispatch(request, *args, **kwargs)  # type: ignore[misc]
+
+        if not settings.READ_ONLY_REQUESTS_STRICT:
+            return super().dispatch(request, *args, **kwargs)  # type: ignore[misc]
+
+        with connection.execute_wrapper(forbid_writes):
+            return super().dispatch(request, *args, **kwargs)  # type: ignore[misc]
 
 
 class FormsetCreateView(
@@ -39,3 +104,29 @@ class ActionView(FormView):
 
     def get_success_url(self) -> str:
         return self.request.path_info
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class LocalDirectUploadView(View):
+    """
+    Receive the uploads presigned by LocalDirectTransferStorage.
+
+    The signed token in the url grants the upload, mimicking an S3 presigned
+    POST; only mounted when a storage is a LocalDirectTransferStorage
+    (local runs and tests).
+    """
+
+    def post(self, request: HttpRequest, token: str) -> HttpResponse:
+        try:
+            data = LocalDirectTransferStorage.load_upload_token(token)
+        except signing.BadSignature:
+            return JsonResponse({"error": "Invalid or expired token"}, status=403)
+
+        file = request.FILES.get("file")
+        if file is None:
+            return JsonResponse({"error": "No file provided"}, status=400)
+        if file.size > data["max_size"]:
+            return JsonResponse({"error": "File too large"}, status=400)
+
+        LocalDirectTransferStorage(location=data["location"]).save(data["name"], file)
+        return HttpResponse(status=204)
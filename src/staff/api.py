@@ -1,10 +1,15 @@
+import hashlib
+import json
+
 from django.contrib import messages
+from django.core.cache import cache
 from django.db import transaction
 from django.db.models import Count, F, Prefetch, Q
 from django.db.models.query import QuerySet
 from django.shortcuts import get_object_or_404
 from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter
 from rest_framework.pagination import CursorPagination, LimitOffsetPagination
 from rest_framework.permissions import BasePermission
@@ -18,13 +23,19 @@ from genlab_bestilling.models import (
     AnalysisPlate,
     ExtractionPlate,
     Order,
+    Plate,
     PlatePosition,
     PositiveControl,
     Sample,
     SampleMarkerAnalysis,
 )
+from genlab_bestilling.search import search
+from shared.projections import ProjectedListMixin
+from shared.transfers import DirectFileTransfer
+from shared.views import ReadOnlyRequestMixin
 
 from .filters import AnalysisPlateAPIFilter, SampleMarkerAnalysisAPIFilter
+from .projections import OrderSampleMarkerProjection
 from .serializers import (
     AnalysisOrderListSerializer,
     AnalysisPlateListSerializer,
@@ -32,7 +43,9 @@ from .serializers import (
     PlatePositionSerializer,
     PlateRowColumnSerializer,
     PositiveControlSerializer,
+    SearchEntrySerializer,
 )
+from .sync import DeltaSyncMixin
 
 
 class IsGenlabStaffOrSuperuser(BasePermission):
@@ -87,7 +100,29 @@ class OrderAPIView(APIView):
             )
 
 
-class PlatePositionViewSet(viewsets.ModelViewSet):
+class SearchAPIView(ReadOnlyRequestMixin, APIView):
+    """
+    Search samples, orders, plates and projects with ``?q=``.
+
+    ``exact`` tells whether the results have the identifier that was
+    searched for, ``timed_out`` whether the search ran out of time.
+    """
+
+    permission_classes = [IsGenlabStaffOrSuperuser]
+
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        results = search(request.query_params.get("q", ""))
+        return Response(
+            {
+                "query": results.query,
+                "exact": results.exact,
+                "timed_out": results.timed_out,
+                "results": SearchEntrySerializer(results.entries, many=True).data,
+            }
+        )
+
+
+class PlatePositionViewSet(ReadOnlyRequestMixin, DeltaSyncMixin, viewsets.ModelViewSet):
     """ViewSet for managing plate positions."""
 
     permission_classes = [IsGenlabStaffOrSuperuser]
@@ -104,6 +139,15 @@ class PlatePositionViewSet(viewsets.ModelViewSet):
     ).all()
     serializer_class = PlatePositionSerializer
     filterset_fields = ["plate"]
+    sync_parent_field = "plate_id"
+
+    def get_sync_parent_ids(self) -> list[str] | None:
+        plate = self.request.query_params.get("plate")
+        return [plate] if plate else None
+
+    def get_changed_filter(self, xid: int) -> Q:
+        # the positions are serialized with their sample marker
+        return super().get_changed_filter(xid) | Q(sample_marker__change_xid__gte=xid)
 
     @action(detail=True, methods=["post"])
     def reserve(self, request: Request, pk: int | str) -> Response:
@@ -381,7 +425,7 @@ class PlatePositionViewSet(viewsets.ModelViewSet):
             )
 
 
-class PositiveControlViewSet(viewsets.ReadOnlyModelViewSet):
+class PositiveControlViewSet(ReadOnlyRequestMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for listing positive control options."""
 
     permission_classes = [IsGenlabStaffOrSuperuser]
@@ -389,13 +433,35 @@ class PositiveControlViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = PositiveControlSerializer
 
 
-class AnalysisOrderSampleMarkerViewSet(viewsets.ReadOnlyModelViewSet):
+class SampleMarkerDeltaSyncMixin(DeltaSyncMixin):
+    sync_parent_field = "order_id"
+
+    def get_changed_filter(self, xid: int) -> Q:
+        # the sample markers are serialized with their positions and plates
+        return super().get_changed_filter(xid) | Q(
+            pk__in=PlatePosition.objects.filter(
+                Q(change_xid__gte=xid) | Q(plate__change_xid__gte=xid),
+                sample_marker__isnull=False,
+            ).values("sample_marker_id")
+        )
+
+
+class AnalysisOrderSampleMarkerViewSet(
+    ReadOnlyRequestMixin,
+    SampleMarkerDeltaSyncMixin,
+    ProjectedListMixin,
+    viewsets.ReadOnlyModelViewSet,
+):
     """Staff API for listing sample markers of an analysis order."""
 
     permission_classes = [IsGenlabStaffOrSuperuser]
     serializer_class = OrderSampleMarkerSerializer
+    projection_class = OrderSampleMarkerProjection
     filterset_class = SampleMarkerAnalysisAPIFilter
 
+    def get_sync_parent_ids(self) -> list[int]:
+        return [self.kwargs["order_pk"]]
+
     def get_queryset(self) -> QuerySet[SampleMarkerAnalysis]:
         order = get_object_or_404(AnalysisOrder, pk=self.kwargs["order_pk"])
         # Prefetch positions with plate fields annotated to avoid N+1 from polymorphic
@@ -483,14 +549,29 @@ class SampleMarkerCursorPagination(CursorPagination):
         return ("id",)
 
 
-class SampleMarkerViewSet(viewsets.ReadOnlyModelViewSet):
+class SampleMarkerViewSet(
+    ReadOnlyRequestMixin,
+    SampleMarkerDeltaSyncMixin,
+    ProjectedListMixin,
+    viewsets.ReadOnlyModelViewSet,
+):
     """Staff API for listing all sample markers with optional filters."""
 
     permission_classes = [IsGenlabStaffOrSuperuser]
     serializer_class = OrderSampleMarkerSerializer
+    projection_class = OrderSampleMarkerProjection
     filterset_class = SampleMarkerAnalysisAPIFilter
     pagination_class = SampleMarkerCursorPagination
 
+    facets_cache_timeout = 30
+
+    def get_sync_parent_ids(self) -> list[str] | None:
+        order = self.request.query_params.get("order")
+        return [order] if order else None
+
+    def get_base_queryset(self) -> QuerySet[SampleMarkerAnalysis]:
+        return SampleMarkerAnalysis.objects.exclude(sample__is_invalid=True)
+
     def get_queryset(self) -> QuerySet[SampleMarkerAnalysis]:
         # Prefetch positions with plate fields annotated to avoid N+1 from polymorphic
         positions_prefetch = Prefetch(
@@ -502,7 +583,7 @@ class SampleMarkerViewSet(viewsets.ReadOnlyModelViewSet):
             ),
         )
         return (
-            SampleMarkerAnalysis.objects.exclude(sample__is_invalid=True)
+            self.get_base_queryset()
             .select_related(
                 "sample",
                 "sample__species",
@@ -528,8 +609,37 @@ class SampleMarkerViewSet(viewsets.ReadOnlyModelViewSet):
             )
         )
 
+    @action(detail=False, methods=["get"])
+    def facets(self, request: Request) -> Response:
+        """
+        Values and counts of the marker, species, sample type and extraction
+        status filters for the current filters, each facet being counted
+        without its own filter.
+        """
+        filterset = self.filterset_class(
+            request.query_params, queryset=self.get_base_queryset(), request=request
+        )
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
 
-class AnalysisOrdersListViewSet(viewsets.ReadOnlyModelViewSet):
+        payload = json.dumps(
+            {
+                name: value
+                for name, value in filterset.form.cleaned_data.items()
+                if value not in (None, "")
+            },
+            sort_keys=True,
+            default=str,
+        )
+        key = f"sample-marker-facets:{hashlib.sha256(payload.encode()).hexdigest()}"
+        facets = cache.get(key)
+        if facets is None:
+            facets = filterset.get_facets(self.get_base_queryset())
+            cache.set(key, facets, self.facets_cache_timeout)
+        return Response(facets)
+
+
+class AnalysisOrdersListViewSet(ReadOnlyRequestMixin, viewsets.ReadOnlyModelViewSet):
     """Staff API for listing analysis orders (for filter dropdowns)."""
 
     permission_classes = [IsGenlabStaffOrSuperuser]
@@ -633,6 +743,8 @@ class PlateRowColumnActionsMixin:
 
 
 class AnalysisPlatesViewSet(
+    ReadOnlyRequestMixin,
+    DeltaSyncMixin,
     PlateRowColumnActionsMixin,
     mixins.CreateModelMixin,
     mixins.UpdateModelMixin,
@@ -661,8 +773,10 @@ class AnalysisPlatesViewSet(
     serializer_class = AnalysisPlateListSerializer
     filterset_class = AnalysisPlateAPIFilter
     pagination_class = LimitOffsetPagination
+    sync_deleted_table = Plate._meta.db_table
 
     MAX_REPLICATES = 12
+    RESULT_FILE_MAX_SIZE = 200 * 1024 * 1024
 
     @action(detail=True, methods=["post"], url_path="add-sample-markers")
     def add_sample_markers(self, request: Request, pk: str) -> Response:
@@ -780,14 +894,87 @@ class AnalysisPlatesViewSet(
         plate.result_file = result_file
         plate.save(update_fields=["result_file"])
 
+        data = {
+            "message": "Result file uploaded",
+            "result_file": plate.result_file.url if plate.result_file else None,
+        }
+        # The file is kept even if it cannot be parsed, staff can still
+        # update the sample markers by hand
+        try:
+            data["results"] = plate.ingest_result_file()
+        except AnalysisPlate.InvalidResultFile as e:
+            data["ingestion_error"] = str(e)
+
+        return Response(data, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["post"], url_path="ingest-result-file")
+    def ingest_result_file(self, request: Request, pk: str) -> Response:
+        """Parse the stored result file again and update the sample markers."""
+        plate = self.get_object()
+        try:
+            results = plate.ingest_result_file()
+        except AnalysisPlate.InvalidResultFile as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
         return Response(
-            {
-                "message": "Result file uploaded",
-                "result_file": plate.result_file.url if plate.result_file else None,
-            },
+            {"message": "Result file ingested", "results": results},
             status=status.HTTP_200_OK,
         )
 
+    def get_result_file_transfer(self, plate: AnalysisPlate) -> DirectFileTransfer:
+        return DirectFileTransfer(
+            plate, "result_file", max_size=self.RESULT_FILE_MAX_SIZE
+        )
+
+    @action(detail=True, methods=["post"], url_path="result-file/upload-url")
+    def result_file_upload_url(self, request: Request, pk: str) -> Response:
+        """Presign a direct upload of the result file to the storage."""
+        filename = request.data.get("filename")
+        if not filename:
+            return Response(
+                {"error": "No filename provided"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        transfer = self.get_result_file_transfer(self.get_object())
+        try:
+            data = transfer.start_upload(filename)
+        except DirectFileTransfer.TransferError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(data, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["post"], url_path="result-file/finalize")
+    def result_file_finalize(self, request: Request, pk: str) -> Response:
+        """Register a result file uploaded directly to the storage."""
+        plate = self.get_object()
+        try:
+            self.get_result_file_transfer(plate).finalize(request.data.get("token", ""))
+        except DirectFileTransfer.TransferError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        data = {"message": "Result file uploaded", "result_file": plate.result_file.url}
+        try:
+            data["results"] = plate.ingest_result_file()
+        except AnalysisPlate.InvalidResultFile as e:
+            data["ingestion_error"] = str(e)
+
+        return Response(data, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["get"], url_path="result-file/download-url")
+    def result_file_download_url(self, request: Request, pk: str) -> Response:
+        """Presign a direct download of the result file from the storage."""
+        transfer = self.get_result_file_transfer(self.get_object())
+        try:
+            url = transfer.download_url()
+        except DirectFileTransfer.TransferError as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response({"url": url}, status=status.HTTP_200_OK)
+
     @action(detail=True, methods=["post"], url_path="delete-result-file")
     def delete_result_file(self, request: Request, pk: str) -> Response:
         """Delete the result file for a plate."""
@@ -795,7 +982,9 @@ class AnalysisPlatesViewSet(
         if plate.result_file:
             plate.result_file.delete(save=False)
         plate.result_file = None
-        plate.save(update_fields=["result_file"])
+        if plate.extra:
+            plate.extra.pop("results", None)
+        plate.save(update_fields=["result_file", "extra"])
 
         return Response(
             {"message": "Result file deleted"},
@@ -820,7 +1009,7 @@ class AnalysisPlatesViewSet(
 
 
 class ExtractionPlatesViewSet(
-    PlateRowColumnActionsMixin, viewsets.ReadOnlyModelViewSet
+    ReadOnlyRequestMixin, PlateRowColumnActionsMixin, viewsets.ReadOnlyModelViewSet
 ):
     """List all extraction plates."""
 
@@ -14,17 +14,17 @@ from genlab_bestilling.models import (
     AnalysisOrder,
     AnalysisPlate,
     Area,
-    EquipmentOrder,
-    ExtractionOrder,
     ExtractionPlate,
     IsolationMethod,
     Marker,
+    OrderListing,
     Sample,
     SampleMarkerAnalysis,
     SampleType,
     Species,
 )
 from nina.models import Project
+from shared.facets import Facet, facet_counts
 from staff.mixins import HideStatusesByDefaultMixin
 
 CUSTOM_ORDER_STATUS_CHOICES = [
@@ -111,6 +111,18 @@ def filter_order_by_sample_id(queryset: QuerySet, name: str, value: str) -> Quer
     return queryset.filter_by_sample_id(value)
 
 
+def filter_order_by_responsible_staff(
+    queryset: QuerySet, name: str, value: QuerySet[User]
+) -> QuerySet:
+    """
+    Filter orders assigned to any of the selected staff members.
+    """
+    if not value:
+        return queryset
+
+    return queryset.filter_by_responsible_staff(value)
+
+
 class AnalysisOrderFilter(HideStatusesByDefaultMixin, filters.FilterSet):
     id = filters.CharFilter(
         label="Order ID",
@@ -161,6 +173,7 @@ class AnalysisOrderFilter(HideStatusesByDefaultMixin, filters.FilterSet):
 
     responsible_staff = filters.ModelMultipleChoiceFilter(
         field_name="responsible_staff",
+        method=filter_order_by_responsible_staff,
         label="Assigned Staff",
         queryset=User.objects.filter(groups__name="genlab"),
         widget=autocomplete.ModelSelect2Multiple(
@@ -181,6 +194,7 @@ class AnalysisOrderFilter(HideStatusesByDefaultMixin, filters.FilterSet):
 
     markers = filters.ModelMultipleChoiceFilter(
         field_name="markers",
+        method="filter_markers",
         label="Markers",
         queryset=Marker.objects.all(),
         widget=autocomplete.ModelSelect2Multiple(
@@ -194,8 +208,16 @@ class AnalysisOrderFilter(HideStatusesByDefaultMixin, filters.FilterSet):
         queryset = super().qs
         return self.exclude_hidden_statuses(queryset, self.data)
 
+    def filter_markers(
+        self, queryset: QuerySet, name: str, value: QuerySet[Marker]
+    ) -> QuerySet:
+        if not value:
+            return queryset
+        with_markers = AnalysisOrder.markers.through.objects.filter(marker__in=value)
+        return queryset.filter(id__in=with_markers.values("analysisorder_id"))
+
     class Meta:
-        model = AnalysisOrder
+        model = OrderListing
         fields = (
             "id",
             "sample_id",
@@ -244,6 +266,7 @@ class EquipmentOrderFilter(HideStatusesByDefaultMixin, filters.FilterSet):
 
     responsible_staff = filters.ModelMultipleChoiceFilter(
         field_name="responsible_staff",
+        method=filter_order_by_responsible_staff,
         label="Assigned Staff",
         queryset=User.objects.filter(groups__name="genlab"),
         widget=autocomplete.ModelSelect2Multiple(
@@ -258,7 +281,7 @@ class EquipmentOrderFilter(HideStatusesByDefaultMixin, filters.FilterSet):
         return self.exclude_hidden_statuses(queryset, self.data)
 
     class Meta:
-        model = EquipmentOrder
+        model = OrderListing
         fields = (
             "id",
             "status",
@@ -318,6 +341,7 @@ class ExtractionOrderFilter(HideStatusesByDefaultMixin, filters.FilterSet):
 
     responsible_staff = filters.ModelMultipleChoiceFilter(
         field_name="responsible_staff",
+        method=filter_order_by_responsible_staff,
         label="Assigned Staff",
         queryset=User.objects.filter(groups__name="genlab"),
         widget=autocomplete.ModelSelect2Multiple(
@@ -342,7 +366,7 @@ class ExtractionOrderFilter(HideStatusesByDefaultMixin, filters.FilterSet):
         return self.exclude_hidden_statuses(queryset, self.data)
 
     class Meta:
-        model = ExtractionOrder
+        model = OrderListing
         fields = (
             "id",
             "sample_id",
@@ -422,26 +446,20 @@ class SampleAnalysisStatusWidget(forms.Select):
         super().__init__(choices=choices, attrs=attrs)
 
 
+# marked: not plucked nor isolated, plucked: not isolated,
+# isolated: regardless of the others (see Sample.status_rank)
+SAMPLE_STATUS_RANKS = {
+    "marked": Sample.StatusRank.MARKED,
+    "plucked": Sample.StatusRank.PLUCKED,
+    "isolated": Sample.StatusRank.ISOLATED,
+}
+
+
 def filter_sample_status(
     filter_set: Any, queryset: QuerySet, name: Any, value: str, prefix: str = ""
 ) -> QuerySet:
-    if value == "marked":
-        # Only marked, not plucked or isolated
-        return queryset.filter(
-            **{
-                prefix + "is_marked": True,
-                prefix + "is_plucked": False,
-                prefix + "is_isolated": False,
-            }
-        )
-    if value == "plucked":
-        # Plucked but not isolated
-        return queryset.filter(
-            **{prefix + "is_plucked": True, prefix + "is_isolated": False}
-        )
-    if value == "isolated":
-        # All isolated samples, regardless of others
-        return queryset.filter(**{prefix + "is_isolated": True})
+    if value in SAMPLE_STATUS_RANKS:
+        return queryset.filter(**{prefix + "status_rank": SAMPLE_STATUS_RANKS[value]})
     return queryset
 
 
@@ -450,12 +468,12 @@ class SampleMarkerOrderFilter(filters.FilterSet):
         label="Search",
         method="filter_search",
         help_text=(
-            "Matches any sample whose Genlab ID, name, or GUID contains "
-            "the given text (case-insensitive, partial matches allowed)."
+            "Matches any sample whose Genlab ID, bird ID, fish ID, name, or GUID "
+            "contains the given text (case-insensitive, partial matches allowed)."
         ),
         widget=forms.TextInput(
             attrs={
-                "placeholder": "Search by Genlab ID, name or GUID",
+                "placeholder": "Search by Genlab ID, bird ID, name or GUID",
             }
         ),
     )
@@ -545,12 +563,12 @@ class SampleFilter(filters.FilterSet):
         label="Search",
         method="filter_search",
         help_text=(
-            "Matches any sample whose Genlab ID, name, or GUID contains "
-            "the given text (case-insensitive, partial matches allowed)."
+            "Matches any sample whose Genlab ID, bird ID, fish ID, name, or GUID "
+            "contains the given text (case-insensitive, partial matches allowed)."
         ),
         widget=forms.TextInput(
             attrs={
-                "placeholder": "Search by Genlab ID, name or GUID",
+                "placeholder": "Search by Genlab ID, bird ID, name or GUID",
             }
         ),
     )
@@ -595,6 +613,7 @@ class SampleFilter(filters.FilterSet):
         )
         self.filters["location"].extra["widget"] = autocomplete.ModelSelect2(
             url="autocomplete:location",
+            forward=["species"],
             attrs={"data-placeholder": "Filter by location"},
         )
 
@@ -948,6 +967,16 @@ class AnalysisPlateFilter(filters.FilterSet):
 class SampleMarkerAnalysisAPIFilter(filters.FilterSet):
     """Filter for SampleMarkerAnalysis API."""
 
+    # Filters counted by the facets endpoint, with their value and label fields
+    facet_fields = {
+        "marker": Facet(value="marker_id", label="marker_id"),
+        "species": Facet(value="sample__species_id", label="sample__species__name"),
+        "sample_type": Facet(value="sample__type_id", label="sample__type__name"),
+        "extraction_status": Facet(
+            value="sample__status_rank", label="sample__status_rank"
+        ),
+    }
+
     order = filters.NumberFilter(field_name="order_id")
     marker = CharFilter(field_name="marker__name")
     species = filters.NumberFilter(field_name="sample__species_id")
@@ -978,6 +1007,47 @@ class SampleMarkerAnalysisAPIFilter(filters.FilterSet):
     def filter_status(self, queryset: QuerySet, name: str, value: str) -> QuerySet:
         return queryset.filter_by_status(value)
 
+    def filter_queryset_without_facets(self, queryset: QuerySet) -> QuerySet:
+        """Apply the filters that are not facets, the form must be valid."""
+        for name, value in self.form.cleaned_data.items():
+            if name not in self.facet_fields:
+                queryset = self.filters[name].filter(queryset, value)
+        return queryset
+
+    def get_facet_conditions(self) -> dict[str, Q]:
+        """Conditions of the facet filters that are set, the form must be valid."""
+        data = self.form.cleaned_data
+        conditions = {
+            name: Q(**{self.filters[name].field_name: data[name]})
+            for name in ("marker", "species", "sample_type")
+            if data.get(name) not in (None, "")
+        }
+        if data.get("extraction_status") in SAMPLE_STATUS_RANKS:
+            conditions["extraction_status"] = Q(
+                sample__status_rank=SAMPLE_STATUS_RANKS[data["extraction_status"]]
+            )
+        return conditions
+
+    def get_facets(self, queryset: QuerySet) -> dict[str, Any]:
+        """Count the values of each facet among the filtered rows."""
+        counts = facet_counts(
+            self.filter_queryset_without_facets(queryset),
+            self.facet_fields,
+            self.get_facet_conditions(),
+        )
+        # statuses are filtered by name, and only the ones with a name can be
+        statuses = {rank: name for name, rank in SAMPLE_STATUS_RANKS.items()}
+        counts["facets"]["extraction_status"] = [
+            {
+                "value": statuses[item["value"]],
+                "label": Sample.StatusRank(item["value"]).label,
+                "count": item["count"],
+            }
+            for item in counts["facets"]["extraction_status"]
+            if item["value"] in statuses
+        ]
+        return counts
+
     class Meta:
         model = SampleMarkerAnalysis
         fields = [
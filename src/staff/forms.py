@@ -10,6 +10,7 @@ from genlab_bestilling.models import (
     ExtractionPlate,
     Genrequest,
     Order,
+    OrderListing,
 )
 
 
@@ -55,9 +56,12 @@ class ResponsibleStaffForm(forms.ModelForm):
         ),
     )
 
-    def __init__(self, *args, order: Order | None = None, **kwargs):
+    def __init__(self, *args, order: Order | OrderListing | None = None, **kwargs):
         super().__init__(*args, **kwargs)
-        if order:
+        if isinstance(order, OrderListing):
+            self.fields["id"].initial = order.id
+            self.fields["responsible_staff"].initial = order.responsible_staff_ids
+        elif order:
             self.fields["id"].initial = order.id
             self.fields["responsible_staff"].initial = order.responsible_staff.all()
 
@@ -1,20 +1,13 @@
 from typing import Any
 
 import django_tables2 as tables
-from django.db.models import Case, IntegerField, Value, When
 from django.db.models.query import QuerySet
 from django.http import QueryDict
 from django.utils.html import format_html
 from django.utils.http import url_has_allowed_host_and_scheme
 from django.views.generic import View
 
-from genlab_bestilling.models import (
-    AnalysisOrder,
-    EquipmentOrder,
-    ExtractionOrder,
-    Order,
-    Sample,
-)
+from genlab_bestilling.models import Order, OrderListing, Sample
 
 
 class StaffIDMixinTable(tables.Table):
@@ -23,9 +16,7 @@ class StaffIDMixinTable(tables.Table):
         empty_values=(),
     )
 
-    def render_id(
-        self, record: ExtractionOrder | AnalysisOrder | EquipmentOrder
-    ) -> str:
+    def render_id(self, record: OrderListing) -> str:
         url = record.get_absolute_staff_url()
 
         return format_html('<a href="{}" class="underline">{}</a>', url, str(record))
@@ -61,39 +52,15 @@ class OrderStatusMixinTable(tables.Table):
     )
 
     def order_status(
-        self, queryset: QuerySet[Order], is_descending: bool
-    ) -> tuple[QuerySet[Order], bool]:
+        self, queryset: QuerySet[OrderListing], is_descending: bool
+    ) -> tuple[QuerySet[OrderListing], bool]:
         prefix = "-" if is_descending else ""
-        sorted_by_status = annotate_status_order(queryset).order_by(
-            f"{prefix}status_order"
-        )
-
-        return (sorted_by_status, True)
+        return (queryset.order_by(f"{prefix}status_order"), True)
 
-    def render_status(self, value: Order.OrderStatus, record: Order) -> str:
+    def render_status(self, value: Order.OrderStatus, record: OrderListing) -> str:
         return render_status_helper(record.status)
 
 
-def annotate_status_order(queryset: QuerySet[Order]) -> QuerySet[Order]:
-    """Annotate `queryset` with `status_order` (used to sort by "status").
-
-    Shared between `OrderStatusMixinTable.order_status` (used for the
-    page-number-paginated order tables) and the cursor-paginated order list
-    views, which need this same annotation available *before* calling
-    `.order_by("status_order")` themselves.
-    """
-    return queryset.annotate(
-        status_order=Case(
-            When(status=Order.OrderStatus.DELIVERED, then=0),
-            When(status=Order.OrderStatus.DRAFT, then=1),
-            When(status=Order.OrderStatus.PROCESSING, then=2),
-            When(status=Order.OrderStatus.COMPLETED, then=3),
-            default=Value(4),
-            output_field=IntegerField(),
-        )
-    )
-
-
 class SampleStatusMixinTable(tables.Table):
     sample_status = tables.Column(
         verbose_name="Sample Status", empty_values=(), orderable=True
@@ -135,16 +102,7 @@ class SampleStatusMixinTable(tables.Table):
         self, queryset: QuerySet[Sample], is_descending: bool
     ) -> tuple[QuerySet[Sample], bool]:
         prefix = "-" if is_descending else ""
-        status_order = Case(
-            When(is_isolated=True, then=Value(3)),
-            When(is_plucked=True, then=Value(2)),
-            When(is_marked=True, then=Value(1)),
-            default=Value(0),
-            output_field=IntegerField(),
-        )
-        annotated_queryset = queryset.annotate(sample_status_order=status_order)
-        sorted_queryset = annotated_queryset.order_by(f"{prefix}sample_status_order")
-        return (sorted_queryset, True)
+        return (queryset.order_by(f"{prefix}status_rank"), True)
 
 
 class PriorityMixinTable(tables.Table):
@@ -155,31 +113,10 @@ class PriorityMixinTable(tables.Table):
     )
 
     def order_priority(
-        self, queryset: QuerySet[Order], is_descending: bool
-    ) -> tuple[QuerySet[Order], bool]:
+        self, queryset: QuerySet[OrderListing], is_descending: bool
+    ) -> tuple[QuerySet[OrderListing], bool]:
         prefix = "-" if is_descending else ""
-        queryset = annotate_priority_order(queryset)
-        sorted_by_priority = queryset.order_by(f"{prefix}priority_order")
-
-        return (sorted_by_priority, True)
-
-
-def annotate_priority_order(queryset: QuerySet[Order]) -> QuerySet[Order]:
-    """Annotate `queryset` with `priority_order` (used to sort by "priority").
-
-    Shared between `PriorityMixinTable.order_priority` (used for the
-    page-number-paginated order tables) and the cursor-paginated order list
-    views, which need this same annotation available *before* calling
-    `.order_by("priority_order")` themselves.
-    """
-    return queryset.annotate(
-        priority_order=Case(
-            When(is_urgent=True, then=2),
-            When(is_prioritized=True, then=1),
-            default=0,
-            output_field=IntegerField(),
-        )
-    )
+        return (queryset.order_by(f"{prefix}priority"), True)
 
 
 class SafeRedirectMixin(View):
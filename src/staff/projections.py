@@ -0,0 +1,108 @@
+from collections import defaultdict
+from typing import Any
+
+from genlab_bestilling.models import PlatePosition, SampleIsolationMethod
+from shared.projections import Projection
+
+from .serializers import OrderSampleMarkerSerializer
+
+coordinates = PlatePosition.index_to_coordinates
+
+
+class OrderSampleMarkerProjection(Projection):
+    """Output of OrderSampleMarkerSerializer, for the sample marker lists."""
+
+    output = OrderSampleMarkerSerializer.Meta.fields
+    lookups = {
+        "id": "id",
+        "sample": "sample_id",
+        "sample_genlab_id": "sample__genlab_id",
+        "sample_fish_id": "sample__fish_id",
+        "sample_name": "sample__name",
+        "sample_species_id": "sample__species_id",
+        "sample_species_name": "sample__species__name",
+        "sample_type_id": "sample__type_id",
+        "sample_type_name": "sample__type__name",
+        "marker": "marker_id",
+        "marker_name": "marker__name",
+        "order_id": "order_id",
+        "order_name": "order__name",
+        "has_pcr": "has_pcr",
+        "is_analysed": "is_analysed",
+        "is_outputted": "is_outputted",
+        "is_invalid": "is_invalid",
+        "sample_position_index": "sample__position__position",
+    }
+    # annotated by the viewsets
+    columns = ("_sample_extraction_qiagen_id",)
+
+    def prepare(self, rows: list[dict[str, Any]]) -> None:
+        self.isolation_methods: dict[int, list[dict]] = defaultdict(list)
+        for sample_id, method_id, name in (
+            SampleIsolationMethod.objects.filter(
+                sample_id__in={row["sample_id"] for row in rows}
+            )
+            .order_by("isolation_method_id")
+            .values_list("sample_id", "isolation_method_id", "isolation_method__name")
+        ):
+            self.isolation_methods[sample_id].append({"id": method_id, "name": name})
+
+        # the positions on analysis plates, as prefetched by the viewsets
+        self.positions: dict[int, list[tuple]] = defaultdict(list)
+        for sample_marker_id, *position in (
+            PlatePosition.objects.filter(
+                sample_marker_id__in=[row["id"] for row in rows]
+            )
+            .order_by("pk")
+            .values_list(
+                "sample_marker_id",
+                "position",
+                "is_invalid",
+                "plate__analysisplate__analysis_number",
+                "plate__analysisplate__analysis_date",
+                "plate__analysisplate__result_file",
+            )
+        ):
+            self.positions[sample_marker_id].append(tuple(position))
+
+    def get_sample_isolation_methods(self, row: dict[str, Any]) -> list[dict]:
+        return self.isolation_methods.get(row["sample_id"], [])
+
+    def get_sample_position(self, row: dict[str, Any]) -> str | None:
+        position = row["sample__position__position"]
+        if position is None:
+            return None
+        if qiagen_id := row["_sample_extraction_qiagen_id"]:
+            return f"#Q{qiagen_id}@{coordinates(position)}"
+        return f"?@{coordinates(position)}"
+
+    def get_analysis_position(self, row: dict[str, Any]) -> str | None:
+        positions = self.positions.get(row["id"])
+        if not positions:
+            return None
+        return ", ".join(
+            f"#A{number}@{coordinates(position)}"
+            if number
+            else f"?@{coordinates(position)}"
+            for position, _, number, _, _ in positions
+        )
+
+    def count_positions(self, row: dict[str, Any], index: int) -> dict:
+        positions = self.positions.get(row["id"], [])
+        return {
+            "count": sum(1 for position in positions if position[index]),
+            "total": len(positions),
+        }
+
+    def get_is_analyzing(self, row: dict[str, Any]) -> dict:
+        positions = self.positions.get(row["id"], [])
+        return {
+            "count": sum(1 for position in positions if position[3] is not None),
+            "total": len(positions),
+        }
+
+    def get_has_output(self, row: dict[str, Any]) -> dict:
+        return self.count_positions(row, 4)
+
+    def get_invalid_positions(self, row: dict[str, Any]) -> dict:
+        return self.count_positions(row, 1)
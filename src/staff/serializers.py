@@ -8,6 +8,7 @@ from genlab_bestilling.models import (
     PositiveControl,
     Sample,
     SampleMarkerAnalysis,
+    SearchEntry,
 )
 
 
@@ -501,3 +502,11 @@ class PlateRowColumnSerializer(serializers.Serializer):
             msg = "At least one of 'row' or 'column' must be provided"
             raise serializers.ValidationError(msg)
         return attrs
+
+
+class SearchEntrySerializer(serializers.ModelSerializer):
+    """Serializer for the results of the staff search."""
+
+    class Meta:
+        model = SearchEntry
+        fields = ("kind", "title", "description", "url")
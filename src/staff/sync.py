@@ -0,0 +1,150 @@
+"""
+Incremental sync of the list APIs.
+
+The rows of the synced tables store the id of the last transaction that
+changed them (``change_xid``) and deleted rows leave a ``DeletedRow``
+tombstone, both written by triggers. A list response carries a sync token
+in the ``X-Sync-Token`` header; requesting the list again with
+``?since=<token>`` returns only the rows changed or deleted since then::
+
+    {"token": "...", "reset": false, "results": [...], "deleted": [...]}
+
+The token is the oldest transaction still running when the list was read
+(``pg_snapshot_xmin``): every change from an older transaction was already
+visible, while a change from a transaction that was running may be sent
+twice but is never missed. ``reset`` tells the client to reload the whole
+list, when the token is older than the kept tombstones or too many rows
+changed.
+
+The changed rows are looked up without the filters of the list: a row that
+changed so that it no longer matches them is listed in ``deleted``.
+"""
+
+import time
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from genlab_bestilling.models import DeletedRow
+
+
+def current_sync_token() -> str:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_snapshot_xmin(pg_current_snapshot())::text")
+        (xmin,) = cursor.fetchone()
+    return f"{xmin}.{int(time.time())}"
+
+
+def parse_sync_token(token: str) -> tuple[int, int]:
+    """Return the transaction id and the timestamp of a token."""
+    xmin, _, issued_at = token.partition(".")
+    return int(xmin), int(issued_at)
+
+
+def prune_deleted_rows() -> int:
+    """Drop the tombstones older than SYNC_RETENTION_DAYS."""
+    cutoff = timezone.now() - timedelta(days=settings.SYNC_RETENTION_DAYS)
+    deleted, _ = DeletedRow.objects.filter(deleted_at__lt=cutoff).delete()
+    return deleted
+
+
+class DeltaSyncMixin:
+    """
+    Let the list action of a viewset be synced with ``?since=<token>``.
+
+    ``get_changed_filter`` can be extended to also return the rows whose
+    serialized relations changed. ``get_sync_parent_ids`` restricts the sync
+    to the rows of some parents (``sync_parent_field``), e.g. the sample
+    markers of an order, the tombstones storing the parent of the deleted row.
+    """
+
+    sync_param = "since"
+    sync_header = "X-Sync-Token"
+    # table of the tombstones, the one of the model by default
+    # (the parent table for the subclasses of a polymorphic model)
+    sync_deleted_table: str | None = None
+    sync_parent_field: str | None = None
+
+    def get_changed_filter(self, xid: int) -> Q:
+        return Q(change_xid__gte=xid)
+
+    def get_sync_parent_ids(self) -> list[Any] | None:
+        """Parents of the rows of the list, None for the whole table."""
+        return None
+
+    def get_sync_queryset(self, queryset: QuerySet) -> QuerySet:
+        """The rows the list is filtered from."""
+        queryset = queryset.model._default_manager.all()
+        parent_ids = self.get_sync_parent_ids()
+        if parent_ids is not None:
+            queryset = queryset.filter(**{f"{self.sync_parent_field}__in": parent_ids})
+        return queryset
+
+    def get_deleted_ids(self, queryset: QuerySet, xid: int) -> list[Any]:
+        opts = queryset.model._meta
+        tombstones = DeletedRow.objects.filter(
+            table_name=self.sync_deleted_table or opts.db_table,
+            change_xid__gte=xid,
+        )
+        parent_ids = self.get_sync_parent_ids()
+        if parent_ids is not None:
+            tombstones = tombstones.filter(
+                parent_id__in=[str(parent_id) for parent_id in parent_ids]
+            )
+        return [
+            opts.pk.to_python(object_id)
+            for object_id in tombstones.values_list("object_id", flat=True)[
+                : settings.SYNC_MAX_CHANGES + 1
+            ]
+        ]
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        # read before the rows, so that nothing written meanwhile is missed
+        token = current_sync_token()
+        since = request.query_params.get(self.sync_param)
+        if since is None:
+            response = super().list(request, *args, **kwargs)  # type: ignore[misc]
+            response[self.sync_header] = token
+            return response
+
+        try:
+            xid, issued_at = parse_sync_token(since)
+        except ValueError as e:
+            raise ValidationError({self.sync_param: "Invalid sync token."}) from e
+
+        reset = Response({"token": token, "reset": True, "results": [], "deleted": []})
+        if issued_at < time.time() - settings.SYNC_RETENTION_DAYS * 24 * 60 * 60:
+            return reset
+
+        queryset = self.filter_queryset(self.get_queryset())  # type: ignore[attr-defined]
+        changed_ids = list(
+            self.get_sync_queryset(queryset)
+            .filter(self.get_changed_filter(xid))
+            .values_list("pk", flat=True)[: settings.SYNC_MAX_CHANGES + 1]
+        )
+        deleted = self.get_deleted_ids(queryset, xid)
+        if len(changed_ids) + len(deleted) > settings.SYNC_MAX_CHANGES:
+            return reset
+
+        changed = list(queryset.filter(pk__in=changed_ids))
+        matching = {obj.pk for obj in changed}
+        deleted += [pk for pk in changed_ids if pk not in matching]
+
+        serializer = self.get_serializer(changed, many=True)  # type: ignore[attr-defined]
+        response = Response(
+            {
+                "token": token,
+                "reset": False,
+                "results": serializer.data,
+                "deleted": deleted,
+            }
+        )
+        response[self.sync_header] = token
+        return response
@@ -8,13 +8,10 @@ from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 
 from genlab_bestilling.models import (
-    AnalysisOrder,
     AnalysisPlate,
-    EquipmentOrder,
-    ExtractionOrder,
     ExtractionPlate,
     Genrequest,
-    Order,
+    OrderListing,
     Sample,
     SampleMarkerAnalysis,
 )
@@ -48,31 +45,30 @@ class ProjectTable(tables.Table):
         orderable=True,
         empty_values=(),
     )
+    statistics__orders_total = tables.Column(verbose_name="Orders", orderable=False)
+    statistics__samples = tables.Column(verbose_name="Samples", orderable=False)
+    statistics__last_activity_at = tables.DateTimeColumn(
+        verbose_name="Last activity", orderable=False
+    )
 
     class Meta:
         model = Project
         template_name = "staff/tables/cursor_table.html"
         fields = ("number", "name", "verified_at")
-        sequence = ("number", "name", "toggle_active", "verified_at")
+        sequence = (
+            "number",
+            "name",
+            "toggle_active",
+            "verified_at",
+            "statistics__orders_total",
+            "statistics__samples",
+            "statistics__last_activity_at",
+        )
         order_by = ("number",)
 
 
-# Map polymorphic content type model names to staff URL names
-ORDER_TYPE_URL_MAP = {
-    "analysisorder": "staff:order-analysis-detail",
-    "extractionorder": "staff:order-extraction-detail",
-    "equipmentorder": "staff:order-equipment-detail",
-}
-
-
-def get_staff_order_url(record: Order) -> str:
-    """Get the staff detail URL for an order based on its polymorphic type."""
-    # Use polymorphic_ctype.model to avoid requiring actual subclass instances
-    model_name = record.polymorphic_ctype.model
-    url_name = ORDER_TYPE_URL_MAP.get(model_name)
-    if url_name:
-        return reverse(url_name, kwargs={"pk": record.pk})
-    return record.get_absolute_url()
+def get_staff_order_url(record: OrderListing) -> str:
+    return record.get_absolute_staff_url()
 
 
 class ProjectOrderTable(OrderStatusMixinTable, PriorityMixinTable):
@@ -85,7 +81,7 @@ class ProjectOrderTable(OrderStatusMixinTable, PriorityMixinTable):
         verbose_name="Order ID",
     )
 
-    def render_id(self, record: Order) -> str:
+    def render_id(self, record: OrderListing) -> str:
         return str(record)
 
     area = tables.Column(
@@ -100,25 +96,22 @@ class ProjectOrderTable(OrderStatusMixinTable, PriorityMixinTable):
         orderable=True,
     )
 
-    species = tables.ManyToManyColumn(
+    species = tables.Column(
+        accessor="species_list",
         verbose_name="Species",
+        orderable=False,
         default="-",
     )
 
-    def render_species(self, record: Order) -> str:
-        # Only ExtractionOrder has species field
-        if hasattr(record, "species"):
-            return ", ".join(str(s) for s in record.species.all())
-        return "-"
-
     total_samples = tables.Column(
+        accessor="sample_count",
         verbose_name="Total Samples",
         orderable=False,
         default=0,
     )
 
-    responsible_staff = tables.ManyToManyColumn(
-        accessor="responsible_staff",
+    responsible_staff = tables.Column(
+        accessor="responsible_staff_names",
         verbose_name="Assigned staff",
         orderable=False,
     )
@@ -143,6 +136,8 @@ class ProjectGenrequestTable(tables.Table):
 
     id = tables.Column(linkify=True, orderable=False, empty_values=())
     is_archived = tables.Column(verbose_name="Status", orderable=False)
+    statistics__orders_total = tables.Column(verbose_name="Orders", orderable=False)
+    statistics__samples = tables.Column(verbose_name="Samples", orderable=False)
 
     class Meta:
         model = Genrequest
@@ -155,6 +150,8 @@ class ProjectGenrequestTable(tables.Table):
             "expected_total_samples",
             "expected_samples_delivery_date",
             "expected_analysis_delivery_date",
+            "statistics__orders_total",
+            "statistics__samples",
         )
         sequence = (
             "id",
@@ -178,7 +175,7 @@ class OrderTable(OrderStatusMixinTable, PriorityMixinTable):
         verbose_name="Order ID",
     )
 
-    def render_id(self, record: Order) -> str:
+    def render_id(self, record: OrderListing) -> str:
         return str(record)
 
     area = tables.Column(
@@ -193,12 +190,20 @@ class OrderTable(OrderStatusMixinTable, PriorityMixinTable):
         orderable=True,
     )
 
-    species = tables.ManyToManyColumn(
+    species = tables.Column(
+        accessor="species_list",
         verbose_name="Species",
+        orderable=False,
+    )
+
+    total_samples = tables.Column(
+        accessor="sample_count",
+        verbose_name="Total samples",
+        orderable=False,
     )
 
-    responsible_staff = tables.ManyToManyColumn(
-        accessor="responsible_staff",
+    responsible_staff = tables.Column(
+        accessor="responsible_staff_names",
         verbose_name="Assigned staff",
         orderable=False,
     )
@@ -225,11 +230,10 @@ class AnalysisOrderTable(OrderTable):
         empty_values=(),
     )
 
-    markers = tables.ManyToManyColumn(
-        accessor="markers",
+    markers = tables.Column(
+        accessor="markers_list",
         verbose_name="Markers",
         orderable=False,
-        transform=lambda x: x.name,
     )
 
     expected_delivery_date = tables.DateColumn(
@@ -240,15 +244,8 @@ class AnalysisOrderTable(OrderTable):
         empty_values=(),
     )
 
-    species = tables.Column(
-        verbose_name="Species",
-        accessor="samples",
-        orderable=False,
-        empty_values=(),
-    )
-
     class Meta(OrderTable.Meta):
-        model = AnalysisOrder
+        model = OrderListing
         template_name = "staff/tables/cursor_table.html"
         fields = OrderTable.Meta.fields + ("markers", "expected_delivery_date")  # type: ignore[assignment]
         sequence = (
@@ -264,11 +261,6 @@ class AnalysisOrderTable(OrderTable):
             "expected_delivery_date",
         )
 
-    def render_species(self, value: Any) -> str:
-        return ", ".join(
-            sorted({sample.species.name for sample in value.all() if sample.species})
-        )
-
 
 class ExtractionOrderTable(OrderTable):
     id = tables.Column(
@@ -277,11 +269,11 @@ class ExtractionOrderTable(OrderTable):
         empty_values=(),
     )
 
-    def render_total_samples(self, record: ExtractionOrder) -> str:
-        return record.total_samples or "0"
-
-    def render_total_samples_isolated(self, record: ExtractionOrder) -> str:
-        return record.total_samples_isolated or "0"
+    total_samples_isolated = tables.Column(
+        accessor="isolated_sample_count",
+        verbose_name="Total samples isolated",
+        orderable=False,
+    )
 
     confirmed_at = tables.DateColumn(
         accessor="confirmed_at",
@@ -292,7 +284,7 @@ class ExtractionOrderTable(OrderTable):
     )
 
     class Meta(OrderTable.Meta):
-        model = ExtractionOrder
+        model = OrderListing
         template_name = "staff/tables/cursor_table.html"
         fields = OrderTable.Meta.fields + (
             "total_samples_isolated",
@@ -336,8 +328,14 @@ class EquipmentOrderTable(OrderTable):
         verbose_name="",
     )
 
+    sample_types = tables.Column(
+        accessor="sample_types_list",
+        verbose_name="Sample types",
+        orderable=False,
+    )
+
     class Meta(OrderTable.Meta):
-        model = EquipmentOrder
+        model = OrderListing
         template_name = "staff/tables/cursor_table.html"
         fields = (
             "name",
@@ -786,6 +784,7 @@ class UrgentOrderTable(StaffIDMixinTable, OrderStatusMixinTable):
     )
 
     delivery_date = tables.DateColumn(
+        accessor="expected_delivery_date",
         verbose_name="Deadline",
         orderable=False,
         format="d/m/Y",
@@ -804,7 +803,7 @@ class UrgentOrderTable(StaffIDMixinTable, OrderStatusMixinTable):
     )
 
     class Meta:
-        model = Order
+        model = OrderListing
         fields = (
             "priority",
             "id",
@@ -834,6 +833,7 @@ class NewUnseenOrderTable(StaffIDMixinTable):
     )
 
     delivery_date = tables.DateColumn(
+        accessor="expected_delivery_date",
         verbose_name="Deadline",
         orderable=False,
         format="d/m/Y",
@@ -854,10 +854,11 @@ class NewUnseenOrderTable(StaffIDMixinTable):
     markers_list = tables.Column(
         verbose_name="Markers",
         orderable=False,
+        default="-",
     )
 
     class Meta:
-        model = Order
+        model = OrderListing
         fields = (
             "id",
             "description",
@@ -886,6 +887,7 @@ class NewSeenOrderTable(StaffIDMixinTable):
     )
 
     delivery_date = tables.DateColumn(
+        accessor="expected_delivery_date",
         verbose_name="Deadline",
         orderable=False,
         format="d/m/Y",
@@ -906,6 +908,7 @@ class NewSeenOrderTable(StaffIDMixinTable):
     markers_list = tables.Column(
         verbose_name="Markers",
         orderable=False,
+        default="-",
     )
 
     assigned_staff = tables.TemplateColumn(
@@ -916,7 +919,7 @@ class NewSeenOrderTable(StaffIDMixinTable):
     )
 
     class Meta:
-        model = Order
+        model = OrderListing
         fields = (
             "priority",
             "id",
@@ -951,8 +954,8 @@ class AssignedOrderTable(OrderStatusMixinTable, PriorityMixinTable, StaffIDMixin
         orderable=False,
     )
 
-    def render_samples_completed(self, value: int, record: Order) -> str:
-        if value > 0:
+    def render_samples_completed(self, value: int, record: OrderListing) -> str:
+        if record.order_type == OrderListing.OrderType.EXTRACTION and value > 0:
             return str(record.isolated_sample_count) + " / " + str(value)
         return "-"
 
@@ -961,7 +964,7 @@ class AssignedOrderTable(OrderStatusMixinTable, PriorityMixinTable, StaffIDMixin
     )
 
     class Meta:
-        model = Order
+        model = OrderListing
         fields = ("priority", "id", "description", "samples_completed", "status")
         empty_text = "No assigned orders"
         order_by = ["-priority", "status"]
@@ -990,7 +993,7 @@ class DraftOrderTable(StaffIDMixinTable):
     )
 
     class Meta:
-        model = Order
+        model = OrderListing
         fields = (
             "id",
             "description",
@@ -3,7 +3,6 @@ from collections import Counter
 
 from django import template
 from django.db import models
-from django.db.models import StringAgg
 from django.utils.html import format_html, format_html_join
 from django.utils.safestring import mark_safe
 
@@ -13,6 +12,7 @@ from genlab_bestilling.models import (
     Area,
     ExtractionOrder,
     Order,
+    OrderListing,
 )
 from staff.forms import ResponsibleStaffForm
 
@@ -29,7 +29,7 @@ register = template.Library()
 
 
 @register.inclusion_tag("staff/components/responsible_staff_multiselect.html")
-def responsible_staff_multiselect(order: Order | None = None) -> dict:
+def responsible_staff_multiselect(order: Order | OrderListing | None = None) -> dict:
     prefix = f"order_{order.id}" if order else f"new_{uuid.uuid4().hex[:8]}"
 
     # Add prefix to the form to avoid conflicts with other forms on the page
@@ -56,44 +56,30 @@ def render_boolean(value: bool) -> str:
     return mark_safe('<i class="fa-solid fa-xmark text-red-500 fa-xl"></i>')
 
 
+# Dashboard order by status: the ones being processed first
+DASHBOARD_STATUS_ORDER = models.Case(
+    models.When(status=Order.OrderStatus.PROCESSING, then=0),
+    models.When(status=Order.OrderStatus.DELIVERED, then=1),
+    models.When(status=Order.OrderStatus.COMPLETED, then=2),
+    default=3,
+    output_field=models.IntegerField(),
+)
+
+
 @register.inclusion_tag("staff/components/order_table.html", takes_context=True)
 def urgent_orders_table(context: dict, area: Area | None = None) -> dict:
     urgent_orders = (
-        Order.objects.filter(
+        OrderListing.objects.filter(
             is_urgent=True,
         )
         .exclude(status__in=[Order.OrderStatus.DRAFT, Order.OrderStatus.COMPLETED])
         .select_related("genrequest")
-        .prefetch_related("responsible_staff")
-        .annotate(
-            priority=models.Case(
-                models.When(is_urgent=True, then=Order.OrderPriority.URGENT),
-                models.When(is_prioritized=True, then=Order.OrderPriority.PRIORITIZED),
-                default=1,
-            ),
-            delivery_date=models.Case(
-                models.When(
-                    analysisorder__isnull=False,
-                    then="analysisorder__expected_delivery_date",
-                ),
-                default=models.Value(None, output_field=models.DateField()),
-            ),
-        )
     )
 
     if area:
         urgent_orders = urgent_orders.filter(genrequest__area=area)
 
-    urgent_orders = urgent_orders.order_by(
-        models.Case(
-            models.When(status=Order.OrderStatus.PROCESSING, then=0),
-            models.When(status=Order.OrderStatus.DELIVERED, then=1),
-            models.When(status=Order.OrderStatus.COMPLETED, then=2),
-            default=3,
-            output_field=models.IntegerField(),
-        ),
-        "-created_at",
-    )
+    urgent_orders = urgent_orders.order_by(DASHBOARD_STATUS_ORDER, "-created_at")
 
     return {
         "title": "Urgent orders",
@@ -106,50 +92,13 @@ def urgent_orders_table(context: dict, area: Area | None = None) -> dict:
 @register.inclusion_tag("staff/components/order_table.html", takes_context=True)
 def new_seen_orders_table(context: dict, area: Area | None = None) -> dict:
     new_orders = (
-        Order.objects.filter(
+        OrderListing.objects.filter(
             status__in=[Order.OrderStatus.DELIVERED, Order.OrderStatus.PROCESSING],
             is_seen=True,
-            responsible_staff__isnull=True,
+            responsible_staff_ids__len=0,
         )
         .exclude(is_urgent=True)
         .select_related("genrequest")
-        .prefetch_related("responsible_staff")
-        .annotate(
-            sample_count=models.Case(
-                models.When(
-                    extractionorder__isnull=False,
-                    then=models.Count("extractionorder__samples", distinct=True),
-                ),
-                models.When(
-                    analysisorder__isnull=False,
-                    then=models.Count("analysisorder__samples", distinct=True),
-                ),
-                default=0,
-            ),
-            priority=models.Case(
-                models.When(is_urgent=True, then=Order.OrderPriority.URGENT),
-                models.When(is_prioritized=True, then=Order.OrderPriority.PRIORITIZED),
-                default=1,
-            ),
-            delivery_date=models.Case(
-                models.When(
-                    analysisorder__isnull=False,
-                    then="analysisorder__expected_delivery_date",
-                ),
-                default=models.Value(None, output_field=models.DateField()),
-            ),
-            markers_list=models.Case(
-                models.When(
-                    analysisorder__isnull=False,
-                    then=StringAgg(
-                        "analysisorder__markers__name",
-                        delimiter=models.Value(", "),
-                        distinct=True,
-                    ),
-                ),
-                default=models.Value("-", output_field=models.TextField()),
-            ),
-        )
     )
 
     if area:
@@ -168,40 +117,9 @@ def new_seen_orders_table(context: dict, area: Area | None = None) -> dict:
 @register.inclusion_tag("staff/components/order_table.html", takes_context=True)
 def new_unseen_orders_table(context: dict, area: Area | None = None) -> dict:
     new_orders = (
-        Order.objects.filter(status=Order.OrderStatus.DELIVERED, is_seen=False)
+        OrderListing.objects.filter(status=Order.OrderStatus.DELIVERED, is_seen=False)
         .exclude(is_urgent=True)
         .select_related("genrequest")
-        .annotate(
-            sample_count=models.Case(
-                models.When(
-                    extractionorder__isnull=False,
-                    then=models.Count("extractionorder__samples", distinct=True),
-                ),
-                models.When(
-                    analysisorder__isnull=False,
-                    then=models.Count("analysisorder__samples", distinct=True),
-                ),
-                default=0,
-            ),
-            delivery_date=models.Case(
-                models.When(
-                    analysisorder__isnull=False,
-                    then="analysisorder__expected_delivery_date",
-                ),
-                default=models.Value(None, output_field=models.DateField()),
-            ),
-            markers_list=models.Case(
-                models.When(
-                    analysisorder__isnull=False,
-                    then=StringAgg(
-                        "analysisorder__markers__name",
-                        delimiter=models.Value(", "),
-                        distinct=True,
-                    ),
-                ),
-                default=models.Value("-", output_field=models.TextField()),
-            ),
-        )
     )
 
     if area:
@@ -222,50 +140,16 @@ def assigned_orders_table(context: dict) -> dict:
     user = context.get("user")
 
     assigned_orders = (
-        Order.objects.filter(
+        OrderListing.objects.filter(
             status__in=[
                 Order.OrderStatus.PROCESSING,
                 Order.OrderStatus.DELIVERED,
             ],
-            responsible_staff=user,
             is_seen=True,
         )
+        .filter_by_responsible_staff([user])
         .select_related("genrequest")
-        .annotate(
-            isolated_sample_count=models.Case(
-                models.When(
-                    extractionorder__isnull=False,
-                    then=models.Count(
-                        "extractionorder__samples",
-                        filter=models.Q(extractionorder__samples__is_isolated=True),
-                        distinct=True,
-                    ),
-                )
-            ),
-            sample_count=models.Case(
-                models.When(
-                    extractionorder__isnull=False,
-                    then=models.Count("extractionorder__samples", distinct=True),
-                ),
-                default=0,
-            ),
-            priority=models.Case(
-                models.When(is_urgent=True, then=Order.OrderPriority.URGENT),
-                models.When(is_prioritized=True, then=Order.OrderPriority.PRIORITIZED),
-                default=1,
-            ),
-        )
-        .order_by(
-            "-priority",
-            models.Case(
-                models.When(status=Order.OrderStatus.PROCESSING, then=0),
-                models.When(status=Order.OrderStatus.DELIVERED, then=1),
-                models.When(status=Order.OrderStatus.COMPLETED, then=2),
-                default=3,
-                output_field=models.IntegerField(),
-            ),
-            "-created_at",
-        )
+        .order_by("-priority", DASHBOARD_STATUS_ORDER, "-created_at")
     )
 
     return {
@@ -279,23 +163,9 @@ def assigned_orders_table(context: dict) -> dict:
 @register.inclusion_tag("staff/components/order_table.html", takes_context=True)
 def draft_orders_table(context: dict, area: Area) -> dict:
     draft_orders = (
-        Order.objects.filter(status=Order.OrderStatus.DRAFT)
+        OrderListing.objects.filter(status=Order.OrderStatus.DRAFT)
         .select_related("genrequest")
-        .annotate(
-            sample_count=models.Count("extractionorder__samples", distinct=True),
-            priority=models.Case(
-                models.When(is_urgent=True, then=Order.OrderPriority.URGENT),
-                default=1,
-            ),
-            delivery_date=models.Case(
-                models.When(
-                    analysisorder__isnull=False,
-                    then="analysisorder__expected_delivery_date",
-                ),
-                default=models.Value(None, output_field=models.DateField()),
-            ),
-        )
-        .order_by("-priority", "-created_at")
+        .order_by("-is_urgent", "-created_at")
     )
 
     if area:
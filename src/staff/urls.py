@@ -9,6 +9,7 @@ from staff.api import (
     OrderAPIView,
     PositiveControlViewSet,
     SampleMarkerViewSet,
+    SearchAPIView,
 )
 
 from .views import (
@@ -22,6 +23,7 @@ from .views import (
     DashboardView,
     EquipmentOrderDetailView,
     EqupimentOrderListView,
+    EventStreamView,
     ExtractionOrderDetailView,
     ExtractionOrderListView,
     ExtractionPlateCreateView,
@@ -44,6 +46,7 @@ from .views import (
     SampleLabView,
     SampleMarkersView,
     SamplesListView,
+    SearchView,
     StaffEditView,
     UpdateInternalNote,
 )
@@ -69,6 +72,7 @@ router.register(
 
 urlpatterns = [
     path("", DashboardView.as_view(), name="dashboard"),
+    path("search/", SearchView.as_view(), name="search"),
     path("projects/", ProjectListView.as_view(), name="projects-list"),
     path("projects/<str:pk>/", ProjectDetailView.as_view(), name="projects-detail"),
     path(
@@ -235,6 +239,8 @@ urlpatterns = [
         AnalysisOrderSampleMarkerViewSet.as_view({"get": "list"}),
         name="api-analysis-order-sample-markers",
     ),
+    path("api/search/", SearchAPIView.as_view(), name="api-search"),
+    path("events/", EventStreamView.as_view(), name="events"),
     # Router-based API endpoints
     path("", include(router.urls)),
 ]
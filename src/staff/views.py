@@ -1,16 +1,30 @@
+import asyncio
+import re
+from collections.abc import AsyncIterator
 from typing import Any
 
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.db import models
+from django.core.handlers.asgi import ASGIRequest
+from django.db import models, transaction
 from django.db.models import Count, OuterRef, Prefetch, QuerySet, Subquery
 from django.forms import Form
-from django.http import HttpRequest, HttpResponse, HttpResponseRedirect, JsonResponse
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseForbidden,
+    HttpResponseRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.middleware.csrf import get_token
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse, reverse_lazy
 from django.utils.timezone import now
 from django.utils.translation import gettext as _
+from django.views import View
 from django.views.generic import DetailView, TemplateView, UpdateView
 from django.views.generic.detail import SingleObjectMixin
 from django_filters.views import FilterView
@@ -27,18 +41,25 @@ from genlab_bestilling.models import (
     IsolationMethod,
     Marker,
     Order,
+    OrderListing,
     Plate,
+    ProjectStatistics,
     Sample,
     SampleIsolationMethod,
 )
+from genlab_bestilling.reference import reference_bundle_url
+from genlab_bestilling.search import search
 from nina.models import Project
+from shared import events
+from shared.profiling import ProfiledViewMixin
 from shared.sentry import report_errors
-from shared.views import ActionView, FormsetCreateView, FormsetUpdateView
-from staff.mixins import (
-    SafeRedirectMixin,
-    annotate_priority_order,
-    annotate_status_order,
+from shared.views import (
+    ActionView,
+    FormsetCreateView,
+    FormsetUpdateView,
+    ReadOnlyRequestMixin,
 )
+from staff.mixins import SafeRedirectMixin
 from staff.pagination import CursorPaginatedTableMixin
 
 from .filters import (
@@ -86,7 +107,86 @@ class StaffMixin(LoginRequiredMixin, UserPassesTestMixin):
         return self.request.user.is_superuser or self.request.user.is_genlab_staff()  # type: ignore[attr-defined]
 
 
-class DashboardView(StaffMixin, TemplateView):
+class SearchView(ReadOnlyRequestMixin, StaffMixin, TemplateView):
+    """
+    Search box of the staff pages, a search for an identifier
+    that matches a single object redirects to it.
+    """
+
+    template_name = "staff/search.html"
+
+    class Params:
+        query = "q"
+
+    def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        self.results = search(request.GET.get(self.Params.query, ""))
+        if self.results.exact and len(self.results.entries) == 1:
+            return redirect(self.results.entries[0].url)
+        return super().get(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
+        context = super().get_context_data(**kwargs)
+        context["results"] = self.results
+        return context
+
+
+class EventStreamView(View):
+    """
+    Server-sent events of the plates and orders given as ``topic``
+    parameters (``plate:<uuid>``, ``order:<id>``), see ``shared.events``.
+
+    The stream stays open for as long as the client is connected, so the
+    view is async and holds no database connection while waiting.
+    """
+
+    heartbeat_seconds = 15
+    topic_re = re.compile(r"^(plate:[0-9a-f-]{36}|order:\d+)$")
+
+    @classmethod
+    def as_view(cls, **initkwargs: Any) -> Any:
+        return transaction.non_atomic_requests(super().as_view(**initkwargs))
+
+    async def get(
+        self, request: HttpRequest, *args: Any, **kwargs: Any
+    ) -> HttpResponse:
+        user = await request.auser()
+        if not user.is_authenticated or not (
+            user.is_superuser or await sync_to_async(user.is_genlab_staff)()
+        ):
+            return HttpResponseForbidden()
+
+        if not isinstance(request, ASGIRequest):
+            # a WSGI worker would buffer the endless stream, 204 tells the
+            # EventSource not to reconnect
+            return HttpResponse(status=204)
+
+        topics = request.GET.getlist("topic")
+        if not topics or not all(self.topic_re.match(topic) for topic in topics):
+            return HttpResponseBadRequest("Invalid topics")
+
+        response = StreamingHttpResponse(
+            self.stream(topics), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        # nginx would buffer the stream otherwise
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def stream(self, topics: list[str]) -> AsyncIterator[str]:
+        async with events.get_broker().subscribe(topics) as subscription:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.queue.get(), self.heartbeat_seconds
+                    )
+                except TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                yield f"event: {event.type}\ndata: {event.to_json()}\n\n"
+
+
+class DashboardView(ReadOnlyRequestMixin, StaffMixin, TemplateView):
     template_name = "staff/dashboard.html"
 
     class Params:
@@ -115,7 +215,11 @@ class DashboardView(StaffMixin, TemplateView):
 
 
 class AnalysisOrderListView(
-    CursorPaginatedTableMixin, StaffMixin, SingleTableMixin, FilterView
+    ReadOnlyRequestMixin,
+    CursorPaginatedTableMixin,
+    StaffMixin,
+    SingleTableMixin,
+    FilterView,
 ):
     model = AnalysisOrder
     table_class = AnalysisOrderTable
@@ -123,7 +227,7 @@ class AnalysisOrderListView(
 
     order_field_map: dict[str, tuple[str, ...]] = {
         "id": ("id",),
-        "priority": ("priority_order",),
+        "priority": ("priority",),
         "status": ("status_order",),
         "area": ("genrequest__area__name",),
         "description": ("genrequest__name",),
@@ -131,26 +235,18 @@ class AnalysisOrderListView(
     }
     default_order_by = ("-priority", "status")
 
-    def get_queryset(self) -> QuerySet[AnalysisOrder]:
-        return annotate_status_order(
-            annotate_priority_order(
-                super()
-                .get_queryset()
-                .select_related(
-                    "genrequest",
-                    "polymorphic_ctype",
-                    "genrequest__samples_owner",
-                    "genrequest__project",
-                    "genrequest__area",
-                )
-                .prefetch_related("samples__species", "responsible_staff", "markers")
-                .annotate(total_samples=Count("samples"))
-            )
-        )
+    def get_queryset(self) -> QuerySet[OrderListing]:
+        return OrderListing.objects.filter(
+            order_type=OrderListing.OrderType.ANALYSIS
+        ).select_related("genrequest", "genrequest__area")
 
 
 class ExtractionOrderListView(
-    CursorPaginatedTableMixin, StaffMixin, SingleTableMixin, FilterView
+    ReadOnlyRequestMixin,
+    CursorPaginatedTableMixin,
+    StaffMixin,
+    SingleTableMixin,
+    FilterView,
 ):
     model = ExtractionOrder
     table_class = ExtractionOrderTable
@@ -158,7 +254,7 @@ class ExtractionOrderListView(
 
     order_field_map: dict[str, tuple[str, ...]] = {
         "id": ("id",),
-        "priority": ("priority_order",),
+        "priority": ("priority",),
         "status": ("status_order",),
         "area": ("genrequest__area__name",),
         "description": ("genrequest__name",),
@@ -166,27 +262,10 @@ class ExtractionOrderListView(
     }
     default_order_by = ("-priority", "status")
 
-    def get_queryset(self) -> QuerySet[ExtractionOrder]:
-        return annotate_status_order(
-            annotate_priority_order(
-                super()
-                .get_queryset()
-                .select_related(
-                    "genrequest",
-                    "genrequest__samples_owner",
-                    "polymorphic_ctype",
-                    "genrequest__project",
-                    "genrequest__area",
-                )
-                .prefetch_related("species", "sample_types", "responsible_staff")
-                .annotate(
-                    total_samples=Count("samples"),
-                    total_samples_isolated=models.Count(
-                        "samples", filter=models.Q(samples__is_isolated=True)
-                    ),
-                )
-            )
-        )
+    def get_queryset(self) -> QuerySet[OrderListing]:
+        return OrderListing.objects.filter(
+            order_type=OrderListing.OrderType.EXTRACTION
+        ).select_related("genrequest", "genrequest__area")
 
 
 # class ExtractionPlateListView(StaffMixin, SingleTableMixin, FilterView):
@@ -205,7 +284,11 @@ class ExtractionOrderListView(
 
 
 class EqupimentOrderListView(
-    CursorPaginatedTableMixin, StaffMixin, SingleTableMixin, FilterView
+    ReadOnlyRequestMixin,
+    CursorPaginatedTableMixin,
+    StaffMixin,
+    SingleTableMixin,
+    FilterView,
 ):
     model = EquipmentOrder
     table_class = EquipmentOrderTable
@@ -223,22 +306,20 @@ class EqupimentOrderListView(
     }
     default_order_by = ("-is_urgent", "last_modified_at", "created_at")
 
-    def get_queryset(self) -> QuerySet[EquipmentOrder]:
-        return (
-            super()
-            .get_queryset()
-            .select_related(
-                "genrequest",
-                "polymorphic_ctype",
-                "genrequest__samples_owner",
-                "genrequest__project",
-                "genrequest__area",
-            )
-            .prefetch_related("sample_types")
+    def get_queryset(self) -> QuerySet[OrderListing]:
+        return OrderListing.objects.filter(
+            order_type=OrderListing.OrderType.EQUIPMENT
+        ).select_related(
+            "genrequest",
+            "genrequest__samples_owner",
+            "genrequest__project",
+            "genrequest__area",
         )
 
 
-class AnalysisOrderDetailView(StaffMixin, DetailView):
+class AnalysisOrderDetailView(
+    ProfiledViewMixin, ReadOnlyRequestMixin, StaffMixin, DetailView
+):
     model = AnalysisOrder
 
     def get_queryset(self) -> QuerySet[AnalysisOrder]:
@@ -322,7 +403,7 @@ class AnalysisOrderDetailView(StaffMixin, DetailView):
         return context
 
 
-class EquipmentOrderDetailView(StaffMixin, DetailView):
+class EquipmentOrderDetailView(ReadOnlyRequestMixin, StaffMixin, DetailView):
     model = EquipmentOrder
 
 
@@ -349,7 +430,7 @@ class MarkAsSeenView(StaffMixin, DetailView, SafeRedirectMixin):
         return self.get_object().get_absolute_staff_url()
 
 
-class ExtractionOrderDetailView(StaffMixin, DetailView):
+class ExtractionOrderDetailView(ReadOnlyRequestMixin, StaffMixin, DetailView):
     model = ExtractionOrder
 
     # Prefetch species to avoid N+1 queries when accessing species in the template
@@ -396,6 +477,7 @@ class ExtractionOrderDetailView(StaffMixin, DetailView):
 
 
 class OrderExtractionSamplesListView(
+    ReadOnlyRequestMixin,
     CursorPaginatedTableMixin,
     StaffMixin,
     SingleTableMixin,
@@ -442,25 +524,19 @@ class OrderExtractionSamplesListView(
             .get_queryset()
             .select_related("type", "location", "species", "order")
             .filter(order=self.kwargs["pk"])
-            .annotate_numeric_name()
         )
 
     def get_context_data(self, **kwargs) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
-        order = ExtractionOrder.objects.get(pk=self.kwargs.get("pk"))
+        order = ExtractionOrder.objects.select_related("sample_progress").get(
+            pk=self.kwargs.get("pk")
+        )
         context["order"] = order
 
-        # Pre-compute counts to avoid N+1 queries in template
-        total_samples = order.samples.count()
-        filled_count = order.samples.filter(genlab_id__isnull=False).count()
-
-        context["total_samples"] = total_samples
-        context["filled_count"] = filled_count
-        context["progress_percent"] = (
-            (float(filled_count) / float(total_samples)) * 100
-            if total_samples > 0
-            else 0
-        )
+        progress = order.get_sample_progress()
+        context["total_samples"] = progress.total
+        context["filled_count"] = progress.with_genlab_id
+        context["progress_percent"] = progress.percent(progress.with_genlab_id)
         return context
 
     def get_fallback_url(self) -> str:
@@ -484,18 +560,20 @@ class OrderExtractionSamplesListView(
 
 
 class SamplesListView(
-    CursorPaginatedTableMixin, StaffMixin, SingleTableMixin, FilterView
+    ReadOnlyRequestMixin,
+    CursorPaginatedTableMixin,
+    StaffMixin,
+    SingleTableMixin,
+    FilterView,
 ):
     model = Sample
     table_class = SampleTable
     filterset_class = SampleFilter
 
-    # `sample_status` is intentionally not mapped: it has no underlying
-    # queryset field/annotation to order by (see `SampleStatusMixinTable`),
-    # so clicking that column header simply has no effect.
     order_field_map: dict[str, tuple[str, ...]] = {
         "id": ("id",),
         "name": ("name_as_int", "name"),
+        "sample_status": ("status_rank",),
         "guid": ("guid",),
         "species": ("species_id",),
         "type": ("type_id",),
@@ -536,11 +614,10 @@ class SamplesListView(
                 ),
             )
             .exclude(order__status=Order.OrderStatus.DRAFT)
-            .annotate_numeric_name()
         )
 
 
-class SampleDetailView(StaffMixin, DetailView):
+class SampleDetailView(ReadOnlyRequestMixin, StaffMixin, DetailView):
     model = Sample
 
     def get_queryset(self) -> QuerySet[Sample]:
@@ -566,6 +643,8 @@ class SampleDetailView(StaffMixin, DetailView):
 
 
 class SampleLabView(
+    ProfiledViewMixin,
+    ReadOnlyRequestMixin,
     CursorPaginatedTableMixin,
     StaffMixin,
     SingleTableMixin,
@@ -605,7 +684,10 @@ class SampleLabView(
 
     def get_order(self) -> ExtractionOrder:
         if not hasattr(self, "_order"):
-            self._order = get_object_or_404(ExtractionOrder, pk=self.kwargs["pk"])
+            self._order = get_object_or_404(
+                ExtractionOrder.objects.select_related("sample_progress"),
+                pk=self.kwargs["pk"],
+            )
         return self._order
 
     def get_queryset(self) -> QuerySet[Sample]:
@@ -660,21 +742,14 @@ class SampleLabView(
 
         # print("order")
 
-        # Pre-compute counts to avoid N+1 queries in template
-        total_samples = order.samples.count()
-        isolated_count = order.samples.filter(is_isolated=True).count()
-
-        context["progress_percent"] = (
-            (float(isolated_count) / float(total_samples)) * 100
-            if total_samples > 0
-            else 0
-        )
+        progress = order.get_sample_progress()
+        context["progress_percent"] = progress.percent(progress.isolated)
 
         context.update(
             {
                 "order": order,
-                "total_samples": total_samples,
-                "isolated_count": isolated_count,
+                "total_samples": progress.total,
+                "isolated_count": progress.isolated,
                 "statuses": self.get_base_fields(),
                 "isolation_methods": self.get_isolation_methods(),
             }
@@ -1036,9 +1111,14 @@ class GenerateGenlabIDsView(SingleObjectMixin, StaffMixin, SafeRedirectMixin):
 
 
 class ProjectListView(
-    CursorPaginatedTableMixin, StaffMixin, SingleTableMixin, FilterView
+    ReadOnlyRequestMixin,
+    CursorPaginatedTableMixin,
+    StaffMixin,
+    SingleTableMixin,
+    FilterView,
 ):
     model = Project
+    queryset = Project.objects.select_related("statistics")
     table_class = ProjectTable
     filterset_class = ProjectFilter
 
@@ -1054,7 +1134,7 @@ class ProjectListView(
     default_order_by = ("number",)
 
 
-class ProjectDetailView(StaffMixin, DetailView):
+class ProjectDetailView(ReadOnlyRequestMixin, StaffMixin, DetailView):
     model = Project
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
@@ -1063,29 +1143,18 @@ class ProjectDetailView(StaffMixin, DetailView):
         # Get genetic projects (genrequests) for this project
         genrequests = (
             Genrequest.objects.filter(project=self.object)
-            .select_related("area", "project")
+            .select_related("area", "project", "statistics")
             .prefetch_related("species", "sample_types")
         )
         ctx["genrequests_table"] = ProjectGenrequestTable(data=genrequests)
+        ctx["statistics"] = ProjectStatistics.objects.filter(
+            project=self.object
+        ).first()
 
         # Get orders for all genetic projects under this project
         orders = (
-            Order.objects.filter(genrequest__project=self.object)
-            .select_related(
-                "genrequest",
-                "genrequest__area",
-                "genrequest__project",
-                "polymorphic_ctype",
-            )
-            .prefetch_related("responsible_staff")
-            .annotate(
-                total_samples=Subquery(
-                    Sample.objects.filter(order_id=OuterRef("pk"))
-                    .values("order_id")
-                    .annotate(cnt=Count("id"))
-                    .values("cnt")[:1]
-                )
-            )
+            OrderListing.objects.filter(genrequest__project=self.object)
+            .select_related("genrequest", "genrequest__area")
             .order_by("-created_at")
         )
         ctx["orders_table"] = ProjectOrderTable(data=orders)
@@ -1166,7 +1235,11 @@ class OrderPrioritizedAdminView(StaffMixin, SafeRedirectMixin, ActionView):
 
 
 class ExtractionPlateListView(
-    CursorPaginatedTableMixin, StaffMixin, SingleTableMixin, FilterView
+    ReadOnlyRequestMixin,
+    CursorPaginatedTableMixin,
+    StaffMixin,
+    SingleTableMixin,
+    FilterView,
 ):
     model = ExtractionPlate
     table_class = ExtractionPlateTable
@@ -1191,7 +1264,7 @@ class ExtractionPlateListView(
         )
 
 
-class ExtractionPlateDetailView(StaffMixin, DetailView):
+class ExtractionPlateDetailView(ReadOnlyRequestMixin, StaffMixin, DetailView):
     model = ExtractionPlate
     context_object_name = "plate"
 
@@ -1231,7 +1304,9 @@ class ExtractionPlateUpdateView(StaffMixin, FormsetUpdateView):
 # AnalysisPlate Views
 
 
-class AnalysisPlateListView(StaffMixin, SingleTableMixin, FilterView):
+class AnalysisPlateListView(
+    ReadOnlyRequestMixin, StaffMixin, SingleTableMixin, FilterView
+):
     model = AnalysisPlate
     table_class = AnalysisPlateTable
     filterset_class = AnalysisPlateFilter
@@ -1246,7 +1321,7 @@ class AnalysisPlateListView(StaffMixin, SingleTableMixin, FilterView):
         )
 
 
-class AnalysisPlateDetailView(StaffMixin, DetailView):
+class AnalysisPlateDetailView(ReadOnlyRequestMixin, StaffMixin, DetailView):
     model = AnalysisPlate
     context_object_name = "plate"
 
@@ -1313,7 +1388,7 @@ class AnalysisPlateUploadView(StaffMixin, UpdateView):
         return reverse("staff:analysis-plates-detail", kwargs={"pk": self.object.pk})
 
 
-class PlatePositionsView(StaffMixin, DetailView):
+class PlatePositionsView(ReadOnlyRequestMixin, StaffMixin, DetailView):
     template_name = "staff/plate_positions_frontend.html"
 
     plate_type = "extraction"  # default, overridden by subclasses
@@ -1328,6 +1403,7 @@ class PlatePositionsView(StaffMixin, DetailView):
             "plate_type": self.plate_type,
             "plate_label": self.get_plate_label(),
             "csrf": get_token(self.request),
+            "reference_bundle_url": reference_bundle_url(),
         }
         return context
 
@@ -1348,7 +1424,7 @@ class AnalysisPlatePositionsView(PlatePositionsView):
         return self.object.name or str(self.object.pk)
 
 
-class SampleMarkersView(StaffMixin, TemplateView):
+class SampleMarkersView(ReadOnlyRequestMixin, StaffMixin, TemplateView):
     """Staff view for browsing all sample markers (React frontend)."""
 
     template_name = "staff/sample_markers.html"
@@ -1357,6 +1433,7 @@ class SampleMarkersView(StaffMixin, TemplateView):
         context = super().get_context_data(**kwargs)
         frontend_args = {
             "csrf": get_token(self.request),
+            "reference_bundle_url": reference_bundle_url(),
         }
         # Support pre-setting the order filter via query string
         order_id = self.request.GET.get("order")